@@ -0,0 +1,117 @@
+"""Benchmark the ASGI app against the WSGI production server.
+
+Starts `python main.py serve` (gunicorn or waitress) and then uvicorn
+with src.asgi:app against the same scratch SQLite database (or
+--database-url), and for each:
+
+1. drives GET --path with concurrent keep-alive clients;
+2. holds --slow-clients connections open, each trickling a request
+   one byte at a time, and measures the same load again while they wait.
+
+A thread-per-request server runs out of threads once the slow clients
+occupy them; the ASGI server only parks a coroutine per connection.
+
+Usage:
+    python -m benchmarks.async_api [--clients N] [--seconds S] [--contacts N]
+                                   [--workers N] [--threads N] [--slow-clients N]
+                                   [--path PATH] [--database-url URL]
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.throughput import ROOT, PORT, wait_for_port, wait_for_port_free, seed, drive
+
+
+def hold_slow_clients(count, stop):
+    """Open connections that send a request line one byte every second until stop is set."""
+    request = b'GET /api/health HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n'
+    sockets = []
+    for _ in range(count):
+        try:
+            sockets.append(socket.create_connection(('127.0.0.1', PORT), timeout=5))
+        except OSError:
+            break
+
+    def trickle():
+        position = 0
+        while not stop.wait(1) and position < len(request) - 1:
+            for connection in sockets:
+                try:
+                    connection.send(request[position:position + 1])
+                except OSError:
+                    pass
+            position += 1
+
+    thread = threading.Thread(target=trickle, daemon=True)
+    thread.start()
+    return sockets, thread
+
+
+def run(label, command, args, database_url, first):
+    """Start one server and report throughput with and without slow clients."""
+    env = {**os.environ, 'DATABASE_URL': database_url}
+    process = subprocess.Popen(
+        command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+    try:
+        wait_for_port(PORT)
+        if first:
+            seed(args.contacts)
+        drive(args.path, args.clients, 1)  # warm-up
+        completed, errors = drive(args.path, args.clients, args.seconds)
+        print(f"{label:<36} {'idle':<16} {completed / args.seconds:>9.1f} req/s  {errors:>5} errors")
+
+        stop = threading.Event()
+        sockets, thread = hold_slow_clients(args.slow_clients, stop)
+        try:
+            time.sleep(1)
+            completed, errors = drive(args.path, args.clients, args.seconds)
+            held = f'{len(sockets)} slow clients'
+            print(f"{label:<36} {held:<16} {completed / args.seconds:>9.1f} req/s  {errors:>5} errors")
+        finally:
+            stop.set()
+            thread.join()
+            for connection in sockets:
+                connection.close()
+    finally:
+        os.killpg(process.pid, 15)
+        process.wait()
+        wait_for_port_free(PORT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seconds', type=int, default=10)
+    parser.add_argument('--contacts', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--slow-clients', type=int, default=500)
+    parser.add_argument('--path', default='/api/contacts?limit=100')
+    parser.add_argument('--database-url', help='database to serve instead of a scratch SQLite file, e.g. a local PostgreSQL')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite:///{os.path.join(directory, 'async_api.db')}"
+        print(f"GET {args.path} with {args.clients} keep-alive clients for {args.seconds}s")
+        serve = [
+            sys.executable, 'main.py', 'serve', '--host', '127.0.0.1', '--port', str(PORT),
+            '--workers', str(args.workers), '--threads', str(args.threads)
+        ]
+        run(f'WSGI ({args.workers} workers x {args.threads} threads)', serve, args, database_url, True)
+        uvicorn = [
+            sys.executable, '-m', 'uvicorn', 'src.asgi:app', '--host', '127.0.0.1', '--port', str(PORT),
+            '--workers', str(args.workers), '--no-access-log'
+        ]
+        run(f'ASGI (uvicorn, {args.workers} workers)', uvicorn, args, database_url, False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark bytes on the wire and CPU per request for response compression.
+
+Serializes one contacts list page and a full contacts export the way the
+API does, then compresses them with every available encoding. The
+"cached" column is the cost of serving the same page again from the
+compressed body cache, which skips serialization and compression.
+
+Usage:
+    python -m benchmarks.compression [row_count] [page_size]
+"""
+
+import sys
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.models.contact import Contact
+from src.serializers import get_serializer, dumps
+from src.export import CONTACT_EXPORT_COLUMNS, encode_ndjson
+from src.compression import CODERS, CompressedBodyCache, compress, compress_stream
+from benchmarks.serialization import seed
+
+
+def cpu_per_call(function, repeat):
+    """Get the average process CPU time of a call, in milliseconds."""
+    started = time.process_time()
+    for _ in range(repeat):
+        function()
+    return (time.process_time() - started) / repeat * 1000
+
+
+def list_page(engine, page_size):
+    """Serialize one contacts list page to JSON bytes."""
+    serializer = get_serializer('contact')
+    with Session(engine) as session:
+        rows = session.query(*serializer.columns).order_by(Contact.name, Contact.id).limit(page_size).all()
+        return dumps({'data': serializer.to_dicts(rows), 'next_cursor': None})
+
+
+def export_chunks(engine):
+    """Encode the contacts export into its streamed NDJSON chunks."""
+    with engine.connect() as connection:
+        result = connection.execution_options(yield_per=1000).execute(
+            select(*CONTACT_EXPORT_COLUMNS).order_by(Contact.id)
+        )
+        return [chunk.encode('utf-8') for chunk in encode_ndjson(CONTACT_EXPORT_COLUMNS, result.partitions())]
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+    seed(engine, row_count)
+
+    page = list_page(engine, page_size)
+    serialize_ms = cpu_per_call(lambda: list_page(engine, page_size), 20)
+    chunks = export_chunks(engine)
+    export_size = sum(len(chunk) for chunk in chunks)
+
+    print(f"List page: {page_size} contacts, {len(page)} bytes, serialization {serialize_ms:.2f} ms CPU")
+    print(f"{'encoding':<10} {'bytes':>10} {'ratio':>7} {'compress ms':>12} {'cached ms':>10}")
+    print(f"{'identity':<10} {len(page):>10} {1:>7.1f} {0:>12.2f} {'-':>10}")
+    cache = CompressedBodyCache()
+    for encoding in CODERS:
+        body = compress(page, encoding)
+        compress_ms = cpu_per_call(lambda: compress(page, encoding), 20)
+        cache.put('etag', encoding, body, 'application/json')
+        cached_ms = cpu_per_call(lambda: cache.get('etag', encoding), 10000)
+        print(f"{encoding:<10} {len(body):>10} {len(page) / len(body):>7.1f} {compress_ms:>12.2f} {cached_ms:>10.4f}")
+
+    print()
+    print(f"Export: {row_count} contacts as NDJSON, {export_size} bytes in {len(chunks)} chunks")
+    print(f"{'encoding':<10} {'bytes':>10} {'ratio':>7} {'compress ms':>12}")
+    for encoding in CODERS:
+        size = sum(len(piece) for piece in compress_stream(chunks, encoding))
+        compress_ms = cpu_per_call(lambda: list(compress_stream(chunks, encoding)), 5)
+        print(f"{encoding:<10} {size:>10} {export_size / size:>7.1f} {compress_ms:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
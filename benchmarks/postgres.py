@@ -0,0 +1,164 @@
+"""Benchmark the bulk import, fan-out and export paths on PostgreSQL.
+
+Runs against --database-url (a PostgreSQL database you can write to; the
+benchmark works in its own schema, followupper_benchmark, and drops it
+afterwards) and, for comparison, a temporary SQLite file:
+
+1. import: --contacts new contacts through bulk.upsert_contacts, with
+   multi-row INSERTs and, on PostgreSQL, with COPY;
+2. fan-out: --followups follow-ups through bulk.insert_followups, the
+   same two ways;
+3. export: every contact read with the streaming export's server-side
+   cursor (yield_per) and with a plain buffered fetch, reporting rows/s
+   and the peak Python memory of each.
+
+Start a local server with e.g. `docker run -e POSTGRES_HOST_AUTH_METHOD=trust
+-p 5432:5432 postgres` and install the driver with `pip install -e ".[postgres]"`.
+
+Usage:
+    python -m benchmarks.postgres --database-url postgresql://postgres@localhost/postgres
+                                  [--contacts N] [--followups N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+import src.bulk as bulk
+from src.export import CONTACT_EXPORT_COLUMNS, EXPORT_CHUNK_ROWS, export_statement
+from src.models.database import Base, configure_postgresql, configure_sqlite, pool_options
+from src.models.contact import Contact
+from src.models.message_template import MessageTemplate
+
+SCHEMA = 'followupper_benchmark'
+
+
+def postgres_engine(url):
+    """Create an engine whose connections use the benchmark schema."""
+    with create_engine(url).connect() as connection:
+        connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS {SCHEMA}'))
+        connection.commit()
+    engine = create_engine(url, **pool_options(url), connect_args={'options': f'-csearch_path={SCHEMA}'})
+    configure_postgresql(engine)
+    return engine
+
+
+def sqlite_engine(directory):
+    """Create an engine on a new SQLite file with the application's PRAGMA profile."""
+    url = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+    engine = create_engine(url, **pool_options(url), connect_args={'check_same_thread': False})
+    configure_sqlite(engine)
+    return engine
+
+
+def reset(engine):
+    """Recreate every table empty."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def measure_import(engine, count, use_copy):
+    """Get contacts imported per second through upsert_contacts."""
+    rows = [{'name': f'Contact {i}', 'email': f'contact{i}@example.com', 'notes': 'Prefers short messages.'} for i in range(count)]
+    bulk.COPY_MIN_ROWS = 1 if use_copy else count + 1
+    started = time.perf_counter()
+    with Session(engine) as db:
+        bulk.upsert_contacts(db, rows)
+        db.commit()
+    return count / (time.perf_counter() - started)
+
+
+def measure_fanout(engine, count, use_copy):
+    """Get follow-ups scheduled per second through insert_followups."""
+    with Session(engine) as db:
+        template = MessageTemplate(name='Check-in', body='Hi {name}')
+        db.add(template)
+        db.commit()
+        contact_ids = db.scalars(select(Contact.id)).all()
+        template_id = template.id
+
+    start = datetime.now(timezone.utc)
+    rows = [
+        {
+            'contact_id': contact_ids[i % len(contact_ids)],
+            'template_id': template_id,
+            'scheduled_date': start + timedelta(minutes=i),
+            'platform': 'email',
+        }
+        for i in range(count)
+    ]
+    bulk.COPY_MIN_ROWS = 1 if use_copy else count + 1
+    started = time.perf_counter()
+    with Session(engine) as db:
+        bulk.insert_followups(db, rows)
+        db.commit()
+    return count / (time.perf_counter() - started)
+
+
+def measure_export(engine, streamed):
+    """Get (rows/s, peak MB of Python allocations) for reading every contact."""
+    statement = export_statement(CONTACT_EXPORT_COLUMNS, order_by=[Contact.id])
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = 0
+    with engine.connect() as connection:
+        if streamed:
+            result = connection.execution_options(yield_per=EXPORT_CHUNK_ROWS).execute(statement)
+            for partition in result.partitions():
+                rows += len(partition)
+        else:
+            rows = len(connection.execute(statement).all())
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows / elapsed, peak / (1024 * 1024)
+
+
+def run(label, engine, args):
+    """Print the import, fan-out and export results for one database."""
+    modes = [False, True] if engine.dialect.name == 'postgresql' else [False]
+    for use_copy in modes:
+        reset(engine)
+        imported = measure_import(engine, args.contacts, use_copy)
+        fanned_out = measure_fanout(engine, args.followups, use_copy)
+        mode = 'COPY' if use_copy else 'INSERT'
+        print(f'{label:<12} {mode:<8} {imported:>14.0f} {fanned_out:>15.0f}')
+    for streamed in (True, False):
+        rate, peak = measure_export(engine, streamed)
+        mode = 'streamed' if streamed else 'buffered'
+        print(f'{label:<12} {mode:<8} {"export rows/s":>14} {rate:>10.0f}  peak {peak:.1f} MB')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--contacts', type=int, default=50000)
+    parser.add_argument('--followups', type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'database':<12} {'mode':<8} {'import rows/s':>14} {'fan-out rows/s':>15}")
+    with tempfile.TemporaryDirectory() as directory:
+        engine = sqlite_engine(directory)
+        try:
+            run('sqlite', engine, args)
+        finally:
+            engine.dispose()
+
+    engine = postgres_engine(args.database_url)
+    try:
+        run('postgresql', engine, args)
+    finally:
+        engine.dispose()
+        with create_engine(args.database_url).connect() as connection:
+            connection.execute(text(f'DROP SCHEMA {SCHEMA} CASCADE'))
+            connection.commit()
+
+
+if __name__ == '__main__':
+    main()
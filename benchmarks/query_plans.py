@@ -0,0 +1,154 @@
+"""Check the query plans and timings of the hot schedule queries.
+
+Seeds a temporary SQLite database with --followups follow-ups spread
+over --contacts contacts (60% sent, 20% pending, 10% failed, 10%
+cancelled, plus one contact with a long history), runs ANALYZE, and for
+each query the scheduler, the bulk endpoints and the schedule feed run
+prints its time and EXPLAIN QUERY PLAN.
+
+Every query must be answered from the index listed next to it by
+queries(), and ordered pages must not sort in a temporary B-tree; the
+script exits with status 1 when a plan regresses. The same plans are
+asserted on a small database by tests/test_query_plans.py.
+
+Usage:
+    python -m benchmarks.query_plans [--contacts N] [--followups N] [--runs N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert, select, text
+
+from src.filters import schedule_criteria
+from src.models.database import Base, configure_sqlite
+from src.models.contact import Contact
+from src.models.message_template import MessageTemplate
+from src.models.scheduled_followup import ScheduledFollowup
+from src.pagination import keyset
+from benchmarks.sqlite_profiles import contact_row
+
+# Contact whose follow-up history is --followups // 4 rows long
+BUSY_CONTACT_ID = 1
+
+STATUSES = ['sent'] * 6 + ['pending'] * 2 + ['failed', 'cancelled']
+
+
+def seed(engine, contacts, followups):
+    """Create the schema and insert the contacts and follow-ups."""
+    Base.metadata.create_all(engine)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as connection:
+        connection.execute(insert(Contact), [contact_row(i, now) for i in range(contacts)])
+        connection.execute(insert(MessageTemplate), [{'name': 'Check-in', 'body': 'Hi {name}'}])
+        connection.execute(insert(ScheduledFollowup), [
+            {
+                'contact_id': BUSY_CONTACT_ID if i % 4 == 0 else i % contacts + 1,
+                'template_id': 1,
+                'platform': 'email',
+                'status': STATUSES[i % len(STATUSES)],
+                'retry_count': i // 10 % 5,
+                'scheduled_date': now + timedelta(minutes=i - followups // 2),
+                'created_at': now,
+                'updated_at': now,
+            }
+            for i in range(followups)
+        ])
+        connection.execute(text('ANALYZE'))
+
+
+def queries(now):
+    """Get {name: (statement, expected index)} for the hot schedule queries."""
+    F = ScheduledFollowup
+    feed_columns = [F.scheduled_date, F.id]
+    return {
+        'overdue': (
+            select(F.id).where(F.status == 'pending', F.scheduled_date < now),
+            'ix_scheduled_followups_status_scheduled_date_id',
+        ),
+        'pending feed': (
+            keyset(select(F.id, F.contact_id, F.status).where(*schedule_criteria({'status': 'pending'})), feed_columns, None, 50),
+            'ix_scheduled_followups_status_scheduled_date_id',
+        ),
+        'retry scan': (
+            select(F.id).where(F.status == 'failed', F.retry_count < 3),
+            'ix_scheduled_followups_status_retry_count',
+        ),
+        'retry step': (
+            select(F.id).where(F.status == 'failed', F.retry_count == 0),
+            'ix_scheduled_followups_status_retry_count',
+        ),
+        'contact pending': (
+            select(F.id).where(*schedule_criteria({'contact_id': BUSY_CONTACT_ID}), F.status == 'pending'),
+            'ix_scheduled_followups_contact_id_status_scheduled_date_id',
+        ),
+        'contact pending feed': (
+            keyset(
+                select(F.id, F.contact_id, F.status).where(*schedule_criteria({'contact_id': BUSY_CONTACT_ID, 'status': 'pending'})),
+                feed_columns, None, 50
+            ),
+            'ix_scheduled_followups_contact_id_status_scheduled_date_id',
+        ),
+        'contact feed': (
+            keyset(select(F.id, F.contact_id, F.status).where(*schedule_criteria({'contact_id': BUSY_CONTACT_ID})), feed_columns, None, 50),
+            'ix_scheduled_followups_contact_id_scheduled_date_id',
+        ),
+    }
+
+
+def explain(connection, statement):
+    """Get the EXPLAIN QUERY PLAN details of a statement."""
+    compiled = statement.compile(connection, compile_kwargs={'render_postcompile': True})
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', tuple(compiled.params[name] for name in compiled.positiontup))
+    return [row[3] for row in rows]
+
+
+def check(plan, index):
+    """Get the problems with a plan that should use index."""
+    problems = []
+    if not any(f'INDEX {index} ' in detail for detail in plan):
+        problems.append(f'does not use {index}')
+    if any('TEMP B-TREE' in detail for detail in plan):
+        problems.append('sorts in a temporary B-tree')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--contacts', type=int, default=5000)
+    parser.add_argument('--followups', type=int, default=200000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'plans.db')}")
+        configure_sqlite(engine)
+        try:
+            seed(engine, args.contacts, args.followups)
+            with engine.connect() as connection:
+                for name, (statement, index) in queries(datetime.now(timezone.utc)).items():
+                    started = time.perf_counter()
+                    for _ in range(args.runs):
+                        rows = len(connection.execute(statement).all())
+                    elapsed = (time.perf_counter() - started) / args.runs * 1000
+                    plan = explain(connection, statement)
+                    problems = check(plan, index)
+                    failures += bool(problems)
+                    print(f"{name:<22} {rows:>7} rows {elapsed:>8.2f} ms  {'FAIL' if problems else 'ok'}")
+                    for detail in plan:
+                        print(f'    {detail}')
+                    for problem in problems:
+                        print(f'    ! {problem}')
+        finally:
+            engine.dispose()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
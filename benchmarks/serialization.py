@@ -0,0 +1,98 @@
+"""Benchmark per-row serialization cost of the contacts list.
+
+Compares the previous path (ORM objects, per-field dicts with
+isoformat() and the standard json module) with the serializer registry
+(labelled row tuples encoded by src.serializers.dumps).
+
+Usage:
+    python -m benchmarks.serialization [row_count]
+"""
+
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.models.database import Base
+from src.models.contact import Contact
+from src.serializers import get_serializer, dumps
+
+
+def seed(engine, row_count):
+    """Insert row_count contacts into a fresh in-memory database."""
+    Base.metadata.create_all(engine)
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        session.execute(insert(Contact), [
+            {
+                'name': f'Contact {i}',
+                'email': f'contact{i}@example.com',
+                'platform_preference': 'email',
+                'notes': 'Met at a conference; prefers short messages.',
+                'is_active': True,
+                'last_contact_date': now,
+                'created_at': now,
+                'updated_at': now,
+            }
+            for i in range(row_count)
+        ])
+        session.commit()
+
+
+def orm_path(engine):
+    """Serialize the way the list endpoints did before the registry."""
+    with Session(engine) as session:
+        result = []
+        for contact in session.query(Contact).order_by(Contact.name).all():
+            result.append({
+                'id': contact.id,
+                'name': contact.name,
+                'email': contact.email,
+                'codementor_username': contact.codementor_username,
+                'platform_preference': contact.platform_preference,
+                'last_contact_date': contact.last_contact_date.isoformat() if contact.last_contact_date else None,
+                'notes': contact.notes,
+                'is_active': contact.is_active,
+                'created_at': contact.created_at.isoformat() if contact.created_at else None,
+                'updated_at': contact.updated_at.isoformat() if contact.updated_at else None
+            })
+        return json.dumps(result).encode('utf-8')
+
+
+def registry_path(engine):
+    """Serialize through the serializer registry."""
+    serializer = get_serializer('contact')
+    with Session(engine) as session:
+        rows = session.query(*serializer.columns).order_by(Contact.name).all()
+        return dumps(serializer.to_dicts(rows))
+
+
+def measure(label, function, engine, row_count, repeat=3):
+    """Print the best per-row time of several runs."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payload = function(engine)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<10} {best * 1000:9.1f} ms total  {best / row_count * 1e6:7.2f} us/row  {len(payload) / 1e6:6.1f} MB")
+    return best
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+    seed(engine, row_count)
+
+    print(f"Serializing {row_count} contacts")
+    before = measure('orm', orm_path, engine, row_count)
+    after = measure('registry', registry_path, engine, row_count)
+    print(f"speedup    {before / after:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
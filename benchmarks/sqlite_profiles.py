@@ -0,0 +1,157 @@
+"""Benchmark write and read throughput for each SQLite PRAGMA profile.
+
+For every profile in src.models.database.SQLITE_PROFILES, a fresh file
+database is seeded and then measured three ways:
+
+1. writes: one contact inserted and committed per transaction, the way
+   the API's create endpoints write;
+2. reads: the contacts list query (a page of 50 ordered by name);
+3. mixed: --readers threads running the list query while one thread
+   keeps committing inserts, for --seconds, counting "database is locked"
+   errors.
+
+Usage:
+    python -m benchmarks.sqlite_profiles [--contacts N] [--writes N] [--reads N]
+                                         [--readers N] [--seconds S]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from src.models.database import Base, SQLITE_PROFILES, configure_sqlite
+from src.models.contact import Contact
+
+
+def contact_row(i, now):
+    """Build one contact row for inserts."""
+    return {
+        'name': f'Contact {i}',
+        'email': f'contact{i}@example.com',
+        'platform_preference': 'email',
+        'notes': 'Met at a conference; prefers short messages.',
+        'is_active': True,
+        'created_at': now,
+        'updated_at': now,
+    }
+
+
+def profile_engine(directory, profile):
+    """Create an engine on a new database file using a profile."""
+    engine = create_engine(f'sqlite:///{os.path.join(directory, profile)}.db', connect_args={'check_same_thread': False})
+    configure_sqlite(engine, profile)
+    return engine
+
+
+def seed(engine, count):
+    """Create the schema and insert count contacts in one transaction."""
+    Base.metadata.create_all(engine)
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        session.execute(insert(Contact), [contact_row(i, now) for i in range(count)])
+        session.commit()
+
+
+def write_one(engine, i):
+    """Insert and commit one contact through the ORM."""
+    with Session(engine) as session:
+        session.add(Contact(**contact_row(i, datetime.now(timezone.utc))))
+        session.commit()
+
+
+def read_page(engine, count):
+    """Run the contacts list query for a random page of 50."""
+    with engine.connect() as connection:
+        return connection.execute(
+            select(Contact.id, Contact.name, Contact.email).order_by(Contact.name)
+            .offset(random.randrange(max(count - 50, 1))).limit(50)
+        ).all()
+
+
+def measure_writes(engine, writes, start):
+    """Get committed transactions per second."""
+    started = time.perf_counter()
+    for i in range(writes):
+        write_one(engine, start + i)
+    return writes / (time.perf_counter() - started)
+
+
+def measure_reads(engine, reads, count):
+    """Get list queries per second."""
+    started = time.perf_counter()
+    for _ in range(reads):
+        read_page(engine, count)
+    return reads / (time.perf_counter() - started)
+
+
+def measure_mixed(engine, readers, seconds, count, start):
+    """Get (reads/s, writes/s, locked errors) with concurrent readers and one writer."""
+    stop = threading.Event()
+    counts = {'reads': 0, 'writes': 0, 'locked': 0}
+    lock = threading.Lock()
+
+    def count_as(key):
+        with lock:
+            counts[key] += 1
+
+    def reader():
+        while not stop.is_set():
+            try:
+                read_page(engine, count)
+                count_as('reads')
+            except OperationalError:
+                count_as('locked')
+
+    def writer():
+        i = start
+        while not stop.is_set():
+            try:
+                write_one(engine, i)
+                count_as('writes')
+            except OperationalError:
+                count_as('locked')
+            i += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts['reads'] / seconds, counts['writes'] / seconds, counts['locked']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--contacts', type=int, default=10000)
+    parser.add_argument('--writes', type=int, default=500)
+    parser.add_argument('--reads', type=int, default=2000)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'writes/s':>10} {'reads/s':>10} {'mixed reads/s':>14} {'mixed writes/s':>15} {'locked':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in SQLITE_PROFILES:
+            engine = profile_engine(directory, profile)
+            seed(engine, args.contacts)
+            writes = measure_writes(engine, args.writes, args.contacts)
+            reads = measure_reads(engine, args.reads, args.contacts)
+            mixed_reads, mixed_writes, locked = measure_mixed(
+                engine, args.readers, args.seconds, args.contacts, args.contacts + args.writes
+            )
+            engine.dispose()
+            print(f'{profile:<12} {writes:>10.0f} {reads:>10.0f} {mixed_reads:>14.0f} {mixed_writes:>15.0f} {locked:>7}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Benchmark API throughput: development server vs production server.
+
+Starts `python main.py` (Werkzeug, debug) and then `python main.py serve`
+(gunicorn or waitress) against a scratch SQLite database (or
+--database-url) seeded with contacts, and drives each with concurrent
+keep-alive clients.
+
+Usage:
+    python -m benchmarks.throughput [--clients N] [--seconds S] [--contacts N]
+                                    [--workers N] [--threads N] [--path PATH]
+                                    [--database-url URL]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 5000
+
+
+def wait_for_port(port, timeout=30):
+    """Wait until something accepts connections on localhost:port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server did not start on port {port}')
+
+
+def wait_for_port_free(port, timeout=30):
+    """Wait until nothing listens on localhost:port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                time.sleep(0.2)
+        except OSError:
+            return
+
+
+def seed(contact_count):
+    """Create contacts through the bulk endpoint."""
+    connection = http.client.HTTPConnection('127.0.0.1', PORT)
+    rows = [
+        {'name': f'Contact {i}', 'email': f'contact{i}@example.com', 'notes': 'Prefers short messages.'}
+        for i in range(contact_count)
+    ]
+    connection.request('POST', '/api/contacts/bulk', json.dumps(rows), {'Content-Type': 'application/json'})
+    connection.getresponse().read()
+    connection.close()
+
+
+def drive(path, clients, seconds):
+    """Issue GET requests from concurrent clients; return (requests, errors)."""
+    counts = [0] * clients
+    errors = [0] * clients
+    deadline = time.monotonic() + seconds
+
+    def client(index):
+        connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=30)
+        while time.monotonic() < deadline:
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                if response.status == 200:
+                    counts[index] += 1
+                else:
+                    errors[index] += 1
+            except (OSError, http.client.HTTPException):
+                errors[index] += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=30)
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts), sum(errors)
+
+
+def run(label, command, args, database_url, first):
+    """Start one server, seed it if needed, drive it and stop it."""
+    env = {**os.environ, 'DATABASE_URL': database_url}
+    process = subprocess.Popen(
+        command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+    try:
+        wait_for_port(PORT)
+        if first:
+            seed(args.contacts)
+        drive(args.path, args.clients, 1)  # warm-up
+        completed, errors = drive(args.path, args.clients, args.seconds)
+        print(f"{label:<40} {completed / args.seconds:>9.1f} req/s  {errors:>5} errors")
+    finally:
+        os.killpg(process.pid, 15)
+        process.wait()
+        wait_for_port_free(PORT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seconds', type=int, default=10)
+    parser.add_argument('--contacts', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--path', default='/api/contacts?limit=100')
+    parser.add_argument('--database-url', help='database to serve instead of a scratch SQLite file, e.g. a local PostgreSQL')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite:///{os.path.join(directory, 'throughput.db')}"
+        print(f"GET {args.path} with {args.clients} keep-alive clients for {args.seconds}s")
+        run('dev server (main.py)', [sys.executable, 'main.py'], args, database_url, True)
+        serve = [
+            sys.executable, 'main.py', 'serve', '--host', '127.0.0.1', '--port', str(PORT),
+            '--workers', str(args.workers), '--threads', str(args.threads)
+        ]
+        run(f'serve ({args.workers} workers x {args.threads} threads)', serve, args, database_url, False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark concurrent writes with and without the single-writer queue.
+
+--threads threads each insert --writes contacts, one per request, on a
+fresh file database using the 'performance' SQLite profile:
+
+1. direct: every thread commits its own transaction on a pooled engine,
+   the way the API wrote before src.writer; SQLite serializes the
+   writers and busy_timeout makes the rest wait (or fail with
+   "database is locked");
+2. queued: every thread submits its insert to a WriteQueue, which runs
+   up to WRITE_QUEUE_BATCH of them in one BEGIN IMMEDIATE transaction.
+
+Reported per mode: writes/s, per-write latency percentiles, locked
+errors and, for the queue, the average number of writes per commit.
+
+Usage:
+    python -m benchmarks.write_queue [--threads N] [--writes N] [--busy-timeout MS]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from src.models.database import Base, MeteredQueuePool, configure_sqlite
+from src.models.contact import Contact
+from src.writer import WriteQueue, WRITE_QUEUE_BATCH
+from benchmarks.sqlite_profiles import contact_row
+
+
+def file_engine(path, busy_timeout, begin='BEGIN', **pool):
+    """Create an engine on a database file with the performance profile."""
+    engine = create_engine(f'sqlite:///{path}', connect_args={'check_same_thread': False}, **pool)
+    configure_sqlite(engine, 'performance', begin=begin)
+
+    @event.listens_for(engine, 'connect')
+    def _busy_timeout(dbapi_connection, connection_record):
+        dbapi_connection.execute(f'PRAGMA busy_timeout={busy_timeout}')
+
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def insert_contact(session, i):
+    """Add one contact, as the create endpoint does."""
+    session.add(Contact(**contact_row(i, datetime.now(timezone.utc))))
+    session.flush()
+
+
+def run_threads(threads, writes, write):
+    """Run write(i) from each thread; get (seconds, latencies, locked errors)."""
+    latencies = []
+    locked = [0]
+    lock = threading.Lock()
+
+    def worker(offset):
+        own = []
+        errors = 0
+        for i in range(offset, offset + writes):
+            started = time.perf_counter()
+            try:
+                write(i)
+            except OperationalError:
+                errors += 1
+                continue
+            own.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own)
+            locked[0] += errors
+
+    workers = [threading.Thread(target=worker, args=(n * writes,)) for n in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started, latencies, locked[0]
+
+
+def measure_direct(directory, threads, writes, busy_timeout):
+    """Every thread commits its own transaction."""
+    engine = file_engine(os.path.join(directory, 'direct.db'), busy_timeout)
+
+    def write(i):
+        with Session(engine) as session:
+            insert_contact(session, i)
+            session.commit()
+
+    try:
+        return run_threads(threads, writes, write) + (1.0,)
+    finally:
+        engine.dispose()
+
+
+def measure_queued(directory, threads, writes, busy_timeout):
+    """Every thread submits its write to one group-committing writer."""
+    engine = file_engine(
+        os.path.join(directory, 'queued.db'), busy_timeout, begin='BEGIN IMMEDIATE',
+        poolclass=MeteredQueuePool, pool_size=1, max_overflow=0
+    )
+    writer = WriteQueue(enabled=True, max_batch=WRITE_QUEUE_BATCH, bind=engine)
+
+    def write(i):
+        writer.run(lambda session: insert_contact(session, i))
+
+    try:
+        return run_threads(threads, writes, write) + (writer.stats()['avg_batch'],)
+    finally:
+        engine.dispose()
+
+
+def percentile(values, pct):
+    """Get a percentile of values in milliseconds."""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0] * 1000
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--writes', type=int, default=100)
+    parser.add_argument('--busy-timeout', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'writes/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'locked':>7} {'per commit':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, measure in (('direct', measure_direct), ('queued', measure_queued)):
+            seconds, latencies, locked, per_commit = measure(directory, args.threads, args.writes, args.busy_timeout)
+            print(
+                f'{mode:<8} {len(latencies) / seconds:>9.0f} {percentile(latencies, 50):>8.2f} '
+                f'{percentile(latencies, 95):>8.2f} {percentile(latencies, 99):>8.2f} {locked:>7} {per_commit:>11.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
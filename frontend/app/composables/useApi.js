@@ -1,3 +1,66 @@
+// API base URL
+const API_BASE = 'http://localhost:5000/api'
+
+// Last validated response body per GET endpoint, keyed by endpoint
+// and holding { etag, data } for conditional requests
+const responseCache = new Map()
+
+// Requests issued in the same tick, sent together through /api/batch
+let pendingRequests = []
+
+// Open /api/events stream and the timer of the sync it has scheduled
+let eventSource = null
+let pendingSync = null
+
+// Send one request directly and normalize it to { status, etag, data }
+const sendDirect = async (endpoint, options) => {
+  const response = await fetch(`${API_BASE}${endpoint}`, options)
+  const data = response.status === 304 ? null : await response.json().catch(() => null)
+  return { status: response.status, etag: response.headers.get('ETag'), data }
+}
+
+// Send every request queued during the last tick, as a single
+// POST /api/batch when there is more than one
+const flushRequests = async () => {
+  const queued = pendingRequests
+  pendingRequests = []
+
+  if (queued.length === 1) {
+    const { endpoint, options, resolve, reject } = queued[0]
+    sendDirect(endpoint, options).then(resolve, reject)
+    return
+  }
+
+  try {
+    const response = await fetch(`${API_BASE}/batch`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(queued.map(({ endpoint, options }) => ({
+        method: options.method || 'GET',
+        path: `/api${endpoint}`,
+        headers: options.headers,
+        body: options.body ? JSON.parse(options.body) : null
+      })))
+    })
+    if (!response.ok) throw new Error(`API Error: ${response.status}`)
+    const results = await response.json()
+    queued.forEach(({ resolve }, index) => {
+      const result = results[index]
+      resolve({ status: result.status, etag: result.headers?.ETag ?? null, data: result.body })
+    })
+  } catch (error) {
+    queued.forEach(({ reject }) => reject(error))
+  }
+}
+
+// Queue a request to go out with the others made in the same tick
+const sendRequest = (endpoint, options) => new Promise((resolve, reject) => {
+  pendingRequests.push({ endpoint, options, resolve, reject })
+  if (pendingRequests.length === 1) {
+    queueMicrotask(flushRequests)
+  }
+})
+
 // Global state management for API data
 export const useApi = () => {
   // Global reactive state using Nuxt's useState
@@ -5,6 +68,9 @@ export const useApi = () => {
   const templates = useState('templates', () => [])
   const schedule = useState('schedule', () => [])
   const sequences = useState('sequences', () => [])
+  const scheduleQuery = useState('scheduleQuery', () => '')
+  const scheduleCursor = useState('scheduleCursor', () => null)
+  const syncToken = useState('syncToken', () => null)
   const settings = useState('settings', () => ({
     gmail: { email: '', app_password: '' },
     codementor: { access_token: '', refresh_token: '' },
@@ -13,9 +79,6 @@ export const useApi = () => {
   const isLoading = useState('isLoading', () => false)
   const error = useState('error', () => null)
 
-  // API base URL
-  const API_BASE = 'http://localhost:5000/api'
-
   // Status message helper
   const showStatus = (message, duration = 5000) => {
     // This will be handled by individual pages
@@ -28,20 +91,33 @@ export const useApi = () => {
     console.log('Status with progress:', message)
   }
 
-  // Generic API call with retry logic
+  // Generic API call with retry logic. Calls made in the same tick are
+  // coalesced into one batch request. GET requests send the last ETag
+  // seen for the endpoint and reuse the cached body on 304 Not Modified.
   const apiCall = async (endpoint, options = {}, retries = 3) => {
+    const isGet = !options.method || options.method === 'GET'
+    const cached = isGet ? responseCache.get(endpoint) : null
+
     for (let i = 0; i < retries; i++) {
       try {
-        const response = await fetch(`${API_BASE}${endpoint}`, {
+        const response = await sendRequest(endpoint, {
+          ...options,
           headers: {
             'Content-Type': 'application/json',
+            ...(cached ? { 'If-None-Match': cached.etag } : {}),
             ...options.headers
-          },
-          ...options
+          }
         })
-        
-        if (response.ok) {
-          return await response.json()
+
+        if (response.status === 304 && cached) {
+          return cached.data
+        }
+
+        if (response.status >= 200 && response.status < 300) {
+          if (isGet && response.etag) {
+            responseCache.set(endpoint, { etag: response.etag, data: response.data })
+          }
+          return response.data
         }
         
         if (i === retries - 1) {
@@ -57,11 +133,19 @@ export const useApi = () => {
     }
   }
 
-  // Load contacts
+  // Load contacts (follows the keyset cursor until every page is fetched)
   const loadContacts = async () => {
     isLoading.value = true
     try {
-      const data = await apiCall('/contacts')
+      const data = []
+      let cursor = null
+      do {
+        const params = new URLSearchParams({ limit: '1000' })
+        if (cursor) params.set('cursor', cursor)
+        const page = await apiCall(`/contacts?${params}`)
+        data.push(...page.data)
+        cursor = page.next_cursor
+      } while (cursor)
       contacts.value = data
       return data
     } catch (error) {
@@ -89,13 +173,20 @@ export const useApi = () => {
     }
   }
 
-  // Load schedule
-  const loadSchedule = async () => {
+  // Load the first page of the schedule for the given filters
+  // (status, platform, contact_id, date_from, date_to, order)
+  const loadSchedule = async (filters = {}) => {
     isLoading.value = true
     try {
-      const data = await apiCall('/schedule')
-      schedule.value = data
-      return data
+      const params = new URLSearchParams({ limit: '100' })
+      for (const [key, value] of Object.entries(filters)) {
+        if (value !== null && value !== undefined && value !== '') params.set(key, value)
+      }
+      const page = await apiCall(`/schedule?${params}`)
+      schedule.value = page.data
+      scheduleQuery.value = params.toString()
+      scheduleCursor.value = page.next_cursor
+      return page.data
     } catch (error) {
       console.error('Error loading schedule:', error)
       error.value = error.message
@@ -105,6 +196,26 @@ export const useApi = () => {
     }
   }
 
+  // Append the next page of the schedule using the last filters
+  const loadMoreSchedule = async () => {
+    if (!scheduleCursor.value) return []
+    isLoading.value = true
+    try {
+      const params = new URLSearchParams(scheduleQuery.value)
+      params.set('cursor', scheduleCursor.value)
+      const page = await apiCall(`/schedule?${params}`)
+      schedule.value = [...schedule.value, ...page.data]
+      scheduleCursor.value = page.next_cursor
+      return page.data
+    } catch (error) {
+      console.error('Error loading more schedule:', error)
+      error.value = error.message
+      return []
+    } finally {
+      isLoading.value = false
+    }
+  }
+
   // Load sequences
   const loadSequences = async () => {
     isLoading.value = true
@@ -259,19 +370,81 @@ export const useApi = () => {
     }
   }
 
+  // Apply a sync patch ({ upserted, deleted }) to a list store.
+  // Lists that only hold a filtered page (schedule) only update rows
+  // they already contain.
+  const applyPatch = (store, patch, appendNew = true) => {
+    if (!patch || (!patch.upserted.length && !patch.deleted.length)) return
+    const deleted = new Set(patch.deleted)
+    const upserted = new Map(patch.upserted.map(row => [row.id, row]))
+    const next = store.value
+      .filter(row => !deleted.has(row.id))
+      .map(row => {
+        const updated = upserted.get(row.id)
+        if (!updated) return row
+        upserted.delete(row.id)
+        return { ...row, ...updated }
+      })
+    if (appendNew) next.push(...upserted.values())
+    store.value = next
+  }
+
+  // Fetch the changes since the last sync token and patch local state.
+  // Returns false when the server asks for a full reload instead.
+  const sync = async () => {
+    if (syncToken.value === null) return false
+    let page
+    do {
+      page = await apiCall(`/sync?since=${syncToken.value}`)
+      if (page.reset) return false
+      applyPatch(contacts, page.contacts)
+      applyPatch(templates, page.templates)
+      applyPatch(sequences, page.sequences)
+      applyPatch(schedule, page.schedule, false)
+      syncToken.value = page.token
+    } while (page.has_more)
+    return true
+  }
+
+  // Load every list and remember the change token taken before loading,
+  // so later syncs replay anything that changed while lists were loading
+  const loadAll = async () => {
+    const { token } = await apiCall('/sync')
+    await Promise.all([
+      loadContacts(),
+      loadTemplates(),
+      loadSchedule(),
+      loadSequences(),
+      loadSettings()
+    ])
+    syncToken.value = token
+  }
+
+  // Apply server-sent change events instead of polling. Events arriving
+  // together trigger one sync; a reset event means the missed changes
+  // are gone and everything is reloaded. EventSource reconnects on its
+  // own and resumes from the last event id it received.
+  const subscribeToChanges = () => {
+    if (eventSource || typeof EventSource === 'undefined') return
+    eventSource = new EventSource(`${API_BASE}/events?last_event_id=${syncToken.value ?? ''}`)
+    eventSource.addEventListener('change', () => {
+      if (pendingSync) return
+      pendingSync = setTimeout(async () => {
+        pendingSync = null
+        if (!(await sync())) await loadAll()
+      }, 100)
+    })
+    eventSource.addEventListener('reset', () => loadAll())
+  }
+
   // Initialize all data on app startup
   const initializeApp = async () => {
     console.log('🚀 Initializing Followupper app...')
     isLoading.value = true
     
     try {
-      await Promise.all([
-        loadContacts(),
-        loadTemplates(),
-        loadSchedule(),
-        loadSequences(),
-        loadSettings()
-      ])
+      await loadAll()
+      subscribeToChanges()
       console.log('✅ App initialized successfully')
     } catch (error) {
       console.error('❌ Error initializing app:', error)
@@ -281,25 +454,14 @@ export const useApi = () => {
     }
   }
 
-  // Force refresh all data
+  // Refresh all data, applying only the changes since the last sync
+  // when possible and falling back to a full reload
   const refreshAll = async () => {
-    contacts.value = []
-    templates.value = []
-    schedule.value = []
-    sequences.value = []
-    settings.value = {
-      gmail: { email: '', app_password: '' },
-      codementor: { access_token: '', refresh_token: '' },
-      automation: { enabled: false, check_interval: 15, max_retries: 3, timezone: 'UTC' }
+    if (await sync()) {
+      await loadSettings()
+      return
     }
-    
-    await Promise.all([
-      loadContacts(),
-      loadTemplates(),
-      loadSchedule(),
-      loadSequences(),
-      loadSettings()
-    ])
+    await loadAll()
   }
 
   return {
@@ -307,6 +469,7 @@ export const useApi = () => {
     contacts,
     templates,
     schedule,
+    scheduleCursor,
     sequences,
     settings,
     isLoading,
@@ -314,9 +477,11 @@ export const useApi = () => {
     
     // Methods
     initializeApp,
+    sync,
     loadContacts,
     loadTemplates,
     loadSchedule,
+    loadMoreSchedule,
     loadSequences,
     loadSettings,
     createContact,
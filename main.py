@@ -1,6 +1,9 @@
-"""Main entry point for the Followupper application."""
+"""Main entry point for the Followupper application.
+
+    python main.py          Development server (debug, auto-reload)
+    python main.py serve    Production server, see src/server.py
+"""
 
-from src.api import app
 import sys
 import os
 
@@ -9,8 +12,14 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 
 if __name__ == "__main__":
-    print("🚀 Starting Followupper API server...")
-    print("📡 API available at: http://localhost:5000")
-    print("🔗 Health check: http://localhost:5000/api/health")
-    print("🌐 Frontend should connect to: http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from src.server import main
+        main(sys.argv[2:])
+    else:
+        from src.api import app
+        print("🚀 Starting Followupper API development server...")
+        print("📡 API available at: http://localhost:5000")
+        print("🔗 Health check: http://localhost:5000/api/health")
+        print("🌐 Frontend should connect to: http://localhost:5000")
+        print("⚠️  For production use: python main.py serve")
+        app.run(debug=True, host='0.0.0.0', port=5000)
@@ -7,6 +7,7 @@ from src.models.contact import Contact
 from src.models.followup_sequence import FollowupSequence
 from src.models.followup_sequence_step import FollowupSequenceStep
 from src.models.contact_sequence_assignment import ContactSequenceAssignment
+from src.models.sync_change import SyncChange
 from src.models.database import Base
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config
@@ -24,6 +25,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 # access to the values within the .ini file in use.
 config = context.config
 
+# Migrate the same database the application uses
+if os.getenv("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL").replace("%", "%%"))
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
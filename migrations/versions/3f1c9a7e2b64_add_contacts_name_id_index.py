@@ -0,0 +1,24 @@
+"""add_contacts_name_id_index
+
+Revision ID: 3f1c9a7e2b64
+Revises: d98c3aa6ba05
+Create Date: 2026-10-16 09:12:41.218734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7e2b64'
+down_revision = 'd98c3aa6ba05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_contacts_name_id', 'contacts', ['name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_name_id', table_name='contacts')
@@ -0,0 +1,26 @@
+"""add_schedule_status_indexes
+
+Revision ID: 5d3a8f1e7c02
+Revises: c47d1e9f3a28
+Create Date: 2026-10-16 18:42:09.318264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d3a8f1e7c02'
+down_revision = 'c47d1e9f3a28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_scheduled_followups_contact_id_status_scheduled_date_id', 'scheduled_followups', ['contact_id', 'status', 'scheduled_date', 'id'], unique=False)
+    op.create_index('ix_scheduled_followups_status_retry_count', 'scheduled_followups', ['status', 'retry_count'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scheduled_followups_status_retry_count', table_name='scheduled_followups')
+    op.drop_index('ix_scheduled_followups_contact_id_status_scheduled_date_id', table_name='scheduled_followups')
@@ -0,0 +1,28 @@
+"""add_schedule_feed_indexes
+
+Revision ID: 8b2e4d6a1c95
+Revises: 3f1c9a7e2b64
+Create Date: 2026-10-16 10:03:17.554102
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6a1c95'
+down_revision = '3f1c9a7e2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_scheduled_followups_scheduled_date_id', 'scheduled_followups', ['scheduled_date', 'id'], unique=False)
+    op.create_index('ix_scheduled_followups_status_scheduled_date_id', 'scheduled_followups', ['status', 'scheduled_date', 'id'], unique=False)
+    op.create_index('ix_scheduled_followups_contact_id_scheduled_date_id', 'scheduled_followups', ['contact_id', 'scheduled_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scheduled_followups_contact_id_scheduled_date_id', table_name='scheduled_followups')
+    op.drop_index('ix_scheduled_followups_status_scheduled_date_id', table_name='scheduled_followups')
+    op.drop_index('ix_scheduled_followups_scheduled_date_id', table_name='scheduled_followups')
@@ -0,0 +1,24 @@
+"""add_sync_changes_table_name_index
+
+Revision ID: a6c2e8f4d1b3
+Revises: 5d3a8f1e7c02
+Create Date: 2026-10-17 09:14:52.207316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c2e8f4d1b3'
+down_revision = '5d3a8f1e7c02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_sync_changes_table_name_id', 'sync_changes', ['table_name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sync_changes_table_name_id', table_name='sync_changes')
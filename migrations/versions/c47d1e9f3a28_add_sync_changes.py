@@ -0,0 +1,33 @@
+"""add_sync_changes
+
+Revision ID: c47d1e9f3a28
+Revises: 8b2e4d6a1c95
+Create Date: 2026-10-16 11:27:05.903416
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47d1e9f3a28'
+down_revision = '8b2e4d6a1c95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('sync_changes',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('table_name', sa.String(length=50), nullable=False),
+                    sa.Column('record_id', sa.Integer(), nullable=False),
+                    sa.Column('operation', sa.String(length=10), nullable=False),
+                    sa.Column('created_at', sa.DateTime(), nullable=True),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index(op.f('ix_sync_changes_created_at'), 'sync_changes', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_sync_changes_created_at'), table_name='sync_changes')
+    op.drop_table('sync_changes')
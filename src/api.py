@@ -1,28 +1,51 @@
 """Flask API backend for Followupper application."""
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
+from werkzeug.test import EnvironBuilder
 from flask_cors import CORS
-from sqlalchemy.orm import Session
-from datetime import datetime, timezone
+from sqlalchemy import func
+from sqlalchemy.orm import undefer
+from datetime import datetime, timedelta, timezone
+import contextvars
 import emoji
+import itertools
+import json
 
 from .models.database import engine, Base
 from .models.contact import Contact
 from .models.message_template import MessageTemplate
 from .models.scheduled_followup import ScheduledFollowup
-from .models.platform_credentials import PlatformCredentials
 from .models.followup_sequence import FollowupSequence
 from .models.followup_sequence_step import FollowupSequenceStep
 from .models.contact_sequence_assignment import ContactSequenceAssignment
+from .models.sync_change import SyncChange, SYNC_RESOURCES, prune_changes
+from .pagination import paginate, parse_limit, parse_bool, parse_datetime
+from .filters import contact_criteria, schedule_criteria, parse_int
+from .export import DEFAULT_EXPORT_FORMAT, EXPORT_FORMATS, export_contacts, export_schedule
+from .http_cache import conditional_get
+from .response_cache import cached_view, response_cache
+from .writer import write_queue, WriteQueueTimeout
+from .compression import compress_response
+from .request_session import get_db, session_stats, write_route, init_app as init_request_session
+from .events import broker, event_stream, parse_last_event_id
+from .stats import STATS_TTL, get_stats
+from .settings import settings_service
+from .serializers import get_serializer, json_response
+from .previews import MAX_PREVIEW_BATCH, parse_preview_targets, preview_contact_criteria, render_previews
+from .bulk import (
+    MAX_BULK_ROWS, upsert_contacts, cancel_followups, retry_followups,
+    reschedule_followups, reassign_followups
+)
 
 # Create Flask app
 app = Flask(__name__)
-CORS(app)  # Enable CORS for Nuxt frontend
+CORS(app, expose_headers=['ETag', 'Last-Modified'])  # Enable CORS for Nuxt frontend
+app.after_request(compress_response)
+init_request_session(app)
 
 
-def get_db():
-    """Get database session."""
-    return Session(engine)
+# Days of change history kept for delta sync
+SYNC_RETENTION_DAYS = 30
 
 
 def run_migrations():
@@ -38,47 +61,70 @@ def run_migrations():
         Base.metadata.create_all(bind=engine)
 
 
+def prune_sync_log():
+    """Drop delta sync history older than the retention window."""
+    try:
+        with engine.begin() as connection:
+            prune_changes(connection, datetime.now(timezone.utc) - timedelta(days=SYNC_RETENTION_DAYS))
+    except Exception as e:
+        print(f"Error pruning sync log: {e}")
+
+
 # Initialize database
 run_migrations()
+prune_sync_log()
 
 # API Routes
 
 
 @app.route('/api/contacts', methods=['GET'])
+@conditional_get(Contact)
 def get_contacts():
-    """Get all contacts."""
+    """Get a page of contacts ordered by name.
+
+    Query parameters:
+        limit: Page size (default 100, max 1000).
+        cursor: Opaque cursor from a previous page's next_cursor.
+        is_active: Filter by active flag (true/false).
+        platform_preference: Filter by platform preference.
+        updated_since: Only contacts updated at or after this ISO timestamp.
+        include_total: Include the total number of matching contacts.
+        fields: Comma-separated fields to return; id and name are always included.
+    """
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        include_total = parse_bool(request.args.get('include_total'))
+        criteria = contact_criteria(request.args)
+        serializer = get_serializer('contact').select_fields(request.args.get('fields'), required=('id', 'name'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     try:
         db = get_db()
-        contacts = db.query(Contact).order_by(Contact.name).all()
-
-        result = []
-        for contact in contacts:
-            result.append({
-                'id': contact.id,
-                'name': contact.name,
-                'email': contact.email,
-                'codementor_username': contact.codementor_username,
-                'platform_preference': contact.platform_preference,
-                'last_contact_date': contact.last_contact_date.isoformat() if contact.last_contact_date else None,
-                'notes': contact.notes,
-                'is_active': contact.is_active,
-                'created_at': contact.created_at.isoformat() if contact.created_at else None,
-                'updated_at': contact.updated_at.isoformat() if contact.updated_at else None
-            })
-
-        db.close()
-        return jsonify(result)
+        query = db.query(*serializer.columns).filter(*criteria)
+
+        total = query.order_by(None).count() if include_total else None
+
+        try:
+            contacts, next_cursor = paginate(query, [Contact.name, Contact.id], request.args.get('cursor'), limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        response = {'data': serializer.to_dicts(contacts), 'next_cursor': next_cursor}
+        if include_total:
+            response['total'] = total
+        return json_response(response)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/contacts', methods=['POST'])
+@write_route
 def create_contact():
     """Create a new contact."""
     try:
         data = request.get_json()
-        print(f"Received data: {data}")  # Debug log
-        db = Session(engine)
+        db = get_db()
 
         # Convert empty strings to None for unique fields
         email = data.get('email') if data.get('email') else None
@@ -94,29 +140,84 @@ def create_contact():
         )
 
         db.add(contact)
-        db.commit()
+        db.flush()
+
+        return jsonify({'id': contact.id, 'message': 'Contact created successfully'}), 201
+    except Exception as e:
+        print(f"Error creating contact: {str(e)}")  # Debug log
+        return jsonify({'error': str(e)}), 500
 
-        # Get the ID before closing the session
-        contact_id = contact.id
 
-        db.close()
+def parse_bulk_rows():
+    """Parse a bulk request body given as a JSON array or as NDJSON.
+
+    NDJSON lines that are not valid JSON are passed through as strings so
+    they are reported as per-row errors.
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        rows = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(line)
+        return rows
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('contacts')
+    if not isinstance(data, list):
+        raise ValueError('Expected a JSON array of rows or NDJSON')
+    return data
+
+
+@app.route('/api/contacts/bulk', methods=['POST'])
+@write_route
+def bulk_upsert_contacts():
+    """Create or update many contacts in one request.
+
+    Rows are matched to existing contacts on email or codementor_username
+    and written in batched statements. The response reports created,
+    updated and failed counts and one result per row.
+    """
+    try:
+        rows = parse_bulk_rows()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if len(rows) > MAX_BULK_ROWS:
+        return jsonify({'error': f'At most {MAX_BULK_ROWS} rows per request'}), 413
 
-        return jsonify({'id': contact_id, 'message': 'Contact created successfully'}), 201
+    try:
+        db = get_db()
+        results = upsert_contacts(db, rows)
+
+        counts = {'created': 0, 'updated': 0, 'error': 0}
+        for result in results:
+            counts[result['status']] += 1
+
+        return jsonify({
+            'created': counts['created'],
+            'updated': counts['updated'],
+            'failed': counts['error'],
+            'results': results
+        })
     except Exception as e:
-        print(f"Error creating contact: {str(e)}")  # Debug log
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/contacts/<int:contact_id>', methods=['PUT'])
+@write_route
 def update_contact(contact_id):
     """Update a contact."""
     try:
         data = request.get_json()
-        db = Session(engine)
+        db = get_db()
 
         contact = db.query(Contact).filter(Contact.id == contact_id).first()
         if not contact:
-            db.close()
             return jsonify({'error': 'Contact not found'}), 404
 
         # Convert empty strings to None for unique fields
@@ -131,8 +232,7 @@ def update_contact(contact_id):
         contact.is_active = data.get('is_active', True)
         contact.updated_at = datetime.now(timezone.utc)
 
-        db.commit()
-        db.close()
+        db.flush()
 
         return jsonify({'message': 'Contact updated successfully'})
     except Exception as e:
@@ -140,18 +240,17 @@ def update_contact(contact_id):
 
 
 @app.route('/api/contacts/<int:contact_id>', methods=['DELETE'])
+@write_route
 def delete_contact(contact_id):
     """Delete a contact."""
     try:
-        db = Session(engine)
+        db = get_db()
         contact = db.query(Contact).filter(Contact.id == contact_id).first()
         if not contact:
-            db.close()
             return jsonify({'error': 'Contact not found'}), 404
 
         db.delete(contact)
-        db.commit()
-        db.close()
+        db.flush()
 
         return jsonify({'message': 'Contact deleted successfully'})
     except Exception as e:
@@ -159,38 +258,34 @@ def delete_contact(contact_id):
 
 
 @app.route('/api/templates', methods=['GET'])
+@conditional_get(MessageTemplate)
 def get_templates():
-    """Get all message templates."""
-    try:
-        db = Session(engine)
-        templates = db.query(MessageTemplate).order_by(MessageTemplate.name).all()
-
-        result = []
-        for template in templates:
-            result.append({
-                'id': template.id,
-                'name': template.name,
-                'subject': template.subject,
-                'body': template.body,
-                'is_default': template.is_default,
-                'is_active': template.is_active,
-                'created_at': template.created_at.isoformat() if template.created_at else None,
-                'updated_at': template.updated_at.isoformat() if template.updated_at else None
-            })
-
-        db.close()
-        return jsonify(result)
+    """Get all message templates.
+
+    Query parameters:
+        fields: Comma-separated fields to return; id is always included.
+    """
+    try:
+        serializer = get_serializer('template').select_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        db = get_db()
+        templates = db.query(*serializer.columns).order_by(MessageTemplate.name).all()
+
+        return json_response(serializer.to_dicts(templates))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/templates', methods=['POST'])
+@write_route
 def create_template():
     """Create a new message template."""
     try:
         data = request.get_json()
-        print(f"Received template data: {data}")  # Debug log
-        db = Session(engine)
+        db = get_db()
 
         template = MessageTemplate(
             name=data['name'],
@@ -201,9 +296,8 @@ def create_template():
         )
 
         db.add(template)
-        db.commit()
+        db.flush()
         template_id = template.id
-        db.close()
 
         return jsonify({'id': template_id, 'message': 'Template created successfully'}), 201
     except Exception as e:
@@ -212,15 +306,15 @@ def create_template():
 
 
 @app.route('/api/templates/<int:template_id>', methods=['PUT'])
+@write_route
 def update_template(template_id):
     """Update a message template."""
     try:
         data = request.get_json()
-        db = Session(engine)
+        db = get_db()
 
         template = db.query(MessageTemplate).filter(MessageTemplate.id == template_id).first()
         if not template:
-            db.close()
             return jsonify({'error': 'Template not found'}), 404
 
         template.name = data['name']
@@ -230,8 +324,7 @@ def update_template(template_id):
         template.is_active = data.get('is_active', True)
         template.updated_at = datetime.now(timezone.utc)
 
-        db.commit()
-        db.close()
+        db.flush()
 
         return jsonify({'message': 'Template updated successfully'})
     except Exception as e:
@@ -239,18 +332,17 @@ def update_template(template_id):
 
 
 @app.route('/api/templates/<int:template_id>', methods=['DELETE'])
+@write_route
 def delete_template(template_id):
     """Delete a message template."""
     try:
-        db = Session(engine)
+        db = get_db()
         template = db.query(MessageTemplate).filter(MessageTemplate.id == template_id).first()
         if not template:
-            db.close()
             return jsonify({'error': 'Template not found'}), 404
 
         db.delete(template)
-        db.commit()
-        db.close()
+        db.flush()
 
         return jsonify({'message': 'Template deleted successfully'})
     except Exception as e:
@@ -264,87 +356,272 @@ def preview_template(template_id):
         data = request.get_json()
         contact_id = data.get('contact_id')
 
-        db = Session(engine)
-        template = db.query(MessageTemplate).filter(MessageTemplate.id == template_id).first()
+        db = get_db()
+        template = db.query(MessageTemplate).options(undefer(MessageTemplate.body)).filter(
+            MessageTemplate.id == template_id
+        ).first()
         if not template:
-            db.close()
             return jsonify({'error': 'Template not found'}), 404
 
+        contacts = db.query(Contact).options(undefer(Contact.notes))
         if contact_id:
-            contact = db.query(Contact).filter(Contact.id == contact_id).first()
+            contact = contacts.filter(Contact.id == contact_id).first()
             if not contact:
-                db.close()
                 return jsonify({'error': 'Contact not found'}), 404
         else:
             # Use first contact as default
-            contact = db.query(Contact).first()
+            contact = contacts.first()
             if not contact:
-                db.close()
                 return jsonify({'error': 'No contacts available for preview'}), 400
 
         # Render template with contact data
         rendered = template.render_template(contact)
 
-        db.close()
         return jsonify(rendered)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/templates/<int:template_id>/preview/batch', methods=['POST'])
+def preview_template_batch(template_id):
+    """Preview a template for many contacts.
+
+    Takes {"contact_ids": [...]} or {"filter": {...}} with the filters of
+    GET /api/contacts, at most MAX_PREVIEW_BATCH contacts. Streams NDJSON
+    lines of {contact_id, subject, body}, or {contact_id, error} for
+    contacts that are missing or fail to render.
+    """
+    try:
+        db = get_db()
+        template = db.query(MessageTemplate).options(undefer(MessageTemplate.body)).filter(
+            MessageTemplate.id == template_id
+        ).first()
+        if not template:
+            return jsonify({'error': 'Template not found'}), 404
+
+        try:
+            contact_ids, criteria = parse_preview_targets(request.get_json(silent=True))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if contact_ids is not None and len(contact_ids) > MAX_PREVIEW_BATCH:
+            return jsonify({'error': f'At most {MAX_PREVIEW_BATCH} contacts per preview batch'}), 413
+
+        contacts = db.query(Contact).options(undefer(Contact.notes)).filter(
+            *preview_contact_criteria(contact_ids, criteria)
+        ).order_by(Contact.name, Contact.id).limit(MAX_PREVIEW_BATCH).all()
+
+        compiled = template.compile()
+        # Rendering runs after the request's session is closed
+        db.expunge_all()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    return Response(render_previews(compiled, contacts, contact_ids), mimetype='application/x-ndjson')
+
+
 @app.route('/api/schedule', methods=['GET'])
+@conditional_get(ScheduledFollowup)
 def get_schedule():
-    """Get scheduled follow-ups."""
+    """Get a page of scheduled follow-ups ordered by scheduled date.
+
+    Query parameters:
+        limit: Page size (default 100, max 1000).
+        cursor: Opaque cursor from a previous page's next_cursor.
+        order: 'asc' (default) or 'desc' by scheduled date.
+        status: Filter by status; accepts a comma-separated list.
+        platform: Filter by platform.
+        contact_id: Filter by contact.
+        date_from: Only follow-ups scheduled at or after this ISO timestamp.
+        date_to: Only follow-ups scheduled before this ISO timestamp.
+        include_total: Include the total number of matching follow-ups.
+        fields: Comma-separated fields to return; id and scheduled_date are always included.
+    """
     try:
-        db = Session(engine)
-        followups = db.query(ScheduledFollowup).order_by(ScheduledFollowup.scheduled_date).all()
+        limit = parse_limit(request.args.get('limit'))
+        include_total = parse_bool(request.args.get('include_total'))
+        criteria = schedule_criteria(request.args)
+        order = request.args.get('order', 'asc')
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        serializer = get_serializer('followup').select_fields(
+            request.args.get('fields'), required=('id', 'scheduled_date')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        db = get_db()
+        query = db.query(*serializer.columns).filter(*criteria)
+
+        total = query.order_by(None).count() if include_total else None
 
-        result = []
-        for followup in followups:
-            result.append({
-                'id': followup.id,
-                'contact_id': followup.contact_id,
-                'template_id': followup.template_id,
-                'scheduled_date': followup.scheduled_date.isoformat() if followup.scheduled_date else None,
-                'status': followup.status,
-                'created_at': followup.created_at.isoformat() if followup.created_at else None
-            })
+        try:
+            followups, next_cursor = paginate(
+                query,
+                [ScheduledFollowup.scheduled_date, ScheduledFollowup.id],
+                request.args.get('cursor'),
+                limit,
+                descending=order == 'desc'
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        response = {'data': serializer.to_dicts(followups), 'next_cursor': next_cursor}
+        if include_total:
+            response['total'] = total
+        return json_response(response)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# Bulk schedule API endpoints
 
-        db.close()
-        return jsonify(result)
+def run_followup_bulk_action(action):
+    """Run a set-based follow-up update for the request's filter.
+
+    The JSON body must contain a filter object using the same keys as
+    GET /api/schedule plus ids and sequence_id. An empty filter matches
+    every follow-up the action applies to.
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data.get('filter'), dict):
+        return jsonify({'error': 'filter object is required'}), 400
+
+    try:
+        criteria = schedule_criteria(data['filter'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    db = get_db()
+    try:
+        affected = action(db, criteria, data)
+        return jsonify({'affected': affected})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/schedule/cancel', methods=['POST'])
+@write_route
+def bulk_cancel_followups():
+    """Cancel every pending follow-up matching the filter."""
+    return run_followup_bulk_action(lambda db, criteria, data: cancel_followups(db, criteria))
+
+
+@app.route('/api/schedule/retry', methods=['POST'])
+@write_route
+def bulk_retry_followups():
+    """Retry every failed follow-up matching the filter.
+
+    Optional body fields: max_retries and scheduled_date.
+    """
+    def action(db, criteria, data):
+        return retry_followups(
+            db,
+            criteria,
+            max_retries=parse_int(data.get('max_retries'), 'max_retries'),
+            scheduled_date=parse_datetime(data.get('scheduled_date'))
+        )
+    return run_followup_bulk_action(action)
+
+
+@app.route('/api/schedule/reschedule', methods=['POST'])
+@write_route
+def bulk_reschedule_followups():
+    """Move every pending follow-up matching the filter to scheduled_date."""
+    def action(db, criteria, data):
+        scheduled_date = parse_datetime(data.get('scheduled_date'))
+        if not scheduled_date:
+            raise ValueError('scheduled_date is required')
+        return reschedule_followups(db, criteria, scheduled_date)
+    return run_followup_bulk_action(action)
+
+
+@app.route('/api/schedule/reassign', methods=['POST'])
+@write_route
+def bulk_reassign_followups():
+    """Switch the template and/or platform of matching pending follow-ups."""
+    def action(db, criteria, data):
+        return reassign_followups(
+            db,
+            criteria,
+            template_id=parse_int(data.get('template_id'), 'template_id'),
+            platform=data.get('platform') or None
+        )
+    return run_followup_bulk_action(action)
+
+
+# Export API endpoints
+
+def export_response(rows, export_format, name):
+    """Wrap a streaming export in a downloadable response."""
+    extension = 'csv' if export_format == 'csv' else 'ndjson'
+    return Response(
+        rows,
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename={name}.{extension}'}
+    )
+
+
+@app.route('/api/export/contacts', methods=['GET'])
+def export_contacts_endpoint():
+    """Stream all contacts as NDJSON or CSV.
+
+    Accepts format=ndjson|csv (default ndjson) and the same filters as
+    GET /api/contacts.
+    """
+    try:
+        export_format = request.args.get('format', DEFAULT_EXPORT_FORMAT)
+        rows = export_contacts(export_format, contact_criteria(request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return export_response(rows, export_format, 'contacts')
+
+
+@app.route('/api/export/schedule', methods=['GET'])
+def export_schedule_endpoint():
+    """Stream follow-up history as NDJSON or CSV.
+
+    Accepts format=ndjson|csv (default ndjson) and the same filters as
+    GET /api/schedule.
+    """
+    try:
+        export_format = request.args.get('format', DEFAULT_EXPORT_FORMAT)
+        rows = export_schedule(export_format, schedule_criteria(request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return export_response(rows, export_format, 'schedule')
+
+
 # Sequence API endpoints
 
 @app.route('/api/sequences', methods=['GET'])
+@conditional_get(FollowupSequence, FollowupSequenceStep, ContactSequenceAssignment)
 def get_sequences():
-    """Get all follow-up sequences."""
-    try:
-        db = Session(engine)
-        sequences = db.query(FollowupSequence).order_by(FollowupSequence.name).all()
-
-        result = []
-        for sequence in sequences:
-            result.append({
-                'id': sequence.id,
-                'name': sequence.name,
-                'description': sequence.description,
-                'platform': sequence.platform,
-                'is_active': sequence.is_active,
-                'step_count': sequence.step_count,
-                'total_duration_days': sequence.total_duration_days,
-                'created_at': sequence.created_at.isoformat() if sequence.created_at else None,
-                'updated_at': sequence.updated_at.isoformat() if sequence.updated_at else None
-            })
-
-        db.close()
-        return jsonify(result)
+    """Get all follow-up sequences.
+
+    Query parameters:
+        fields: Comma-separated fields to return; id is always included.
+    """
+    try:
+        serializer = get_serializer('sequence').select_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        db = get_db()
+        sequences = serializer.with_joins(db.query(*serializer.columns)).order_by(FollowupSequence.name).all()
+
+        return json_response(serializer.to_dicts(sequences))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/sequences', methods=['POST'])
+@write_route
 def create_sequence():
     """Create a new follow-up sequence."""
     try:
@@ -356,7 +633,7 @@ def create_sequence():
         if not data.get('platform'):
             return jsonify({'error': 'Platform is required'}), 400
 
-        db = Session(engine)
+        db = get_db()
 
         sequence = FollowupSequence(
             name=data['name'],
@@ -366,11 +643,10 @@ def create_sequence():
         )
 
         db.add(sequence)
-        db.commit()
+        db.flush()
         db.refresh(sequence)
 
         sequence_id = sequence.id
-        db.close()
 
         return jsonify({
             'id': sequence_id,
@@ -380,6 +656,8 @@ def create_sequence():
             'is_active': sequence.is_active,
             'step_count': 0,
             'total_duration_days': 0,
+            'active_assignments': 0,
+            'completed_assignments': 0,
             'created_at': sequence.created_at.isoformat() if sequence.created_at else None,
             'updated_at': sequence.updated_at.isoformat() if sequence.updated_at else None
         }), 201
@@ -389,15 +667,15 @@ def create_sequence():
 
 
 @app.route('/api/sequences/<int:sequence_id>', methods=['PUT'])
+@write_route
 def update_sequence(sequence_id):
     """Update a follow-up sequence."""
     try:
         data = request.get_json()
-        db = Session(engine)
+        db = get_db()
 
         sequence = db.query(FollowupSequence).filter(FollowupSequence.id == sequence_id).first()
         if not sequence:
-            db.close()
             return jsonify({'error': 'Sequence not found'}), 404
 
         # Update fields
@@ -411,8 +689,7 @@ def update_sequence(sequence_id):
             sequence.is_active = data['is_active']
 
         sequence.updated_at = datetime.now(timezone.utc)
-        db.commit()
-        db.close()
+        db.flush()
 
         return jsonify({'message': 'Sequence updated successfully'})
 
@@ -421,19 +698,18 @@ def update_sequence(sequence_id):
 
 
 @app.route('/api/sequences/<int:sequence_id>', methods=['DELETE'])
+@write_route
 def delete_sequence(sequence_id):
     """Delete a follow-up sequence."""
     try:
-        db = Session(engine)
+        db = get_db()
 
         sequence = db.query(FollowupSequence).filter(FollowupSequence.id == sequence_id).first()
         if not sequence:
-            db.close()
             return jsonify({'error': 'Sequence not found'}), 404
 
         db.delete(sequence)
-        db.commit()
-        db.close()
+        db.flush()
 
         return jsonify({'message': 'Sequence deleted successfully'})
 
@@ -442,34 +718,31 @@ def delete_sequence(sequence_id):
 
 
 @app.route('/api/sequences/<int:sequence_id>/steps', methods=['GET'])
+@conditional_get(FollowupSequenceStep)
 def get_sequence_steps(sequence_id):
-    """Get all steps for a sequence."""
+    """Get all steps for a sequence.
+
+    Query parameters:
+        fields: Comma-separated fields to return; id is always included.
+    """
     try:
-        db = Session(engine)
-        steps = db.query(FollowupSequenceStep).filter(
+        serializer = get_serializer('step').select_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        db = get_db()
+        steps = db.query(*serializer.columns).filter(
             FollowupSequenceStep.sequence_id == sequence_id
         ).order_by(FollowupSequenceStep.step_number).all()
 
-        result = []
-        for step in steps:
-            result.append({
-                'id': step.id,
-                'sequence_id': step.sequence_id,
-                'step_number': step.step_number,
-                'delay_days': step.delay_days,
-                'template_id': step.template_id,
-                'is_active': step.is_active,
-                'created_at': step.created_at.isoformat() if step.created_at else None,
-                'updated_at': step.updated_at.isoformat() if step.updated_at else None
-            })
-
-        db.close()
-        return jsonify(result)
+        return json_response(serializer.to_dicts(steps))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/sequences/<int:sequence_id>/steps', methods=['POST'])
+@write_route
 def create_sequence_step(sequence_id):
     """Create a new step in a sequence."""
     try:
@@ -483,12 +756,11 @@ def create_sequence_step(sequence_id):
         if not data.get('template_id'):
             return jsonify({'error': 'Template ID is required'}), 400
 
-        db = Session(engine)
+        db = get_db()
 
         # Check if sequence exists
         sequence = db.query(FollowupSequence).filter(FollowupSequence.id == sequence_id).first()
         if not sequence:
-            db.close()
             return jsonify({'error': 'Sequence not found'}), 404
 
         step = FollowupSequenceStep(
@@ -500,11 +772,10 @@ def create_sequence_step(sequence_id):
         )
 
         db.add(step)
-        db.commit()
+        db.flush()
         db.refresh(step)
 
         step_id = step.id
-        db.close()
 
         return jsonify({
             'id': step_id,
@@ -521,42 +792,129 @@ def create_sequence_step(sequence_id):
         return jsonify({'error': str(e)}), 500
 
 
-# Settings API endpoints
+# Delta sync API endpoints
 
-@app.route('/api/settings', methods=['GET'])
-def get_settings():
-    """Get all application settings."""
+@app.route('/api/sync', methods=['GET'])
+def sync():
+    """Get the rows created, updated or deleted since a change token.
+
+    Without since, only the current token is returned along with
+    reset=true: the client should load the full lists and sync from that
+    token afterwards. reset=true is also returned when the token is older
+    than the retained history. Each resource lists its upserted rows and
+    the ids of deleted rows (tombstones). When has_more is true the
+    client should call again with the returned token.
+    """
     try:
-        db = Session(engine)
+        since = parse_int(request.args.get('since'), 'since')
+        limit = parse_limit(request.args.get('limit'), default=1000, maximum=5000)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        # Get Gmail settings
-        gmail_creds = db.query(PlatformCredentials).filter(
-            PlatformCredentials.platform == 'gmail'
-        ).first()
+    try:
+        db = get_db()
+        latest, oldest = db.query(func.max(SyncChange.id), func.min(SyncChange.id)).one()
+        latest = latest or 0
+
+        if since is None or since > latest or (oldest is not None and since < oldest - 1):
+            return jsonify({'token': str(latest), 'reset': True, 'has_more': False})
+
+        changes = db.query(SyncChange).filter(SyncChange.id > since).order_by(SyncChange.id).limit(limit + 1).all()
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        token = changes[-1].id if changes else since
+
+        # The last operation recorded for a row wins
+        operations = {}
+        for change in changes:
+            operations[(change.table_name, change.record_id)] = change.operation
+
+        result = {'token': str(token), 'reset': False, 'has_more': has_more}
+        for table_name, (key, serializer_name) in SYNC_RESOURCES.items():
+            serializer = get_serializer(serializer_name)
+            upserted_ids = [record_id for (table, record_id), operation in operations.items()
+                            if table == table_name and operation == 'upsert']
+            deleted_ids = [record_id for (table, record_id), operation in operations.items()
+                           if table == table_name and operation == 'delete']
+
+            rows = serializer.with_joins(db.query(*serializer.columns)).filter(
+                serializer.model.id.in_(upserted_ids)
+            ).all() if upserted_ids else []
+            found_ids = {row.id for row in rows}
+
+            result[key] = {
+                'upserted': serializer.to_dicts(rows),
+                # Rows logged as written but gone since are deletions too
+                'deleted': sorted(deleted_ids + [record_id for record_id in upserted_ids if record_id not in found_ids])
+            }
+
+        return json_response(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        # Get Codementor settings
-        codementor_creds = db.query(PlatformCredentials).filter(
-            PlatformCredentials.platform == 'codementor'
-        ).first()
 
-        # Get automation settings (stored as JSON in a special record)
-        automation_settings = db.query(PlatformCredentials).filter(
-            PlatformCredentials.platform == 'automation'
-        ).first()
+# Dashboard API endpoint
+
+@app.route('/api/stats', methods=['GET'])
+@cached_view(Contact, ScheduledFollowup, ttl=STATS_TTL)
+def stats():
+    """Get dashboard statistics.
+
+    Returns contact totals, follow-ups by status, the overdue count,
+    sends in the last 24 hours and the next due time, computed in one
+    query. Responses are cached for STATS_TTL seconds or until the next
+    write to contacts or follow-ups.
+    """
+    try:
+        return json_response(get_stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# Change events API endpoint
+
+@app.route('/api/events', methods=['GET'])
+def events():
+    """Stream change events as server-sent events.
+
+    Each event is {"resource", "id", "operation"} plus "status" for
+    follow-ups, with the change token as its id. Clients resume with the
+    Last-Event-ID header (sent automatically by EventSource) or the
+    last_event_id parameter; a "reset" event means the missed changes
+    are gone and the client should reload through /api/sync.
+    """
+    try:
+        last_event_id = parse_last_event_id(
+            request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        subscription = broker.subscribe(last_event_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        result = {
-            'gmail': gmail_creds.get_credentials() if gmail_creds else {'email': '', 'app_password': ''},
-            'codementor': codementor_creds.get_credentials() if codementor_creds else {'access_token': '', 'refresh_token': ''},
-            'automation': automation_settings.get_credentials() if automation_settings else {'enabled': False, 'check_interval': 15, 'max_retries': 3, 'timezone': 'UTC'}
-        }
+    return Response(
+        event_stream(subscription),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
-        db.close()
-        return jsonify(result)
+
+# Settings API endpoints
+
+@app.route('/api/settings', methods=['GET'])
+def get_settings():
+    """Get all application settings."""
+    try:
+        return jsonify(settings_service.all())
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/settings/gmail', methods=['POST'])
+@write_route
 def save_gmail_settings():
     """Save Gmail settings."""
     try:
@@ -565,33 +923,12 @@ def save_gmail_settings():
         if not data.get('email'):
             return jsonify({'error': 'Gmail email is required'}), 400
 
-        db = Session(engine)
-
-        # Check if Gmail credentials already exist
-        gmail_creds = db.query(PlatformCredentials).filter(
-            PlatformCredentials.platform == 'gmail'
-        ).first()
-
-        if gmail_creds:
-            # Update existing
-            gmail_creds.credentials = PlatformCredentials.save_credentials({
-                'email': data['email'],
-                'app_password': data.get('app_password', '')
-            })
-            gmail_creds.updated_at = datetime.now(timezone.utc)
-        else:
-            # Create new
-            gmail_creds = PlatformCredentials(
-                platform='gmail',
-                credentials=PlatformCredentials.save_credentials({
-                    'email': data['email'],
-                    'app_password': data.get('app_password', '')
-                })
-            )
-            db.add(gmail_creds)
-
-        db.commit()
-        db.close()
+        db = get_db()
+        settings_service.save(db, 'gmail', {
+            'email': data['email'],
+            'app_password': data.get('app_password', '')
+        })
+        db.flush()
 
         return jsonify({'message': 'Gmail settings saved successfully'})
 
@@ -600,6 +937,7 @@ def save_gmail_settings():
 
 
 @app.route('/api/settings/codementor', methods=['POST'])
+@write_route
 def save_codementor_settings():
     """Save Codementor settings."""
     try:
@@ -608,33 +946,12 @@ def save_codementor_settings():
         if not data.get('access_token'):
             return jsonify({'error': 'Access token is required'}), 400
 
-        db = Session(engine)
-
-        # Check if Codementor credentials already exist
-        codementor_creds = db.query(PlatformCredentials).filter(
-            PlatformCredentials.platform == 'codementor'
-        ).first()
-
-        if codementor_creds:
-            # Update existing
-            codementor_creds.credentials = PlatformCredentials.save_credentials({
-                'access_token': data['access_token'],
-                'refresh_token': data.get('refresh_token', '')
-            })
-            codementor_creds.updated_at = datetime.now(timezone.utc)
-        else:
-            # Create new
-            codementor_creds = PlatformCredentials(
-                platform='codementor',
-                credentials=PlatformCredentials.save_credentials({
-                    'access_token': data['access_token'],
-                    'refresh_token': data.get('refresh_token', '')
-                })
-            )
-            db.add(codementor_creds)
-
-        db.commit()
-        db.close()
+        db = get_db()
+        settings_service.save(db, 'codementor', {
+            'access_token': data['access_token'],
+            'refresh_token': data.get('refresh_token', '')
+        })
+        db.flush()
 
         return jsonify({'message': 'Codementor settings saved successfully'})
 
@@ -643,42 +960,20 @@ def save_codementor_settings():
 
 
 @app.route('/api/settings/automation', methods=['POST'])
+@write_route
 def save_automation_settings():
     """Save automation settings."""
     try:
         data = request.get_json()
 
-        db = Session(engine)
-
-        # Check if automation settings already exist
-        automation_settings = db.query(PlatformCredentials).filter(
-            PlatformCredentials.platform == 'automation'
-        ).first()
-
-        if automation_settings:
-            # Update existing
-            automation_settings.credentials = PlatformCredentials.save_credentials({
-                'enabled': data.get('enabled', False),
-                'check_interval': data.get('check_interval', 15),
-                'max_retries': data.get('max_retries', 3),
-                'timezone': data.get('timezone', 'UTC')
-            })
-            automation_settings.updated_at = datetime.now(timezone.utc)
-        else:
-            # Create new
-            automation_settings = PlatformCredentials(
-                platform='automation',
-                credentials=PlatformCredentials.save_credentials({
-                    'enabled': data.get('enabled', False),
-                    'check_interval': data.get('check_interval', 15),
-                    'max_retries': data.get('max_retries', 3),
-                    'timezone': data.get('timezone', 'UTC')
-                })
-            )
-            db.add(automation_settings)
-
-        db.commit()
-        db.close()
+        db = get_db()
+        settings_service.save(db, 'automation', {
+            'enabled': data.get('enabled', False),
+            'check_interval': data.get('check_interval', 15),
+            'max_retries': data.get('max_retries', 3),
+            'timezone': data.get('timezone', 'UTC')
+        })
+        db.flush()
 
         return jsonify({'message': 'Automation settings saved successfully'})
 
@@ -714,6 +1009,171 @@ def test_codementor_connection():
         return jsonify({'error': str(e)}), 500
 
 
+# Batch API endpoint
+
+# Largest number of sub-requests accepted by one batch
+MAX_BATCH_REQUESTS = 50
+
+# Sub-request methods that only read; the others run on the write queue
+BATCH_READ_METHODS = ('GET', 'HEAD')
+
+# Views whose responses stream and so cannot be embedded in a batch response
+STREAMING_ENDPOINTS = {'events', 'export_contacts_endpoint', 'export_schedule_endpoint', 'preview_template_batch'}
+
+
+def is_write_sub_request(sub_request):
+    """Check whether a batch sub-request may write."""
+    return str(sub_request.get('method', 'GET')).upper() not in BATCH_READ_METHODS
+
+
+def dispatch_sub_request(sub_request):
+    """Run one batch sub-request through the normal Flask routing."""
+    method = str(sub_request.get('method', 'GET')).upper()
+    path = sub_request.get('path')
+    if not isinstance(path, str) or not path.startswith('/api/'):
+        return {'status': 400, 'body': {'error': 'path must start with /api/'}}
+    if path.split('?')[0].rstrip('/') == '/api/batch':
+        return {'status': 400, 'body': {'error': 'Batches cannot be nested'}}
+
+    # Sub-responses are embedded in the batch body, so they must not be compressed
+    headers = {
+        name: value for name, value in (sub_request.get('headers') or {}).items()
+        if name.lower() != 'accept-encoding'
+    }
+    builder = EnvironBuilder(
+        path=path,
+        method=method,
+        headers=headers,
+        json=sub_request['body'] if sub_request.get('body') is not None else None
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+
+    with app.request_context(environ):
+        if request.endpoint in STREAMING_ENDPOINTS:
+            return {'status': 400, 'body': {'error': 'Streaming endpoints cannot be batched'}}
+        response = app.full_dispatch_request()
+
+    # Buffering a stream would never finish for event streams
+    if response.is_streamed:
+        response.close()
+        return {'status': 400, 'body': {'error': 'Streamed responses cannot be batched'}}
+
+    body = response.get_data(as_text=True)
+    result = {
+        'status': response.status_code,
+        'body': json.loads(body) if response.is_json and body else body or None
+    }
+    headers = {name: response.headers[name] for name in ('ETag', 'Last-Modified') if name in response.headers}
+    if headers:
+        result['headers'] = headers
+    return result
+
+
+def run_batch_writes(sub_requests, atomic):
+    """Run consecutive write sub-requests as one write-queue job.
+
+    Each runs in its own savepoint, so a failed one is rolled back alone;
+    with atomic, any failed one rolls back all of them. The job commits
+    with the rest of its group before this returns.
+    """
+    context = contextvars.copy_context()
+
+    def job(session):
+        return context.run(lambda: [dispatch_sub_request(sub_request) for sub_request in sub_requests])
+
+    keep = (lambda results: all(result['status'] < 400 for result in results)) if atomic else None
+    try:
+        return write_queue.run(job, keep=keep)
+    except WriteQueueTimeout as e:
+        return [{'status': 503, 'body': {'error': str(e)}} for _ in sub_requests]
+    except Exception as e:
+        return [{'status': 500, 'body': {'error': str(e)}} for _ in sub_requests]
+
+
+def run_batch(sub_requests, atomic):
+    """Dispatch sub-requests in order and respond with their results.
+
+    Reads run on this thread on the request's session; each run of
+    consecutive writes runs on the write queue. Sub-requests skip the
+    per-request commit.
+    """
+    results = []
+    writes_failed = False
+    g.in_batch = True
+    try:
+        for writes, group in itertools.groupby(sub_requests, is_write_sub_request):
+            group = list(group)
+            if not writes:
+                results.extend(dispatch_sub_request(sub_request) for sub_request in group)
+                continue
+            write_results = run_batch_writes(group, atomic)
+            writes_failed = writes_failed or any(result['status'] >= 400 for result in write_results)
+            results.extend(write_results)
+            # Later reads start a new snapshot that includes these writes
+            session = g.get('db_session')
+            if session is not None:
+                session.commit()
+    finally:
+        g.in_batch = False
+
+    if atomic and writes_failed:
+        return jsonify(results), 409
+    return jsonify(results)
+
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """Run several API requests in one round trip.
+
+    Takes a JSON array (or {"requests": [...], "atomic": bool}) of
+    sub-requests with method, path, optional body and optional headers,
+    and returns an array of {status, body, headers} sub-responses in the
+    same order. Streaming endpoints (events, exports, preview batches)
+    get a 400 sub-response.
+
+    Read sub-requests share one database session, so reads up to the
+    first write see one snapshot. Consecutive write sub-requests run
+    together as one write-queue job and are committed before the next
+    read, which sees them; each write runs in its own savepoint and a
+    failed one is rolled back alone. An atomic batch must list its
+    write sub-requests together; if any of them fails, all of them are
+    rolled back and the batch responds 409.
+    """
+    data = request.get_json(silent=True)
+    atomic = False
+    if isinstance(data, dict):
+        atomic = bool(data.get('atomic'))
+        data = data.get('requests')
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        return jsonify({'error': 'Expected a JSON array of sub-requests'}), 400
+    if len(data) > MAX_BATCH_REQUESTS:
+        return jsonify({'error': f'At most {MAX_BATCH_REQUESTS} sub-requests per batch'}), 413
+    if atomic and sum(writes for writes, _ in itertools.groupby(data, is_write_sub_request)) > 1:
+        return jsonify({'error': 'An atomic batch must list its write sub-requests together'}), 400
+
+    return run_batch(data, atomic)
+
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Get connection pool, session, write queue and response cache counters.
+
+    database includes the pool's size, current usage and checkout wait
+    times; see src.models.database.pool_stats.
+    """
+    try:
+        return jsonify({
+            'database': session_stats(),
+            'write_queue': write_queue.stats(),
+            'response_cache': response_cache.stats()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
@@ -16,7 +16,9 @@ from .models.platform_credentials import PlatformCredentials
 from .models.followup_sequence import FollowupSequence
 from .models.followup_sequence_step import FollowupSequenceStep
 from .models.contact_sequence_assignment import ContactSequenceAssignment
-from sqlalchemy.orm import Session
+from .filters import LIKE_ESCAPE, contains_pattern
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, undefer
 
 
 def with_surrogates(text):
@@ -121,7 +123,7 @@ class TemplateDialog(ctk.CTkToplevel):
         # Get first contact for preview
         try:
             db = Session(engine)
-            contact = db.query(Contact).first()
+            contact = db.query(Contact).options(undefer(Contact.notes)).first()
             db.close()
 
             if not contact:
@@ -672,22 +674,24 @@ class FollowupperApp(ctk.CTk):
 
         try:
             db = Session(engine)
-            contacts = db.query(Contact).order_by(Contact.name).all()
+            # Match notes in SQL so the deferred column is never loaded
+            pattern = contains_pattern(search_text)
+            contacts = db.query(Contact).filter(or_(
+                Contact.name.ilike(pattern, escape=LIKE_ESCAPE),
+                Contact.email.ilike(pattern, escape=LIKE_ESCAPE),
+                Contact.notes.ilike(pattern, escape=LIKE_ESCAPE)
+            )).order_by(Contact.name).all()
 
             for contact in contacts:
-                if (search_text in (contact.name or "").lower() or
-                    search_text in (contact.email or "").lower() or
-                        search_text in (contact.notes or "").lower()):
-
-                    status = "Active" if contact.is_active else "Inactive"
-                    self.tree.insert("", "end", values=(
-                        contact.id,
-                        contact.name,
-                        contact.email or "",
-                        contact.platform_preference or "email",
-                        status,
-                        "Edit"
-                    ))
+                status = "Active" if contact.is_active else "Inactive"
+                self.tree.insert("", "end", values=(
+                    contact.id,
+                    contact.name,
+                    contact.email or "",
+                    contact.platform_preference or "email",
+                    status,
+                    "Edit"
+                ))
 
             db.close()
 
@@ -713,7 +717,7 @@ class FollowupperApp(ctk.CTk):
 
         try:
             db = Session(engine)
-            contact = db.query(Contact).filter(Contact.id == contact_id).first()
+            contact = db.query(Contact).options(undefer(Contact.notes)).filter(Contact.id == contact_id).first()
             db.close()
 
             if contact:
@@ -808,7 +812,9 @@ class FollowupperApp(ctk.CTk):
 
         try:
             db = Session(engine)
-            template = db.query(MessageTemplate).filter(MessageTemplate.id == template_id).first()
+            template = db.query(MessageTemplate).options(undefer(MessageTemplate.body)).filter(
+                MessageTemplate.id == template_id
+            ).first()
             db.close()
 
             if template:
@@ -0,0 +1,1145 @@
+"""ASGI variant of the Followupper API on async SQLAlchemy.
+
+Serves the same routes and JSON shapes as the Flask app in src/api.py
+with Starlette on create_async_engine (aiosqlite for SQLite, asyncpg for
+PostgreSQL). Handlers await the database instead of holding a thread, so
+one process can keep thousands of slow clients and long-lived streams
+open. Write paths built on the synchronous bulk helpers run them through
+AsyncSession.run_sync.
+
+Run with:
+    uvicorn src.asgi:app --workers 4
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import undefer
+from starlette.applications import Starlette
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Match, Route
+from werkzeug.http import parse_etags, parse_date, http_date, quote_etag
+
+from .models.database import DATABASE_URL, Base, engine, configure_sqlite, configure_postgresql, pool_options, pool_usage
+from .models.contact import Contact
+from .models.message_template import MessageTemplate
+from .models.scheduled_followup import ScheduledFollowup
+from .models.followup_sequence import FollowupSequence
+from .models.followup_sequence_step import FollowupSequenceStep
+from .models.contact_sequence_assignment import ContactSequenceAssignment
+from .models.sync_change import SyncChange, SYNC_RESOURCES, prune_changes
+from .pagination import keyset, page_rows, parse_limit, parse_bool, parse_datetime
+from .filters import contact_criteria, schedule_criteria, parse_int
+from .export import (
+    EXPORT_CHUNK_ROWS, DEFAULT_EXPORT_FORMAT, EXPORT_FORMATS, CONTACT_EXPORT_COLUMNS, SCHEDULE_EXPORT_COLUMNS,
+    export_statement, chunk_encoder
+)
+from .http_cache import validator_statement, validator_tables, last_modified_time, compute_etag
+from .response_cache import CachedResponse, response_cache, external_changes, current_versions
+from .compression import (
+    COMPRESSION_MIN_SIZE, CODERS, compressed_bodies, is_compressible_mimetype, negotiate_encoding,
+    compress, representation_etag, representation_etags
+)
+from .serializers import get_serializer, dumps
+from .previews import MAX_PREVIEW_BATCH, parse_preview_targets, preview_contact_criteria, render_previews
+from .stats import get_stats
+from .settings import settings_service
+from .events import broker, async_event_stream, parse_last_event_id
+from .bulk import (
+    MAX_BULK_ROWS, upsert_contacts, cancel_followups, retry_followups,
+    reschedule_followups, reassign_followups
+)
+
+# Days of change history kept for delta sync
+SYNC_RETENTION_DAYS = 30
+
+# Largest number of sub-requests accepted by one batch
+MAX_BATCH_REQUESTS = 50
+
+
+def async_database_url(url):
+    """Map a synchronous database URL to its async driver."""
+    if url.startswith('sqlite:'):
+        return 'sqlite+aiosqlite:' + url[len('sqlite:'):]
+    if url.startswith(('postgresql:', 'postgres:')):
+        return 'postgresql+asyncpg:' + url.split(':', 1)[1]
+    return url
+
+
+async_engine = create_async_engine(
+    async_database_url(DATABASE_URL),
+    **pool_options(DATABASE_URL, asynchronous=True),
+    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+)
+if async_engine.dialect.name == 'sqlite':
+    configure_sqlite(async_engine.sync_engine)
+elif async_engine.dialect.name == 'postgresql':
+    configure_postgresql(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+def run_migrations():
+    """Run database migrations (blocking; called from a worker thread)."""
+    try:
+        from alembic.config import Config
+        from alembic import command
+        command.upgrade(Config("alembic.ini"), "head")
+    except Exception as e:
+        print(f"Error running migrations: {e}")
+        # Fallback: create tables directly
+        Base.metadata.create_all(bind=engine)
+
+
+async def prune_sync_log():
+    """Drop delta sync history older than the retention window."""
+    try:
+        async with async_engine.begin() as connection:
+            await connection.run_sync(
+                prune_changes, datetime.now(timezone.utc) - timedelta(days=SYNC_RETENTION_DAYS)
+            )
+    except Exception as e:
+        print(f"Error pruning sync log: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Migrate the database before serving and release the pool after."""
+    await asyncio.to_thread(run_migrations)
+    await prune_sync_log()
+    yield
+    await async_engine.dispose()
+
+
+# Responses
+
+def json_response(payload, status=200):
+    """Build a JSON response from a payload encoded with dumps."""
+    return Response(dumps(payload), status_code=status, media_type='application/json')
+
+
+def error_response(message, status):
+    """Build a {'error': message} response."""
+    return json_response({'error': message}, status)
+
+
+class CompressionMiddleware:
+    """Negotiated response compression, the ASGI counterpart of compress_response.
+
+    Single-message bodies below COMPRESSION_MIN_SIZE are left alone;
+    streamed bodies are compressed chunk by chunk. Responses that already
+    carry a Content-Encoding (cached list bodies) pass through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        stream = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, stream, passthrough
+            if message['type'] == 'http.response.start':
+                start = message
+                return
+            if message['type'] != 'http.response.body' or passthrough:
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+            if stream is None:
+                headers = MutableHeaders(raw=start['headers'])
+                media_type = headers.get('content-type', '').split(';')[0]
+                if (
+                    start['status'] in (204, 206, 304) or 'content-encoding' in headers
+                    or not is_compressible_mimetype(media_type)
+                    or (not more_body and len(body) < COMPRESSION_MIN_SIZE)
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                headers['Content-Encoding'] = encoding
+                headers.add_vary_header('Accept-Encoding')
+                if not more_body:
+                    body = compress(body, encoding)
+                    headers['Content-Length'] = str(len(body))
+                    await send(start)
+                    await send({'type': 'http.response.body', 'body': body})
+                    return
+                del headers['Content-Length']
+                stream = CODERS[encoding][1]()
+                await send(start)
+
+            data = stream.chunk(body) if body else b''
+            if not more_body:
+                data += stream.finish()
+            await send({'type': 'http.response.body', 'body': data, 'more_body': more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def conditional_get(*models):
+    """Async conditional GET with cached validators and bodies.
+
+    Mirrors src.http_cache.conditional_get: 304 when the client's
+    validator is current, otherwise the handler's 200 response, compressed
+    and cached per (ETag, encoding). Validators and bodies come from the
+    response cache until one of the tables is written.
+    """
+    tables = tuple(model.__tablename__ for model in models)
+
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(request):
+            if external_changes.due():
+                await asyncio.to_thread(external_changes.refresh)
+            key = f'{request.url.path}?{request.url.query}'
+            versions = current_versions(tables)
+            entry = response_cache.get(key, versions)
+            if entry is None:
+                validators = []
+                async with async_engine.connect() as connection:
+                    for table_name in validator_tables(models):
+                        last_change = (await connection.execute(validator_statement(table_name))).first()
+                        validators.append((table_name, *(last_change or (None, None))))
+                entry = CachedResponse(tables, versions, compute_etag(validators, key), last_modified_time(validators))
+                response_cache.put(key, entry)
+            etag, last_modified = entry.etag, entry.last_modified
+
+            if_none_match = parse_etags(request.headers.get('if-none-match'))
+            if_modified_since = parse_date(request.headers.get('if-modified-since'))
+            matched_etag = None
+            if request.headers.get('if-none-match'):
+                matched_etag = next((tag for tag in representation_etags(etag) if if_none_match.contains(tag)), None)
+                not_modified = matched_etag is not None
+            else:
+                not_modified = bool(
+                    last_modified and if_modified_since
+                    and last_modified.replace(microsecond=0) <= if_modified_since.replace(tzinfo=None)
+                )
+
+            encoding = negotiate_encoding(request.headers.get('accept-encoding', ''))
+            if not_modified:
+                response = Response(status_code=304)
+                response_etag = matched_etag or etag
+            else:
+                cached = compressed_bodies.get(etag, encoding) if encoding else None
+                if cached is not None:
+                    body, media_type = cached
+                    response = Response(body, media_type=media_type, headers={'Content-Encoding': encoding})
+                else:
+                    if entry.body is not None:
+                        response = Response(entry.body, media_type=entry.mimetype)
+                    else:
+                        response = await handler(request)
+                        if response.status_code != 200:
+                            return response
+                        response_cache.put(key, entry.with_body(response.body, response.media_type))
+                    if encoding and len(response.body) >= COMPRESSION_MIN_SIZE:
+                        body = compress(response.body, encoding)
+                        compressed_bodies.put(etag, encoding, body, response.media_type)
+                        response = Response(body, media_type=response.media_type, headers={'Content-Encoding': encoding})
+                response_etag = representation_etag(etag, response.headers.get('content-encoding'))
+                response.headers.add_vary_header('Accept-Encoding')
+
+            response.headers['ETag'] = quote_etag(response_etag)
+            if last_modified:
+                response.headers['Last-Modified'] = http_date(last_modified)
+            return response
+        return wrapper
+    return decorator
+
+
+# Contact API endpoints
+
+@conditional_get(Contact)
+async def get_contacts(request):
+    """Get a page of contacts ordered by name (see src.api.get_contacts)."""
+    params = request.query_params
+    try:
+        limit = parse_limit(params.get('limit'))
+        include_total = parse_bool(params.get('include_total'))
+        criteria = contact_criteria(params)
+        serializer = get_serializer('contact').select_fields(params.get('fields'), required=('id', 'name'))
+        statement = select(*serializer.columns).where(*criteria)
+        page = keyset(statement, [Contact.name, Contact.id], params.get('cursor'), limit)
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            total = await db.scalar(select(func.count()).select_from(statement.subquery())) if include_total else None
+            rows = (await db.execute(page)).all()
+
+        contacts, next_cursor = page_rows(rows, [Contact.name, Contact.id], limit)
+        response = {'data': serializer.to_dicts(contacts), 'next_cursor': next_cursor}
+        if include_total:
+            response['total'] = total
+        return json_response(response)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def create_contact(request):
+    """Create a new contact."""
+    try:
+        data = await request.json()
+        async with AsyncSessionLocal() as db:
+            contact = Contact(
+                name=data['name'],
+                email=data.get('email') or None,
+                codementor_username=data.get('codementor_username') or None,
+                platform_preference=data.get('platform_preference', 'email'),
+                notes=data.get('notes'),
+                is_active=data.get('is_active', True)
+            )
+            db.add(contact)
+            await db.commit()
+            return json_response({'id': contact.id, 'message': 'Contact created successfully'}, 201)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def parse_bulk_rows(request):
+    """Parse a bulk request body given as a JSON array or as NDJSON."""
+    body = await request.body()
+    media_type = request.headers.get('content-type', '').split(';')[0].strip()
+    if media_type in ('application/x-ndjson', 'application/jsonl'):
+        rows = []
+        for line in body.decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(line)
+        return rows
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        data = data.get('contacts')
+    if not isinstance(data, list):
+        raise ValueError('Expected a JSON array of rows or NDJSON')
+    return data
+
+
+async def bulk_upsert_contacts(request):
+    """Create or update many contacts in one request."""
+    try:
+        rows = await parse_bulk_rows(request)
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    if len(rows) > MAX_BULK_ROWS:
+        return error_response(f'At most {MAX_BULK_ROWS} rows per request', 413)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            results = await db.run_sync(upsert_contacts, rows)
+            await db.commit()
+
+        counts = {'created': 0, 'updated': 0, 'error': 0}
+        for result in results:
+            counts[result['status']] += 1
+
+        return json_response({
+            'created': counts['created'],
+            'updated': counts['updated'],
+            'failed': counts['error'],
+            'results': results
+        })
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def update_contact(request):
+    """Update a contact."""
+    try:
+        data = await request.json()
+        async with AsyncSessionLocal() as db:
+            contact = await db.get(Contact, request.path_params['contact_id'])
+            if not contact:
+                return error_response('Contact not found', 404)
+
+            contact.name = data['name']
+            contact.email = data.get('email') or None
+            contact.codementor_username = data.get('codementor_username') or None
+            contact.platform_preference = data.get('platform_preference', 'email')
+            contact.notes = data.get('notes')
+            contact.is_active = data.get('is_active', True)
+            contact.updated_at = datetime.now(timezone.utc)
+            await db.commit()
+
+        return json_response({'message': 'Contact updated successfully'})
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def delete_record(model, record_id, name):
+    """Delete one row by primary key and answer like the Flask routes."""
+    try:
+        async with AsyncSessionLocal() as db:
+            record = await db.get(model, record_id)
+            if not record:
+                return error_response(f'{name} not found', 404)
+            await db.delete(record)
+            await db.commit()
+        return json_response({'message': f'{name} deleted successfully'})
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def delete_contact(request):
+    """Delete a contact."""
+    return await delete_record(Contact, request.path_params['contact_id'], 'Contact')
+
+
+# Template API endpoints
+
+@conditional_get(MessageTemplate)
+async def get_templates(request):
+    """Get all message templates."""
+    try:
+        serializer = get_serializer('template').select_fields(request.query_params.get('fields'))
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            templates = (await db.execute(select(*serializer.columns).order_by(MessageTemplate.name))).all()
+        return json_response(serializer.to_dicts(templates))
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def create_template(request):
+    """Create a new message template."""
+    try:
+        data = await request.json()
+        async with AsyncSessionLocal() as db:
+            template = MessageTemplate(
+                name=data['name'],
+                subject=data.get('subject', ''),
+                body=data['body'],
+                is_default=data.get('is_default', False),
+                is_active=data.get('is_active', True)
+            )
+            db.add(template)
+            await db.commit()
+            return json_response({'id': template.id, 'message': 'Template created successfully'}, 201)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def update_template(request):
+    """Update a message template."""
+    try:
+        data = await request.json()
+        async with AsyncSessionLocal() as db:
+            template = await db.get(MessageTemplate, request.path_params['template_id'])
+            if not template:
+                return error_response('Template not found', 404)
+
+            template.name = data['name']
+            template.subject = data.get('subject', '')
+            template.body = data['body']
+            template.is_default = data.get('is_default', False)
+            template.is_active = data.get('is_active', True)
+            template.updated_at = datetime.now(timezone.utc)
+            await db.commit()
+
+        return json_response({'message': 'Template updated successfully'})
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def delete_template(request):
+    """Delete a message template."""
+    return await delete_record(MessageTemplate, request.path_params['template_id'], 'Template')
+
+
+async def preview_template(request):
+    """Preview a template with contact data."""
+    try:
+        data = await request.json()
+        contact_id = data.get('contact_id')
+        async with AsyncSessionLocal() as db:
+            template = await db.scalar(
+                select(MessageTemplate).options(undefer(MessageTemplate.body))
+                .where(MessageTemplate.id == request.path_params['template_id'])
+            )
+            if not template:
+                return error_response('Template not found', 404)
+
+            contacts = select(Contact).options(undefer(Contact.notes))
+            if contact_id:
+                contact = await db.scalar(contacts.where(Contact.id == contact_id))
+                if not contact:
+                    return error_response('Contact not found', 404)
+            else:
+                # Use first contact as default
+                contact = await db.scalar(contacts.limit(1))
+                if not contact:
+                    return error_response('No contacts available for preview', 400)
+
+        return json_response(template.render_template(contact))
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def preview_template_batch(request):
+    """Preview a template for many contacts (see src.api.preview_template_batch)."""
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        try:
+            contact_ids, criteria = parse_preview_targets(data)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        if contact_ids is not None and len(contact_ids) > MAX_PREVIEW_BATCH:
+            return error_response(f'At most {MAX_PREVIEW_BATCH} contacts per preview batch', 413)
+
+        async with AsyncSessionLocal() as db:
+            template = await db.scalar(
+                select(MessageTemplate).options(undefer(MessageTemplate.body))
+                .where(MessageTemplate.id == request.path_params['template_id'])
+            )
+            if not template:
+                return error_response('Template not found', 404)
+
+            contacts = (await db.scalars(
+                select(Contact).options(undefer(Contact.notes))
+                .where(*preview_contact_criteria(contact_ids, criteria))
+                .order_by(Contact.name, Contact.id).limit(MAX_PREVIEW_BATCH)
+            )).all()
+    except Exception as e:
+        return error_response(str(e), 500)
+
+    return StreamingResponse(
+        render_previews(template.compile(), contacts, contact_ids), media_type='application/x-ndjson'
+    )
+
+
+# Schedule API endpoints
+
+@conditional_get(ScheduledFollowup)
+async def get_schedule(request):
+    """Get a page of scheduled follow-ups (see src.api.get_schedule)."""
+    params = request.query_params
+    try:
+        limit = parse_limit(params.get('limit'))
+        include_total = parse_bool(params.get('include_total'))
+        criteria = schedule_criteria(params)
+        order = params.get('order', 'asc')
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        serializer = get_serializer('followup').select_fields(params.get('fields'), required=('id', 'scheduled_date'))
+        order_columns = [ScheduledFollowup.scheduled_date, ScheduledFollowup.id]
+        statement = select(*serializer.columns).where(*criteria)
+        page = keyset(statement, order_columns, params.get('cursor'), limit, descending=order == 'desc')
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            total = await db.scalar(select(func.count()).select_from(statement.subquery())) if include_total else None
+            rows = (await db.execute(page)).all()
+
+        followups, next_cursor = page_rows(rows, order_columns, limit)
+        response = {'data': serializer.to_dicts(followups), 'next_cursor': next_cursor}
+        if include_total:
+            response['total'] = total
+        return json_response(response)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def run_followup_bulk_action(request, action):
+    """Run a set-based follow-up update for the request's filter."""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or not isinstance(data.get('filter'), dict):
+        return error_response('filter object is required', 400)
+
+    try:
+        criteria = schedule_criteria(data['filter'])
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    async with AsyncSessionLocal() as db:
+        try:
+            affected = await db.run_sync(lambda session: action(session, criteria, data))
+            await db.commit()
+            return json_response({'affected': affected})
+        except ValueError as e:
+            await db.rollback()
+            return error_response(str(e), 400)
+        except Exception as e:
+            await db.rollback()
+            return error_response(str(e), 500)
+
+
+async def bulk_cancel_followups(request):
+    """Cancel every pending follow-up matching the filter."""
+    return await run_followup_bulk_action(request, lambda db, criteria, data: cancel_followups(db, criteria))
+
+
+async def bulk_retry_followups(request):
+    """Retry every failed follow-up matching the filter."""
+    def action(db, criteria, data):
+        return retry_followups(
+            db,
+            criteria,
+            max_retries=parse_int(data.get('max_retries'), 'max_retries'),
+            scheduled_date=parse_datetime(data.get('scheduled_date'))
+        )
+    return await run_followup_bulk_action(request, action)
+
+
+async def bulk_reschedule_followups(request):
+    """Move every pending follow-up matching the filter to scheduled_date."""
+    def action(db, criteria, data):
+        scheduled_date = parse_datetime(data.get('scheduled_date'))
+        if not scheduled_date:
+            raise ValueError('scheduled_date is required')
+        return reschedule_followups(db, criteria, scheduled_date)
+    return await run_followup_bulk_action(request, action)
+
+
+async def bulk_reassign_followups(request):
+    """Switch the template and/or platform of matching pending follow-ups."""
+    def action(db, criteria, data):
+        return reassign_followups(
+            db,
+            criteria,
+            template_id=parse_int(data.get('template_id'), 'template_id'),
+            platform=data.get('platform') or None
+        )
+    return await run_followup_bulk_action(request, action)
+
+
+# Export API endpoints
+
+def export_response(columns, export_format, criteria, order_by, name):
+    """Stream an export from an async server-side cursor."""
+    header, encode_rows = chunk_encoder(columns, export_format)
+
+    async def generate():
+        if header:
+            yield header
+        async with async_engine.connect() as connection:
+            result = await connection.stream(
+                export_statement(columns, criteria, order_by).execution_options(yield_per=EXPORT_CHUNK_ROWS)
+            )
+            async for rows in result.partitions(EXPORT_CHUNK_ROWS):
+                yield encode_rows(rows)
+
+    extension = 'csv' if export_format == 'csv' else 'ndjson'
+    return StreamingResponse(
+        generate(),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename={name}.{extension}'}
+    )
+
+
+async def export_contacts_endpoint(request):
+    """Stream all contacts as NDJSON or CSV."""
+    try:
+        return export_response(
+            CONTACT_EXPORT_COLUMNS, request.query_params.get('format', DEFAULT_EXPORT_FORMAT),
+            contact_criteria(request.query_params), [Contact.id], 'contacts'
+        )
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+
+async def export_schedule_endpoint(request):
+    """Stream follow-up history as NDJSON or CSV."""
+    try:
+        return export_response(
+            SCHEDULE_EXPORT_COLUMNS, request.query_params.get('format', DEFAULT_EXPORT_FORMAT),
+            schedule_criteria(request.query_params), [ScheduledFollowup.id], 'schedule'
+        )
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+
+# Sequence API endpoints
+
+@conditional_get(FollowupSequence, FollowupSequenceStep, ContactSequenceAssignment)
+async def get_sequences(request):
+    """Get all follow-up sequences."""
+    try:
+        serializer = get_serializer('sequence').select_fields(request.query_params.get('fields'))
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            sequences = (await db.execute(
+                serializer.with_joins(select(*serializer.columns)).order_by(FollowupSequence.name)
+            )).all()
+        return json_response(serializer.to_dicts(sequences))
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def create_sequence(request):
+    """Create a new follow-up sequence."""
+    try:
+        data = await request.json()
+
+        if not data.get('name'):
+            return error_response('Name is required', 400)
+        if not data.get('platform'):
+            return error_response('Platform is required', 400)
+
+        async with AsyncSessionLocal() as db:
+            sequence = FollowupSequence(
+                name=data['name'],
+                description=data.get('description', ''),
+                platform=data['platform'],
+                is_active=data.get('is_active', True)
+            )
+            db.add(sequence)
+            await db.commit()
+            await db.refresh(sequence)
+
+        return json_response({
+            'id': sequence.id,
+            'name': sequence.name,
+            'description': sequence.description,
+            'platform': sequence.platform,
+            'is_active': sequence.is_active,
+            'step_count': 0,
+            'total_duration_days': 0,
+            'active_assignments': 0,
+            'completed_assignments': 0,
+            'created_at': sequence.created_at.isoformat() if sequence.created_at else None,
+            'updated_at': sequence.updated_at.isoformat() if sequence.updated_at else None
+        }, 201)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def update_sequence(request):
+    """Update a follow-up sequence."""
+    try:
+        data = await request.json()
+        async with AsyncSessionLocal() as db:
+            sequence = await db.get(FollowupSequence, request.path_params['sequence_id'])
+            if not sequence:
+                return error_response('Sequence not found', 404)
+
+            for field in ('name', 'description', 'platform', 'is_active'):
+                if field in data:
+                    setattr(sequence, field, data[field])
+            sequence.updated_at = datetime.now(timezone.utc)
+            await db.commit()
+
+        return json_response({'message': 'Sequence updated successfully'})
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def delete_sequence(request):
+    """Delete a follow-up sequence."""
+    return await delete_record(FollowupSequence, request.path_params['sequence_id'], 'Sequence')
+
+
+@conditional_get(FollowupSequenceStep)
+async def get_sequence_steps(request):
+    """Get all steps for a sequence."""
+    try:
+        serializer = get_serializer('step').select_fields(request.query_params.get('fields'))
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            steps = (await db.execute(
+                select(*serializer.columns)
+                .where(FollowupSequenceStep.sequence_id == request.path_params['sequence_id'])
+                .order_by(FollowupSequenceStep.step_number)
+            )).all()
+        return json_response(serializer.to_dicts(steps))
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def create_sequence_step(request):
+    """Create a new step in a sequence."""
+    try:
+        data = await request.json()
+
+        if not data.get('step_number'):
+            return error_response('Step number is required', 400)
+        if not data.get('delay_days'):
+            return error_response('Delay days is required', 400)
+        if not data.get('template_id'):
+            return error_response('Template ID is required', 400)
+
+        sequence_id = request.path_params['sequence_id']
+        async with AsyncSessionLocal() as db:
+            if not await db.get(FollowupSequence, sequence_id):
+                return error_response('Sequence not found', 404)
+
+            step = FollowupSequenceStep(
+                sequence_id=sequence_id,
+                step_number=data['step_number'],
+                delay_days=data['delay_days'],
+                template_id=data['template_id'],
+                is_active=data.get('is_active', True)
+            )
+            db.add(step)
+            await db.commit()
+            await db.refresh(step)
+
+        return json_response({
+            'id': step.id,
+            'sequence_id': step.sequence_id,
+            'step_number': step.step_number,
+            'delay_days': step.delay_days,
+            'template_id': step.template_id,
+            'is_active': step.is_active,
+            'created_at': step.created_at.isoformat() if step.created_at else None,
+            'updated_at': step.updated_at.isoformat() if step.updated_at else None
+        }, 201)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+# Delta sync API endpoint
+
+async def sync(request):
+    """Get the rows created, updated or deleted since a change token (see src.api.sync)."""
+    try:
+        since = parse_int(request.query_params.get('since'), 'since')
+        limit = parse_limit(request.query_params.get('limit'), default=1000, maximum=5000)
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            latest, oldest = (await db.execute(select(func.max(SyncChange.id), func.min(SyncChange.id)))).one()
+            latest = latest or 0
+
+            if since is None or since > latest or (oldest is not None and since < oldest - 1):
+                return json_response({'token': str(latest), 'reset': True, 'has_more': False})
+
+            changes = (await db.scalars(
+                select(SyncChange).where(SyncChange.id > since).order_by(SyncChange.id).limit(limit + 1)
+            )).all()
+            has_more = len(changes) > limit
+            changes = changes[:limit]
+            token = changes[-1].id if changes else since
+
+            # The last operation recorded for a row wins
+            operations = {}
+            for change in changes:
+                operations[(change.table_name, change.record_id)] = change.operation
+
+            result = {'token': str(token), 'reset': False, 'has_more': has_more}
+            for table_name, (key, serializer_name) in SYNC_RESOURCES.items():
+                serializer = get_serializer(serializer_name)
+                upserted_ids = [record_id for (table, record_id), operation in operations.items()
+                                if table == table_name and operation == 'upsert']
+                deleted_ids = [record_id for (table, record_id), operation in operations.items()
+                               if table == table_name and operation == 'delete']
+
+                rows = (await db.execute(
+                    serializer.with_joins(select(*serializer.columns)).where(serializer.model.id.in_(upserted_ids))
+                )).all() if upserted_ids else []
+                found_ids = {row.id for row in rows}
+
+                result[key] = {
+                    'upserted': serializer.to_dicts(rows),
+                    # Rows logged as written but gone since are deletions too
+                    'deleted': sorted(deleted_ids + [record_id for record_id in upserted_ids if record_id not in found_ids])
+                }
+
+        return json_response(result)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+# Dashboard API endpoint
+
+async def stats(request):
+    """Get dashboard statistics (see src.api.stats)."""
+    try:
+        return json_response(await asyncio.to_thread(get_stats))
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+# Change events API endpoint
+
+async def events(request):
+    """Stream change events as server-sent events (see src.api.events)."""
+    try:
+        last_event_id = parse_last_event_id(
+            request.headers.get('last-event-id') or request.query_params.get('last_event_id')
+        )
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    try:
+        subscription = await asyncio.to_thread(broker.subscribe, last_event_id, asyncio.get_running_loop())
+    except Exception as e:
+        return error_response(str(e), 500)
+
+    return StreamingResponse(
+        async_event_stream(subscription),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+# Settings API endpoints
+
+async def get_settings(request):
+    """Get all application settings."""
+    try:
+        return json_response(await asyncio.to_thread(settings_service.all))
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def save_platform_settings(platform, values, label):
+    """Create or replace the stored settings record for a platform."""
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(settings_service.save, platform, values)
+        await db.commit()
+    return json_response({'message': f'{label} settings saved successfully'})
+
+
+async def save_gmail_settings(request):
+    """Save Gmail settings."""
+    try:
+        data = await request.json()
+        if not data.get('email'):
+            return error_response('Gmail email is required', 400)
+        return await save_platform_settings(
+            'gmail', {'email': data['email'], 'app_password': data.get('app_password', '')}, 'Gmail'
+        )
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def save_codementor_settings(request):
+    """Save Codementor settings."""
+    try:
+        data = await request.json()
+        if not data.get('access_token'):
+            return error_response('Access token is required', 400)
+        return await save_platform_settings(
+            'codementor',
+            {'access_token': data['access_token'], 'refresh_token': data.get('refresh_token', '')},
+            'Codementor'
+        )
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def save_automation_settings(request):
+    """Save automation settings."""
+    try:
+        data = await request.json()
+        return await save_platform_settings('automation', {
+            'enabled': data.get('enabled', False),
+            'check_interval': data.get('check_interval', 15),
+            'max_retries': data.get('max_retries', 3),
+            'timezone': data.get('timezone', 'UTC')
+        }, 'Automation')
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def test_gmail_connection(request):
+    """Test Gmail connection."""
+    # TODO: Implement actual Gmail connection test
+    return json_response({'message': 'Gmail connection test successful'})
+
+
+async def test_codementor_connection(request):
+    """Test Codementor connection."""
+    # TODO: Implement actual Codementor connection test
+    return json_response({'message': 'Codementor connection test successful'})
+
+
+# Batch API endpoint
+
+async def dispatch_sub_request(sub_request):
+    """Run one batch sub-request through the router, bypassing compression."""
+    method = str(sub_request.get('method', 'GET')).upper()
+    path = sub_request.get('path')
+    if not isinstance(path, str) or not path.startswith('/api/'):
+        return {'status': 400, 'body': {'error': 'path must start with /api/'}}
+    path, _, query = path.partition('?')
+    if path.rstrip('/') == '/api/batch':
+        return {'status': 400, 'body': {'error': 'Batches cannot be nested'}}
+
+    # Sub-responses are embedded in the batch body, so they must not be compressed
+    headers = [
+        (name.lower().encode('latin-1'), str(value).encode('latin-1'))
+        for name, value in (sub_request.get('headers') or {}).items()
+        if name.lower() != 'accept-encoding'
+    ]
+    body = b''
+    if sub_request.get('body') is not None:
+        body = json.dumps(sub_request['body']).encode('utf-8')
+        headers.append((b'content-type', b'application/json'))
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+        'scheme': 'http', 'path': path, 'raw_path': path.encode('utf-8'), 'root_path': '',
+        'query_string': query.encode('utf-8'), 'headers': headers, 'client': None, 'server': None, 'app': app,
+    }
+    # Buffering a stream would never finish for event streams
+    for route in app.router.routes:
+        if route.matches(scope)[0] == Match.FULL:
+            if route.endpoint in STREAMING_ENDPOINTS:
+                return {'status': 400, 'body': {'error': 'Streaming endpoints cannot be batched'}}
+            break
+
+    received = False
+    status = 500
+    response_headers = Headers()
+    chunks = []
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {'type': 'http.disconnect'}
+        received = True
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        nonlocal status, response_headers
+        if message['type'] == 'http.response.start':
+            status = message['status']
+            response_headers = Headers(raw=message['headers'])
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+
+    await app.router(scope, receive, send)
+
+    text = b''.join(chunks).decode('utf-8')
+    is_json = response_headers.get('content-type', '').startswith('application/json')
+    result = {'status': status, 'body': json.loads(text) if is_json and text else text or None}
+    headers = {name: response_headers[name] for name in ('ETag', 'Last-Modified') if name in response_headers}
+    if headers:
+        result['headers'] = headers
+    return result
+
+
+async def batch(request):
+    """Run several API requests in one round trip.
+
+    Unlike the Flask app, each sub-request uses its own session.
+    Streaming endpoints get a 400 sub-response.
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        data = data.get('requests')
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        return error_response('Expected a JSON array of sub-requests', 400)
+    if len(data) > MAX_BATCH_REQUESTS:
+        return error_response(f'At most {MAX_BATCH_REQUESTS} sub-requests per batch', 413)
+
+    return json_response([await dispatch_sub_request(sub_request) for sub_request in data])
+
+
+async def metrics(request):
+    """Get connection pool and response cache counters (see src.api.metrics)."""
+    return json_response({'database': pool_usage(async_engine), 'response_cache': response_cache.stats()})
+
+
+async def health_check(request):
+    """Health check endpoint."""
+    return json_response({'status': 'healthy', 'message': 'Followupper API is running'})
+
+
+# Handlers whose responses stream and so cannot be embedded in a batch response
+STREAMING_ENDPOINTS = {events, export_contacts_endpoint, export_schedule_endpoint, preview_template_batch}
+
+routes = [
+    Route('/api/contacts', get_contacts, methods=['GET']),
+    Route('/api/contacts', create_contact, methods=['POST']),
+    Route('/api/contacts/bulk', bulk_upsert_contacts, methods=['POST']),
+    Route('/api/contacts/{contact_id:int}', update_contact, methods=['PUT']),
+    Route('/api/contacts/{contact_id:int}', delete_contact, methods=['DELETE']),
+    Route('/api/templates', get_templates, methods=['GET']),
+    Route('/api/templates', create_template, methods=['POST']),
+    Route('/api/templates/{template_id:int}', update_template, methods=['PUT']),
+    Route('/api/templates/{template_id:int}', delete_template, methods=['DELETE']),
+    Route('/api/templates/{template_id:int}/preview', preview_template, methods=['POST']),
+    Route('/api/templates/{template_id:int}/preview/batch', preview_template_batch, methods=['POST']),
+    Route('/api/schedule', get_schedule, methods=['GET']),
+    Route('/api/schedule/cancel', bulk_cancel_followups, methods=['POST']),
+    Route('/api/schedule/retry', bulk_retry_followups, methods=['POST']),
+    Route('/api/schedule/reschedule', bulk_reschedule_followups, methods=['POST']),
+    Route('/api/schedule/reassign', bulk_reassign_followups, methods=['POST']),
+    Route('/api/export/contacts', export_contacts_endpoint, methods=['GET']),
+    Route('/api/export/schedule', export_schedule_endpoint, methods=['GET']),
+    Route('/api/sequences', get_sequences, methods=['GET']),
+    Route('/api/sequences', create_sequence, methods=['POST']),
+    Route('/api/sequences/{sequence_id:int}', update_sequence, methods=['PUT']),
+    Route('/api/sequences/{sequence_id:int}', delete_sequence, methods=['DELETE']),
+    Route('/api/sequences/{sequence_id:int}/steps', get_sequence_steps, methods=['GET']),
+    Route('/api/sequences/{sequence_id:int}/steps', create_sequence_step, methods=['POST']),
+    Route('/api/sync', sync, methods=['GET']),
+    Route('/api/events', events, methods=['GET']),
+    Route('/api/stats', stats, methods=['GET']),
+    Route('/api/settings', get_settings, methods=['GET']),
+    Route('/api/settings/gmail', save_gmail_settings, methods=['POST']),
+    Route('/api/settings/codementor', save_codementor_settings, methods=['POST']),
+    Route('/api/settings/automation', save_automation_settings, methods=['POST']),
+    Route('/api/settings/test/gmail', test_gmail_connection, methods=['POST']),
+    Route('/api/settings/test/codementor', test_codementor_connection, methods=['POST']),
+    Route('/api/batch', batch, methods=['POST']),
+    Route('/api/metrics', metrics, methods=['GET']),
+    Route('/api/health', health_check, methods=['GET']),
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'],
+                   expose_headers=['ETag', 'Last-Modified']),
+        Middleware(CompressionMiddleware),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,326 @@
+"""Bulk write operations."""
+
+import csv
+import io
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, update, select, or_, text
+
+from .models.database import naive_utc
+from .models.contact import Contact
+from .models.scheduled_followup import ScheduledFollowup
+from .models.sync_change import record_changes, record_changes_from_select
+from .models.table_versions import mark_tables_written
+
+# Rows written per INSERT/UPDATE batch and per SAVEPOINT; the batches of
+# one bulk call share the caller's (group-committed) transaction, and a
+# failed batch rolls back only itself, reporting its rows as errors
+BULK_BATCH_SIZE = 1000
+
+# Inserts of at least this many rows are loaded with COPY on PostgreSQL
+COPY_MIN_ROWS = 100
+
+# Largest number of rows accepted by a single bulk request
+MAX_BULK_ROWS = 100000
+
+CONTACT_FIELDS = ('name', 'email', 'codementor_username', 'platform_preference', 'notes', 'is_active')
+
+
+def normalize_contact_row(row):
+    """Validate a bulk contact row and return the fields to write."""
+    if not isinstance(row, dict):
+        raise ValueError('Row must be an object')
+
+    values = {field: row[field] for field in CONTACT_FIELDS if field in row}
+
+    # Convert empty strings to None for unique fields
+    for field in ('email', 'codementor_username'):
+        if field in values and not values[field]:
+            values[field] = None
+
+    if 'name' in values and not values['name']:
+        raise ValueError('Name is required')
+
+    return values
+
+
+def _with_defaults(table, rows):
+    """Fill in the Python-side column defaults an INSERT would apply."""
+    missing = [
+        column for column in table.columns
+        if column.default is not None and any(column.key not in row for row in rows)
+    ]
+    if not missing:
+        return rows
+
+    filled = []
+    for row in rows:
+        row = dict(row)
+        for column in missing:
+            if column.key not in row:
+                default = column.default
+                row[column.key] = default.arg(None) if default.is_callable else default.arg
+        filled.append(row)
+    return filled
+
+
+def copy_rows(connection, table, rows):
+    """Stream rows into a PostgreSQL table with COPY ... FROM STDIN.
+
+    Runs on the connection's current transaction with psycopg 3,
+    psycopg2 or asyncpg (under AsyncSession.run_sync). Rows are dicts
+    keyed by column; missing keys load as NULL.
+    """
+    columns = [column.key for column in table.columns if any(column.key in row for row in rows)]
+    if connection.dialect.driver == 'asyncpg':
+        # asyncpg sends binary records, so datetimes must match the naive columns
+        records = [tuple(naive_utc(row.get(column)) for column in columns) for row in rows]
+        connection.connection.run_async(lambda driver_connection: driver_connection.copy_records_to_table(
+            table.name, records=records, columns=columns, schema_name=table.schema
+        ))
+        return
+
+    preparer = connection.dialect.identifier_preparer
+    statement = f"COPY {preparer.format_table(table)} ({', '.join(preparer.quote(column) for column in columns)}) FROM STDIN"
+
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        if hasattr(cursor, 'copy'):
+            # psycopg 3 adapts each value the same way as a query parameter
+            with cursor.copy(statement) as copy:
+                for row in rows:
+                    copy.write_row([row.get(column) for column in columns])
+        else:
+            # psycopg2: CSV with quoted values, where an unquoted empty field is NULL
+            buffer = io.StringIO()
+            csv.writer(buffer, quoting=csv.QUOTE_NOTNULL).writerows(
+                [row.get(column) for column in columns] for row in rows
+            )
+            buffer.seek(0)
+            cursor.copy_expert(f'{statement} WITH (FORMAT csv)', buffer)
+    finally:
+        cursor.close()
+
+
+def insert_rows(db, table, rows, use_copy=None):
+    """Insert rows into a table and return their new ids in row order.
+
+    On PostgreSQL, batches of at least COPY_MIN_ROWS rows reserve their
+    ids from the table's sequence and are loaded with COPY; otherwise one
+    multi-row INSERT ... RETURNING is used. use_copy forces either path.
+    Does not commit.
+    """
+    if not rows:
+        return []
+
+    connection = db.connection()
+    if use_copy is None:
+        use_copy = connection.dialect.name == 'postgresql' and len(rows) >= COPY_MIN_ROWS
+    if not use_copy:
+        return db.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+
+    ids = connection.execute(
+        text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :count)"),
+        {'table': table.name, 'count': len(rows)}
+    ).scalars().all()
+    copy_rows(connection, table, [
+        {**row, 'id': row_id} for row, row_id in zip(_with_defaults(table, rows), ids)
+    ])
+    # COPY bypasses the session, so publish the write to cached readers explicitly
+    mark_tables_written(db, table.name)
+    return ids
+
+
+def insert_followups(db, rows):
+    """Insert pending follow-ups and return their ids in row order.
+
+    rows are dicts with contact_id, template_id, scheduled_date and
+    platform. Large fan-outs are loaded with COPY on PostgreSQL (see
+    insert_rows), and the new rows are added to the sync change log.
+    Does not commit.
+    """
+    now = datetime.now(timezone.utc)
+    followup_ids = insert_rows(db, ScheduledFollowup.__table__, [
+        {'status': 'pending', 'retry_count': 0, 'created_at': now, 'updated_at': now, **row}
+        for row in rows
+    ])
+    record_changes(db.connection(), [('scheduled_followups', followup_id, 'upsert') for followup_id in followup_ids])
+    return followup_ids
+
+
+def upsert_contacts(db, rows):
+    """Insert or update contacts matched on email or codementor_username.
+
+    Rows are processed in batches of BULK_BATCH_SIZE; each batch is one
+    lookup query, one multi-row INSERT (COPY on PostgreSQL) and one
+    executemany UPDATE inside a SAVEPOINT, so a failing batch is rolled
+    back alone. The caller commits. Returns one result per input row, in
+    input order, with a status of 'created', 'updated' or 'error'.
+    """
+    results = [None] * len(rows)
+
+    for start in range(0, len(rows), BULK_BATCH_SIZE):
+        batch = list(enumerate(rows[start:start + BULK_BATCH_SIZE], start))
+        savepoint = db.begin_nested()
+        try:
+            _upsert_contact_batch(db, batch, results)
+            savepoint.commit()
+        except Exception as e:
+            savepoint.rollback()
+            for index, _ in batch:
+                results[index] = {'index': index, 'status': 'error', 'error': str(e)}
+
+    return results
+
+
+def _upsert_contact_batch(db, batch, results):
+    """Upsert one batch of (index, row) pairs, filling in results."""
+    prepared = []
+    for index, row in batch:
+        try:
+            prepared.append((index, normalize_contact_row(row)))
+        except ValueError as e:
+            results[index] = {'index': index, 'status': 'error', 'error': str(e)}
+
+    emails = {values['email'] for _, values in prepared if values.get('email')}
+    usernames = {values['codementor_username'] for _, values in prepared if values.get('codementor_username')}
+
+    by_email = {}
+    by_username = {}
+    if emails or usernames:
+        existing = db.execute(
+            select(Contact.id, Contact.email, Contact.codementor_username).where(or_(
+                Contact.email.in_(emails),
+                Contact.codementor_username.in_(usernames)
+            ))
+        ).all()
+        for contact_id, email, username in existing:
+            if email:
+                by_email[email] = contact_id
+            if username:
+                by_username[username] = contact_id
+
+    now = datetime.now(timezone.utc)
+    written_ids = []
+    inserts = []
+    updates = []
+    seen_keys = set()
+
+    for index, values in prepared:
+        keys = {('email', values.get('email')), ('codementor_username', values.get('codementor_username'))}
+        keys = {key for key in keys if key[1]}
+        if keys & seen_keys:
+            results[index] = {'index': index, 'status': 'error', 'error': 'Duplicate email or codementor_username in request'}
+            continue
+        seen_keys |= keys
+
+        matches = {by_email.get(values.get('email')), by_username.get(values.get('codementor_username'))} - {None}
+        if len(matches) > 1:
+            results[index] = {'index': index, 'status': 'error', 'error': 'email and codementor_username match different contacts'}
+            continue
+
+        if matches:
+            contact_id = matches.pop()
+            updates.append((index, {**values, 'id': contact_id, 'updated_at': now}))
+        elif not values.get('name'):
+            results[index] = {'index': index, 'status': 'error', 'error': 'Name is required'}
+        else:
+            inserts.append((index, {
+                'email': None,
+                'codementor_username': None,
+                'platform_preference': 'email',
+                'notes': None,
+                'is_active': True,
+                **values,
+                'created_at': now,
+                'updated_at': now,
+            }))
+
+    if inserts:
+        created = insert_rows(db, Contact.__table__, [values for _, values in inserts])
+        for (index, _), contact_id in zip(inserts, created):
+            results[index] = {'index': index, 'status': 'created', 'id': contact_id}
+        written_ids.extend(created)
+
+    # executemany needs every parameter set to name the same columns
+    for columns in {tuple(sorted(values)) for _, values in updates}:
+        group = [(index, values) for index, values in updates if tuple(sorted(values)) == columns]
+        db.execute(update(Contact), [values for _, values in group])
+        for index, values in group:
+            results[index] = {'index': index, 'status': 'updated', 'id': values['id']}
+            written_ids.append(values['id'])
+
+    record_changes(db.connection(), [('contacts', contact_id, 'upsert') for contact_id in written_ids])
+
+
+def update_followups(db, criteria, values):
+    """Apply one UPDATE to every follow-up matching the criteria.
+
+    The matching rows are added to the sync change log with a single
+    INSERT ... SELECT before the update. Does not commit. Returns the
+    number of updated rows.
+    """
+    criteria = list(criteria)
+    record_changes_from_select(
+        db.connection(),
+        'scheduled_followups',
+        select(ScheduledFollowup.id).where(*criteria),
+        'upsert'
+    )
+    result = db.execute(
+        update(ScheduledFollowup)
+        .where(*criteria)
+        .values(updated_at=datetime.now(timezone.utc), **values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def cancel_followups(db, criteria):
+    """Cancel the pending follow-ups matching the criteria."""
+    return update_followups(db, [*criteria, ScheduledFollowup.status == 'pending'], {'status': 'cancelled'})
+
+
+def retry_followups(db, criteria, max_retries=None, scheduled_date=None):
+    """Put the failed follow-ups matching the criteria back to pending.
+
+    retry_count counts these requeues, and is the only place it is
+    incremented; a failed send leaves it alone. Follow-ups already
+    retried max_retries times are left alone. When scheduled_date is
+    given the retried follow-ups are moved to it.
+    """
+    criteria = [*criteria, ScheduledFollowup.status == 'failed']
+    if max_retries is not None:
+        criteria.append(ScheduledFollowup.retry_count < max_retries)
+
+    values = {
+        'status': 'pending',
+        'error_message': None,
+        'retry_count': ScheduledFollowup.retry_count + 1,
+    }
+    if scheduled_date is not None:
+        values['scheduled_date'] = scheduled_date
+    return update_followups(db, criteria, values)
+
+
+def reschedule_followups(db, criteria, scheduled_date):
+    """Move the pending follow-ups matching the criteria to a new date."""
+    return update_followups(
+        db,
+        [*criteria, ScheduledFollowup.status == 'pending'],
+        {'scheduled_date': scheduled_date}
+    )
+
+
+def reassign_followups(db, criteria, template_id=None, platform=None):
+    """Switch the template and/or platform of the matching pending follow-ups."""
+    values = {}
+    if template_id is not None:
+        values['template_id'] = template_id
+    if platform is not None:
+        values['platform'] = platform
+    if not values:
+        raise ValueError('template_id or platform is required')
+    return update_followups(db, [*criteria, ScheduledFollowup.status == 'pending'], values)
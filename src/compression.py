@@ -0,0 +1,284 @@
+"""Negotiated response compression (zstd, brotli, gzip).
+
+Buffered responses above COMPRESSION_MIN_SIZE are compressed with the
+best encoding the client accepts; streamed responses (exports) are
+compressed chunk by chunk and flushed after every chunk so rows keep
+arriving while the export runs. Compressed bodies of ETag-validated list
+responses are kept in an LRU cache keyed on (ETag, encoding), bounded by
+COMPRESSION_CACHE_SIZE bodies and COMPRESSION_CACHE_BYTES bytes, so a
+repeat request for unchanged data skips both serialization and
+compression.
+
+brotli and zstandard are optional; without them only gzip is offered.
+"""
+
+import os
+import zlib
+from collections import OrderedDict
+from threading import Lock
+
+from flask import request, make_response
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Smallest body worth compressing, in bytes
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+
+# Number of compressed list bodies kept in memory
+COMPRESSION_CACHE_SIZE = int(os.getenv('COMPRESSION_CACHE_SIZE', '256'))
+
+# Total bytes of compressed list bodies kept in memory
+COMPRESSION_CACHE_BYTES = int(os.getenv('COMPRESSION_CACHE_BYTES', str(16 * 1024 * 1024)))
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/csv'}
+
+
+class _GzipStream:
+    """Incremental gzip compressor."""
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    """Incremental brotli compressor."""
+
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def chunk(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    """Incremental zstd compressor."""
+
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def chunk(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+# Available encodings in server preference order: (compress, stream factory)
+CODERS = OrderedDict()
+if zstandard is not None:
+    CODERS['zstd'] = (lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), _ZstdStream)
+if brotli is not None:
+    CODERS['br'] = (lambda data: brotli.compress(data, quality=BROTLI_QUALITY), _BrotliStream)
+CODERS['gzip'] = (lambda data: zlib.compress(data, GZIP_LEVEL, wbits=31), _GzipStream)
+
+
+class CompressedBodyCache:
+    """Thread-safe LRU cache of compressed bodies keyed on (ETag, encoding).
+
+    Bounded by max_entries bodies and max_bytes of body data.
+    """
+
+    def __init__(self, max_entries=COMPRESSION_CACHE_SIZE, max_bytes=COMPRESSION_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, etag, encoding):
+        """Get (body, mimetype) for a representation, or None."""
+        with self._lock:
+            entry = self._entries.get((etag, encoding))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((etag, encoding))
+            self.hits += 1
+            return entry
+
+    def put(self, etag, encoding, body, mimetype):
+        """Store a compressed body, evicting the least recently used ones past the limits."""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove((etag, encoding))
+            self._entries[(etag, encoding)] = (body, mimetype)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        """Drop every cached body."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+
+
+compressed_bodies = CompressedBodyCache()
+
+
+def negotiate_encoding(accept_encoding=None):
+    """Pick the best accepted encoding, or None.
+
+    accept_encoding is a raw Accept-Encoding header; by default the
+    current Flask request's header is used.
+    """
+    if accept_encoding is None:
+        accepted = request.accept_encodings
+    else:
+        accepted = parse_accept_header(accept_encoding)
+    return accepted.best_match(list(CODERS))
+
+
+def representation_etag(etag, encoding):
+    """Get the ETag of one encoded representation of a resource."""
+    return f'{etag}-{encoding}' if encoding else etag
+
+
+def representation_etags(etag):
+    """Get the ETags of every representation of a resource."""
+    return [etag] + [representation_etag(etag, encoding) for encoding in CODERS]
+
+
+def compress(data, encoding):
+    """Compress a whole body."""
+    return CODERS[encoding][0](data)
+
+
+def compress_stream(chunks, encoding):
+    """Compress an iterable of str/bytes chunks, flushing after each one."""
+    stream = CODERS[encoding][1]()
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        if chunk:
+            yield stream.chunk(chunk)
+    yield stream.finish()
+
+
+async def compress_async_stream(chunks, encoding):
+    """Compress an async iterable of str/bytes chunks, flushing after each one."""
+    stream = CODERS[encoding][1]()
+    async for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        if chunk:
+            yield stream.chunk(chunk)
+    yield stream.finish()
+
+
+def is_compressible_mimetype(mimetype):
+    """Check whether a content type is worth compressing.
+
+    Event streams are excluded: each event is tiny and must reach the
+    client immediately.
+    """
+    return mimetype in COMPRESSIBLE_MIMETYPES or (mimetype.startswith('text/') and mimetype != 'text/event-stream')
+
+
+def _is_compressible(response):
+    """Check whether a response's content type is worth compressing."""
+    return is_compressible_mimetype(response.mimetype)
+
+
+def compress_response(response):
+    """Compress a response for the current request when worthwhile.
+
+    Registered as an after_request hook. Responses that already carry a
+    Content-Encoding (for example cached list bodies) are left alone.
+    """
+    if (
+        response.status_code < 200 or response.status_code in (204, 206, 304)
+        or 'Content-Encoding' in response.headers
+        or response.direct_passthrough
+        or not _is_compressible(response)
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESSION_MIN_SIZE:
+            return response
+        response.set_data(compress(data, encoding))
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(representation_etag(etag, encoding), weak)
+    return response
+
+
+def cached_response(etag):
+    """Build a response from a cached compressed body, or return None."""
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return None
+    entry = compressed_bodies.get(etag, encoding)
+    if entry is None:
+        return None
+
+    body, mimetype = entry
+    response = make_response(body)
+    response.mimetype = mimetype
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def cache_compressed_response(response, etag):
+    """Compress a 200 list response and keep the body for its ETag.
+
+    Bodies below COMPRESSION_MIN_SIZE and clients that accept no
+    supported encoding are returned unchanged for compress_response.
+    """
+    encoding = negotiate_encoding()
+    if encoding is None or response.is_streamed or not _is_compressible(response):
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESSION_MIN_SIZE:
+        return response
+
+    body = compress(data, encoding)
+    compressed_bodies.put(etag, encoding, body, response.mimetype)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
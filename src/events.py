@@ -0,0 +1,285 @@
+"""Server-sent change events for /api/events.
+
+Events are read from the delta sync change log (sync_changes), so their
+ids are the same change tokens /api/sync uses. This has three effects:
+
+- writes made by any worker process or by the scheduler reach every
+  stream;
+- a client that reconnects with Last-Event-ID gets everything it missed;
+- one broker thread per process tails the log for all connected clients,
+  and it is woken right after commits in this process.
+
+Each client has a bounded queue. A client that falls behind by a full
+queue is disconnected rather than buffered without limit, and it resumes
+from its last event id when it reconnects.
+"""
+
+import asyncio
+import json
+import os
+import queue
+import threading
+
+from sqlalchemy import select, func, and_
+
+from .models.database import engine
+from .models.scheduled_followup import ScheduledFollowup
+from .models.sync_change import SyncChange, SYNC_RESOURCES
+from .models.table_versions import on_bump
+
+# Seconds between change log polls when nothing in this process commits
+EVENT_POLL_INTERVAL = float(os.getenv('EVENT_POLL_INTERVAL', '1.0'))
+
+# Events buffered per client before it is disconnected
+EVENT_QUEUE_SIZE = int(os.getenv('EVENT_QUEUE_SIZE', '256'))
+
+# Seconds between keep-alive comments on an idle stream
+EVENT_KEEPALIVE = 15
+
+# Milliseconds a client waits before reconnecting
+EVENT_RETRY = 3000
+
+
+def change_events(connection, after, limit):
+    """Get up to limit change events with ids above after, oldest first."""
+    rows = connection.execute(
+        select(SyncChange.id, SyncChange.table_name, SyncChange.record_id, SyncChange.operation, ScheduledFollowup.status)
+        .outerjoin(ScheduledFollowup, and_(
+            SyncChange.table_name == 'scheduled_followups', ScheduledFollowup.id == SyncChange.record_id
+        ))
+        .where(SyncChange.id > after)
+        .order_by(SyncChange.id)
+        .limit(limit)
+    ).all()
+
+    events = []
+    for change_id, table_name, record_id, operation, status in rows:
+        data = {'resource': SYNC_RESOURCES[table_name][0], 'id': record_id, 'operation': operation}
+        if status is not None and operation == 'upsert':
+            data['status'] = status
+        events.append((change_id, 'change', data))
+    return events
+
+
+def format_event(event):
+    """Encode an (id, type, data) event in the text/event-stream format."""
+    event_id, event_type, data = event
+    lines = [f'event: {event_type}', f'data: {json.dumps(data, separators=(",", ":"))}']
+    if event_id is not None:
+        lines.insert(0, f'id: {event_id}')
+    return '\n'.join(lines) + '\n\n'
+
+
+class Subscription:
+    """One client's bounded event queue.
+
+    Live events offered while the client's missed events are still being
+    read are held back and queued after them.
+    """
+
+    def __init__(self, last_id):
+        self.last_id = last_id
+        self.overflowed = False
+        self._holding = True
+        self._held = []
+        self._queue = queue.Queue(EVENT_QUEUE_SIZE)
+        self._lock = threading.Lock()
+
+    def offer(self, events):
+        """Queue live events."""
+        with self._lock:
+            self._deliver(events)
+
+    def release(self, events, last_id=None):
+        """Queue the replayed events, then any live events held meanwhile.
+
+        last_id moves the client's position forward first, skipping
+        changes it will not be sent.
+        """
+        with self._lock:
+            self._release(events, last_id)
+
+    def get(self, timeout):
+        """Get the next event, or None after timeout seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            return False
+
+    def _deliver(self, events):
+        if self._holding:
+            self._held.extend(events)
+            return
+        for event in events:
+            if self.overflowed or (event[0] is not None and event[0] <= self.last_id):
+                continue
+            if not self._put(event):
+                # The client is too slow; drop it and let it resume on reconnect
+                self.overflowed = True
+                return
+            if event[0] is not None:
+                self.last_id = event[0]
+
+    def _release(self, events, last_id):
+        if last_id is not None:
+            self.last_id = last_id
+        held, self._held, self._holding = self._held, [], False
+        self._deliver(events + held)
+
+
+class AsyncSubscription(Subscription):
+    """Subscription consumed from an asyncio event loop.
+
+    Deliveries are handed to the loop, which keeps them in offer order.
+    """
+
+    def __init__(self, last_id, loop):
+        super().__init__(last_id)
+        self._loop = loop
+        self._queue = asyncio.Queue(EVENT_QUEUE_SIZE)
+
+    def offer(self, events):
+        self._loop.call_soon_threadsafe(self._deliver, events)
+
+    def release(self, events, last_id=None):
+        self._loop.call_soon_threadsafe(self._release, events, last_id)
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+
+class EventBroker:
+    """Tails the change log and fans new events out to subscribers."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._last_id = None
+
+    def notify(self):
+        """Wake the broker to poll the change log now."""
+        self._wake.set()
+
+    def subscribe(self, last_event_id=None, loop=None):
+        """Register a client, replaying changes after last_event_id.
+
+        Without last_event_id the client only receives new changes. When
+        the requested changes are no longer in the log, or there are more
+        than fit in the client's queue, a 'reset' event tells the client
+        to reload through /api/sync.
+        """
+        with engine.connect() as connection:
+            latest, oldest = connection.execute(select(func.max(SyncChange.id), func.min(SyncChange.id))).one()
+            latest = latest or 0
+            start = latest if last_event_id is None or last_event_id > latest else last_event_id
+            subscription = AsyncSubscription(start, loop) if loop else Subscription(start)
+
+            with self._lock:
+                self._subscribers.add(subscription)
+                if self._last_id is None:
+                    self._last_id = latest
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='event-broker', daemon=True)
+                    self._thread.start()
+
+            missed = change_events(connection, start, EVENT_QUEUE_SIZE) if start < latest else []
+        if (oldest is not None and start < oldest - 1) or len(missed) >= EVENT_QUEUE_SIZE:
+            # Too much was missed to replay; only changes after latest follow the reset
+            subscription.release([(None, 'reset', {'token': str(latest)})], latest)
+        else:
+            subscription.release(missed)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a client."""
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        """Get the number of connected clients."""
+        return len(self._subscribers)
+
+    def _run(self):
+        """Poll the change log and publish new events until the process exits."""
+        while True:
+            self._wake.wait(EVENT_POLL_INTERVAL)
+            self._wake.clear()
+            with self._lock:
+                subscribers = list(self._subscribers)
+            if not subscribers:
+                continue
+            try:
+                with engine.connect() as connection:
+                    events = change_events(connection, self._last_id, EVENT_QUEUE_SIZE)
+            except Exception as e:
+                print(f"Error reading change events: {e}")
+                continue
+            if not events:
+                continue
+            self._last_id = events[-1][0]
+            for subscription in subscribers:
+                subscription.offer(events)
+            if len(events) == EVENT_QUEUE_SIZE:
+                # More are waiting; poll again without sleeping
+                self._wake.set()
+
+
+broker = EventBroker()
+
+
+@on_bump
+def _notify_synced_writes(table_names):
+    """Wake the broker after a commit that wrote synced tables."""
+    if any(table_name in SYNC_RESOURCES for table_name in table_names):
+        broker.notify()
+
+
+def parse_last_event_id(value):
+    """Parse a Last-Event-ID header or last_event_id parameter."""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError('Last-Event-ID must be an integer change token')
+
+
+def event_stream(subscription):
+    """Yield a subscription's events as text/event-stream chunks."""
+    try:
+        yield f'retry: {EVENT_RETRY}\n\n'
+        while not subscription.overflowed:
+            event = subscription.get(EVENT_KEEPALIVE)
+            yield ': keep-alive\n\n' if event is None else format_event(event)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def async_event_stream(subscription):
+    """Yield an AsyncSubscription's events as text/event-stream chunks."""
+    try:
+        yield f'retry: {EVENT_RETRY}\n\n'
+        while not subscription.overflowed:
+            event = await subscription.get(EVENT_KEEPALIVE)
+            yield ': keep-alive\n\n' if event is None else format_event(event)
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,147 @@
+"""Streaming export of contacts and follow-up history.
+
+Rows are read with a server-side cursor in fixed-size partitions and
+encoded chunk by chunk, so memory use does not depend on the number of
+exported rows.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import select
+
+from .models.database import engine
+from .models.contact import Contact
+from .models.scheduled_followup import ScheduledFollowup
+
+# Number of rows fetched from the database and encoded per chunk
+EXPORT_CHUNK_ROWS = 1000
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Format used when none is requested, by the export functions and endpoints
+DEFAULT_EXPORT_FORMAT = 'ndjson'
+
+CONTACT_EXPORT_COLUMNS = [
+    Contact.id,
+    Contact.name,
+    Contact.email,
+    Contact.codementor_username,
+    Contact.platform_preference,
+    Contact.last_contact_date,
+    Contact.notes,
+    Contact.is_active,
+    Contact.created_at,
+    Contact.updated_at,
+]
+
+SCHEDULE_EXPORT_COLUMNS = [
+    ScheduledFollowup.id,
+    ScheduledFollowup.contact_id,
+    ScheduledFollowup.template_id,
+    ScheduledFollowup.scheduled_date,
+    ScheduledFollowup.status,
+    ScheduledFollowup.platform,
+    ScheduledFollowup.sent_date,
+    ScheduledFollowup.error_message,
+    ScheduledFollowup.retry_count,
+    ScheduledFollowup.created_at,
+    ScheduledFollowup.updated_at,
+]
+
+
+def export_statement(columns, criteria=(), order_by=None):
+    """Build the SELECT for an export."""
+    statement = select(*columns).where(*criteria)
+    if order_by is not None:
+        statement = statement.order_by(*order_by)
+    return statement
+
+
+def iter_row_chunks(columns, criteria=(), order_by=None):
+    """Yield lists of result rows, EXPORT_CHUNK_ROWS at a time."""
+    with engine.connect() as connection:
+        result = connection.execution_options(yield_per=EXPORT_CHUNK_ROWS).execute(
+            export_statement(columns, criteria, order_by)
+        )
+        for partition in result.partitions():
+            yield partition
+
+
+def _export_value(value):
+    """Convert a column value to its exported representation."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_text(keys, rows):
+    """Encode one chunk of rows as newline-delimited JSON."""
+    lines = [
+        json.dumps({key: _export_value(value) for key, value in zip(keys, row)})
+        for row in rows
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def _csv_text(rows):
+    """Encode rows of plain values as CSV lines."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def chunk_encoder(columns, export_format):
+    """Get (header, encode_rows) for an export format.
+
+    header is written once before the first chunk; encode_rows turns one
+    chunk of rows into text. Raises ValueError for unknown formats.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+    keys = [column.key for column in columns]
+    if export_format == 'csv':
+        return _csv_text([keys]), lambda rows: _csv_text([_export_value(value) for value in row] for row in rows)
+    return '', lambda rows: _ndjson_text(keys, rows)
+
+
+def encode_ndjson(columns, chunks):
+    """Encode row chunks as newline-delimited JSON."""
+    keys = [column.key for column in columns]
+    for rows in chunks:
+        yield _ndjson_text(keys, rows)
+
+
+def encode_csv(columns, chunks):
+    """Encode row chunks as CSV with a header line."""
+    header, encode_rows = chunk_encoder(columns, 'csv')
+    yield header
+    for rows in chunks:
+        yield encode_rows(rows)
+
+
+def stream_export(columns, export_format, criteria=(), order_by=None):
+    """Stream the rows selected by the criteria in the requested format."""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+    chunks = iter_row_chunks(columns, criteria, order_by)
+    if export_format == 'csv':
+        return encode_csv(columns, chunks)
+    return encode_ndjson(columns, chunks)
+
+
+def export_contacts(export_format=DEFAULT_EXPORT_FORMAT, criteria=()):
+    """Stream contacts ordered by id."""
+    return stream_export(CONTACT_EXPORT_COLUMNS, export_format, criteria, [Contact.id])
+
+
+def export_schedule(export_format=DEFAULT_EXPORT_FORMAT, criteria=()):
+    """Stream follow-up history ordered by id."""
+    return stream_export(SCHEDULE_EXPORT_COLUMNS, export_format, criteria, [ScheduledFollowup.id])
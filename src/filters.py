@@ -0,0 +1,101 @@
+"""Filter builders shared by the list, export and bulk endpoints.
+
+Each builder takes a mapping of filter values (query string arguments or
+a JSON body) and returns a list of SQLAlchemy criteria. Invalid values
+raise ValueError so callers can answer with a 400.
+"""
+
+from sqlalchemy import select
+
+from .models.contact import Contact
+from .models.scheduled_followup import ScheduledFollowup
+from .models.followup_sequence_step import FollowupSequenceStep
+from .models.contact_sequence_assignment import ContactSequenceAssignment
+from .pagination import parse_bool, parse_datetime
+
+
+def parse_int(value, name):
+    """Parse an integer filter value, returning None when absent."""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be an integer')
+
+
+# Escape character of the LIKE patterns built by contains_pattern
+LIKE_ESCAPE = '\\'
+
+
+def contains_pattern(text):
+    """Get a LIKE pattern matching text anywhere, with its wildcards taken literally.
+
+    Use it with escape=LIKE_ESCAPE, e.g. Contact.name.ilike(pattern, escape=LIKE_ESCAPE).
+    """
+    escaped = text.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace('%', LIKE_ESCAPE + '%').replace('_', LIKE_ESCAPE + '_')
+    return f'%{escaped}%'
+
+
+def parse_list(value):
+    """Parse a comma-separated string or a list into a list of strings."""
+    if value is None or value == '':
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    return [item.strip() for item in str(value).split(',') if item.strip()]
+
+
+def contact_criteria(params):
+    """Build criteria for is_active, platform_preference and updated_since."""
+    criteria = []
+
+    is_active = parse_bool(params.get('is_active'))
+    if is_active is not None:
+        criteria.append(Contact.is_active == is_active)
+    if params.get('platform_preference'):
+        criteria.append(Contact.platform_preference == params['platform_preference'])
+    updated_since = parse_datetime(params.get('updated_since'))
+    if updated_since:
+        criteria.append(Contact.updated_at >= updated_since)
+
+    return criteria
+
+
+def schedule_criteria(params):
+    """Build criteria for ids, status, platform, contact_id, sequence_id,
+    date_from and date_to.
+
+    sequence_id matches follow-ups for contacts assigned to the sequence
+    that use one of the sequence's step templates.
+    """
+    criteria = []
+
+    ids = [parse_int(value, 'ids') for value in parse_list(params.get('ids'))]
+    if ids:
+        criteria.append(ScheduledFollowup.id.in_(ids))
+
+    statuses = parse_list(params.get('status'))
+    if statuses:
+        criteria.append(ScheduledFollowup.status.in_(statuses))
+    if params.get('platform'):
+        criteria.append(ScheduledFollowup.platform == params['platform'])
+    contact_id = parse_int(params.get('contact_id'), 'contact_id')
+    if contact_id is not None:
+        criteria.append(ScheduledFollowup.contact_id == contact_id)
+    sequence_id = parse_int(params.get('sequence_id'), 'sequence_id')
+    if sequence_id is not None:
+        criteria.append(ScheduledFollowup.template_id.in_(
+            select(FollowupSequenceStep.template_id).where(FollowupSequenceStep.sequence_id == sequence_id)
+        ))
+        criteria.append(ScheduledFollowup.contact_id.in_(
+            select(ContactSequenceAssignment.contact_id).where(ContactSequenceAssignment.sequence_id == sequence_id)
+        ))
+    date_from = parse_datetime(params.get('date_from'))
+    if date_from:
+        criteria.append(ScheduledFollowup.scheduled_date >= date_from)
+    date_to = parse_datetime(params.get('date_to'))
+    if date_to:
+        criteria.append(ScheduledFollowup.scheduled_date < date_to)
+
+    return criteria
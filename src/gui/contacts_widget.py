@@ -2,16 +2,23 @@
 
 from ..models.contact import Contact
 from ..models.database import get_db
+from ..export import export_contacts
+from ..filters import LIKE_ESCAPE, contains_pattern
 from .contact_dialog import ContactDialog
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
     QPushButton, QLineEdit, QLabel, QHeaderView, QFrame, QScrollArea,
-    QMessageBox, QAbstractItemView, QComboBox, QStyledItemDelegate
+    QMessageBox, QAbstractItemView, QComboBox, QStyledItemDelegate, QFileDialog
 )
 from PySide6.QtCore import Qt, QTimer, Signal, QPropertyAnimation, QEasingCurve
 from PySide6.QtGui import QFont, QColor, QPalette, QPainter, QPen
+from sqlalchemy import func
+from sqlalchemy.orm import undefer
 from datetime import datetime, timezone
 
+# Characters of notes shown in the table; the full text is loaded on edit
+NOTES_PREVIEW_LENGTH = 100
+
 
 class InlineEditDelegate(QStyledItemDelegate):
     """Delegate for inline editing in table cells."""
@@ -129,6 +136,7 @@ class ContactsWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.contacts = []
+        self.notes_previews = {}
         self.setup_ui()
         self.load_contacts()
 
@@ -337,7 +345,12 @@ class ContactsWidget(QWidget):
         """Load contacts from database."""
         try:
             db = next(get_db())
-            self.contacts = db.query(Contact).order_by(Contact.name).all()
+            # Notes are deferred; select one character past the preview to detect truncation
+            rows = db.query(
+                Contact, func.substr(Contact.notes, 1, NOTES_PREVIEW_LENGTH + 1)
+            ).order_by(Contact.name).all()
+            self.contacts = [contact for contact, _ in rows]
+            self.notes_previews = {contact.id: preview or "" for contact, preview in rows}
             self.populate_table()
             self.update_status(f"Loaded {len(self.contacts)} contacts")
         except Exception as e:
@@ -370,8 +383,13 @@ class ContactsWidget(QWidget):
             platform_item = QTableWidgetItem(contact.platform_preference or "email")
             self.contacts_table.setItem(row, 4, platform_item)
 
-            # Notes
-            notes_item = QTableWidgetItem(contact.notes or "")
+            # Notes (truncated notes are edited in the dialog)
+            preview = self.notes_previews.get(contact.id, "")
+            if self.notes_truncated(contact):
+                notes_item = QTableWidgetItem(preview[:NOTES_PREVIEW_LENGTH] + "…")
+                notes_item.setFlags(notes_item.flags() & ~Qt.ItemIsEditable)
+            else:
+                notes_item = QTableWidgetItem(preview)
             self.contacts_table.setItem(row, 5, notes_item)
 
             # Status
@@ -384,6 +402,10 @@ class ContactsWidget(QWidget):
             actions_item.setFlags(actions_item.flags() & ~Qt.ItemIsEditable)
             self.contacts_table.setItem(row, 7, actions_item)
 
+    def notes_truncated(self, contact):
+        """Check whether the table only shows part of a contact's notes."""
+        return len(self.notes_previews.get(contact.id, "")) > NOTES_PREVIEW_LENGTH
+
     def filter_contacts(self):
         """Filter contacts based on search text."""
         search_text = self.search_edit.text().lower()
@@ -391,11 +413,17 @@ class ContactsWidget(QWidget):
             self.populate_table()
             return
 
+        # Search notes in SQL so the deferred column is never loaded
+        db = next(get_db())
+        notes_matches = {contact_id for contact_id, in db.query(Contact.id).filter(
+            Contact.notes.ilike(contains_pattern(search_text), escape=LIKE_ESCAPE)
+        )}
+
         filtered_contacts = []
         for contact in self.contacts:
             if (search_text in (contact.name or "").lower() or
                 search_text in (contact.email or "").lower() or
-                    search_text in (contact.notes or "").lower()):
+                    contact.id in notes_matches):
                 filtered_contacts.append(contact)
 
         # Temporarily replace contacts list
@@ -425,6 +453,7 @@ class ContactsWidget(QWidget):
                     contact.platform_preference = item.text()
                 elif column == 5:  # Notes
                     contact.notes = item.text() if item.text() else None
+                    self.notes_previews[contact.id] = item.text()
 
                 contact.updated_at = datetime.now(timezone.utc)
                 db.commit()
@@ -440,6 +469,8 @@ class ContactsWidget(QWidget):
         """Handle double-click for editing."""
         if column == 7:  # Actions column
             self.edit_contact(row)
+        elif column == 5 and row < len(self.contacts) and self.notes_truncated(self.contacts[row]):
+            self.edit_contact(row)
         else:
             # Enable editing for the clicked cell
             self.contacts_table.editItem(self.contacts_table.item(row, column))
@@ -454,7 +485,13 @@ class ContactsWidget(QWidget):
     def edit_contact(self, row):
         """Edit an existing contact."""
         if row < len(self.contacts):
-            contact = self.contacts[row]
+            db = next(get_db())
+            contact = db.query(Contact).options(undefer(Contact.notes)).filter(
+                Contact.id == self.contacts[row].id
+            ).first()
+            if not contact:
+                self.load_contacts()
+                return
             dialog = ContactDialog(contact=contact, parent=self)
             if dialog.exec() == dialog.Accepted:
                 self.load_contacts()
@@ -484,8 +521,17 @@ class ContactsWidget(QWidget):
 
     def export_contacts(self):
         """Export contacts to CSV."""
-        # This would be implemented to export contacts
-        self.update_status("Export functionality coming soon!")
+        path, _ = QFileDialog.getSaveFileName(self, "Export Contacts", "contacts.csv", "CSV Files (*.csv)")
+        if not path:
+            return
+
+        try:
+            with open(path, 'w', newline='', encoding='utf-8') as export_file:
+                for chunk in export_contacts('csv'):
+                    export_file.write(chunk)
+            self.update_status(f"Exported contacts to {path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to export contacts: {str(e)}")
 
     def refresh(self):
         """Refresh the contacts list."""
@@ -4,11 +4,8 @@ from .settings_widget import SettingsWidget
 from .schedule_widget import ScheduleWidget
 from .templates_widget import TemplatesWidget
 from .contacts_widget import ContactsWidget
-from sqlalchemy import func
 from sqlalchemy.orm import Session
-from ..models.scheduled_followup import ScheduledFollowup
-from ..models.contact import Contact
-from ..models.database import get_db
+from ..stats import get_stats
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QPushButton, QLabel, QStatusBar,
@@ -394,16 +391,17 @@ class MainWindow(QMainWindow):
     def update_status(self):
         """Update status bar with current information."""
         try:
-            db = next(get_db())
-
-            # Get counts
-            total_contacts = db.query(Contact).count()
-            active_contacts = db.query(Contact).filter(Contact.is_active == True).count()
-            pending_followups = db.query(ScheduledFollowup).filter(
-                ScheduledFollowup.scheduled_time > func.now()
-            ).count()
-
-            status_text = f"👥 {active_contacts}/{total_contacts} contacts | 📅 {pending_followups} pending follow-ups | 🚀 Ready"
+            stats = get_stats()
+            contacts = stats['contacts']
+            followups = stats['followups']
+
+            status_text = (
+                f"👥 {contacts['active']}/{contacts['total']} contacts | "
+                f"📅 {followups['by_status']['pending']} pending follow-ups"
+            )
+            if followups['overdue']:
+                status_text += f" ({followups['overdue']} overdue)"
+            status_text += " | 🚀 Ready"
             self.status_bar.showMessage(status_text)
 
         except Exception as e:
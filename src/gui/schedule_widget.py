@@ -4,6 +4,7 @@ from ..models.message_template import MessageTemplate
 from ..models.contact import Contact
 from ..models.scheduled_followup import ScheduledFollowup
 from ..models.database import get_db
+from ..bulk import cancel_followups, retry_followups
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
     QTableWidgetItem, QPushButton, QHeaderView, QMessageBox,
@@ -11,8 +12,12 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal, QDate, QDateTime
 from PySide6.QtGui import QAction
+from sqlalchemy.orm import contains_eager
 from datetime import datetime, timedelta, timezone
 
+# Maximum number of follow-ups shown in the table at once
+SCHEDULE_PAGE_SIZE = 500
+
 
 class ScheduleWidget(QWidget):
     """Widget for managing scheduled follow-ups."""
@@ -92,7 +97,10 @@ class ScheduleWidget(QWidget):
             db = next(get_db())
 
             # Apply filters
-            query = db.query(ScheduledFollowup).join(Contact).join(MessageTemplate)
+            query = db.query(ScheduledFollowup).join(Contact).join(MessageTemplate).options(
+                contains_eager(ScheduledFollowup.contact),
+                contains_eager(ScheduledFollowup.template)
+            )
 
             # Status filter
             status_filter = self.status_filter.currentText()
@@ -112,7 +120,10 @@ class ScheduleWidget(QWidget):
             from_date = self.date_filter.date().toPython()
             query = query.filter(ScheduledFollowup.scheduled_date >= from_date)
 
-            followups = query.order_by(ScheduledFollowup.scheduled_date.desc()).all()
+            followups = query.order_by(
+                ScheduledFollowup.scheduled_date.desc(),
+                ScheduledFollowup.id.desc()
+            ).limit(SCHEDULE_PAGE_SIZE).all()
 
             self.schedule_table.setRowCount(len(followups))
 
@@ -189,32 +200,28 @@ class ScheduleWidget(QWidget):
         """Retry failed follow-ups."""
         try:
             db = next(get_db())
-            failed_followups = db.query(ScheduledFollowup).filter(
+            failed_count = db.query(ScheduledFollowup).filter(
                 ScheduledFollowup.status == 'failed'
-            ).all()
+            ).count()
 
-            if not failed_followups:
+            if not failed_count:
                 QMessageBox.information(self, "No Failed Follow-ups", "No failed follow-ups to retry.")
                 return
 
             reply = QMessageBox.question(
                 self,
                 "Retry Failed Follow-ups",
-                f"Retry {len(failed_followups)} failed follow-ups?",
+                f"Retry {failed_count} failed follow-ups?",
                 QMessageBox.Yes | QMessageBox.No
             )
 
             if reply == QMessageBox.Yes:
-                # Reset failed follow-ups to pending
-                for followup in failed_followups:
-                    followup.status = 'pending'
-                    followup.error_message = None
-                    followup.retry_count += 1
-
+                # Reset failed follow-ups to pending in one statement
+                retried = retry_followups(db, [])
                 db.commit()
                 self.load_schedule()
                 self.schedule_updated.emit()
-                QMessageBox.information(self, "Success", f"Retried {len(failed_followups)} failed follow-ups.")
+                QMessageBox.information(self, "Success", f"Retried {retried} failed follow-ups.")
 
         except Exception as e:
             QMessageBox.critical(self, "Database Error", f"Failed to retry failed follow-ups: {str(e)}")
@@ -250,9 +257,7 @@ class ScheduleWidget(QWidget):
 
         try:
             db = next(get_db())
-            followup.status = 'pending'
-            followup.error_message = None
-            followup.retry_count += 1
+            retry_followups(db, [ScheduledFollowup.id == followup.id])
             db.commit()
 
             self.load_schedule()
@@ -278,7 +283,7 @@ class ScheduleWidget(QWidget):
         if reply == QMessageBox.Yes:
             try:
                 db = next(get_db())
-                followup.status = 'cancelled'
+                cancel_followups(db, [ScheduledFollowup.id == followup.id])
                 db.commit()
 
                 self.load_schedule()
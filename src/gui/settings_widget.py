@@ -1,17 +1,13 @@
 """Settings and credentials management widget."""
 
-from ..models.platform_credentials import PlatformCredentials
 from ..models.database import get_db
+from ..settings import settings_service
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
     QLineEdit, QPushButton, QLabel, QMessageBox,
     QGroupBox, QTextEdit, QCheckBox, QTabWidget
 )
 from PySide6.QtCore import Qt, Signal
-from cryptography.fernet import Fernet
-import base64
-import json
-import os
 
 
 class SettingsWidget(QWidget):
@@ -21,22 +17,9 @@ class SettingsWidget(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.encryption_key = self.get_or_create_encryption_key()
         self.setup_ui()
         self.load_settings()
 
-    def get_or_create_encryption_key(self):
-        """Get or create encryption key for credentials."""
-        key_file = "encryption.key"
-        if os.path.exists(key_file):
-            with open(key_file, 'rb') as f:
-                return f.read()
-        else:
-            key = Fernet.generate_key()
-            with open(key_file, 'wb') as f:
-                f.write(key)
-            return key
-
     def setup_ui(self):
         """Set up the user interface."""
         layout = QVBoxLayout(self)
@@ -196,31 +179,15 @@ class SettingsWidget(QWidget):
         self.tab_widget.addTab(about_widget, "About")
 
     def load_settings(self):
-        """Load settings from database."""
+        """Load settings from the settings service."""
         try:
-            db = next(get_db())
-
-            # Load Gmail credentials
-            gmail_creds = db.query(PlatformCredentials).filter(
-                PlatformCredentials.platform == 'gmail'
-            ).first()
-
-            if gmail_creds:
-                decrypted = self.decrypt_credentials(gmail_creds.encrypted_credentials)
-                if decrypted:
-                    self.gmail_client_id.setText(decrypted.get('client_id', ''))
-                    self.gmail_client_secret.setText(decrypted.get('client_secret', ''))
-                    self.gmail_refresh_token.setText(decrypted.get('refresh_token', ''))
-
-            # Load Codementor credentials
-            codementor_creds = db.query(PlatformCredentials).filter(
-                PlatformCredentials.platform == 'codementor'
-            ).first()
-
-            if codementor_creds:
-                decrypted = self.decrypt_credentials(codementor_creds.encrypted_credentials)
-                if decrypted:
-                    self.codementor_api_key.setText(decrypted.get('api_key', ''))
+            gmail = settings_service.get('gmail')
+            self.gmail_client_id.setText(gmail.get('client_id', ''))
+            self.gmail_client_secret.setText(gmail.get('client_secret', ''))
+            self.gmail_refresh_token.setText(gmail.get('refresh_token', ''))
+
+            codementor = settings_service.get('codementor')
+            self.codementor_api_key.setText(codementor.get('api_key', ''))
 
         except Exception as e:
             QMessageBox.warning(self, "Settings Error", f"Failed to load settings: {str(e)}")
@@ -262,26 +229,9 @@ class SettingsWidget(QWidget):
 
     def save_platform_credentials(self, platform, credentials):
         """Save encrypted platform credentials."""
+        db = next(get_db())
         try:
-            db = next(get_db())
-
-            # Encrypt credentials
-            encrypted = self.encrypt_credentials(credentials)
-
-            # Save or update credentials
-            existing = db.query(PlatformCredentials).filter(
-                PlatformCredentials.platform == platform
-            ).first()
-
-            if existing:
-                existing.encrypted_credentials = encrypted
-            else:
-                creds = PlatformCredentials(
-                    platform=platform,
-                    encrypted_credentials=encrypted
-                )
-                db.add(creds)
-
+            settings_service.save(db, platform, credentials, encrypt=True)
             db.commit()
             self.settings_updated.emit()
 
@@ -289,21 +239,6 @@ class SettingsWidget(QWidget):
             db.rollback()
             raise e
 
-    def encrypt_credentials(self, credentials):
-        """Encrypt credentials using Fernet."""
-        f = Fernet(self.encryption_key)
-        json_str = json.dumps(credentials)
-        return f.encrypt(json_str.encode()).decode()
-
-    def decrypt_credentials(self, encrypted_credentials):
-        """Decrypt credentials using Fernet."""
-        try:
-            f = Fernet(self.encryption_key)
-            decrypted = f.decrypt(encrypted_credentials.encode())
-            return json.loads(decrypted.decode())
-        except Exception:
-            return None
-
     def save_general_settings(self):
         """Save general application settings."""
         # TODO: Implement general settings storage
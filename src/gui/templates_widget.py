@@ -10,6 +10,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QAction
+from sqlalchemy.orm import undefer
 
 
 class TemplatesWidget(QWidget):
@@ -130,7 +131,9 @@ class TemplatesWidget(QWidget):
 
         try:
             db = next(get_db())
-            return db.query(MessageTemplate).filter(MessageTemplate.id == template_id).first()
+            return db.query(MessageTemplate).options(undefer(MessageTemplate.body)).filter(
+                MessageTemplate.id == template_id
+            ).first()
         except Exception:
             return None
 
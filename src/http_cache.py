@@ -0,0 +1,133 @@
+"""Conditional GET support (ETag / Last-Modified) and response caching for list endpoints."""
+
+import hashlib
+from functools import wraps
+
+from flask import request, make_response
+from sqlalchemy import select
+
+from .models.sync_change import SyncChange, SYNCED_TABLES
+from .request_session import get_db
+from .response_cache import CachedResponse, response_cache, external_changes, current_versions, in_write_job
+from .compression import representation_etag, representation_etags, cached_response, cache_compressed_response
+
+
+def validator_statement(table_name):
+    """Select the id and time of the newest change log entry for a table.
+
+    Answered with one seek on ix_sync_changes_table_name_id, however
+    large the table is.
+    """
+    return select(SyncChange.id, SyncChange.created_at).where(
+        SyncChange.table_name == table_name
+    ).order_by(SyncChange.id.desc()).limit(1)
+
+
+def validator_tables(models):
+    """Get the change log table names that validate the given models.
+
+    Tables the log does not record are skipped: their writes are logged
+    against the tables they feed (sequence assignments as their
+    sequence), which the views that read them list as well.
+    """
+    return tuple(model.__tablename__ for model in models if model.__tablename__ in SYNCED_TABLES)
+
+
+def table_validators(models):
+    """Get (table name, last change id, last change time) for each model's table.
+
+    Runs on the request's session, so the view reuses its connection and
+    the validators match the snapshot it reads.
+    """
+    connection = get_db().connection()
+    validators = []
+    for table_name in validator_tables(models):
+        last_change = connection.execute(validator_statement(table_name)).first()
+        validators.append((table_name, *(last_change or (None, None))))
+    return validators
+
+
+def last_modified_time(validators):
+    """Get the time of the newest change among validators, or None."""
+    changed = [last_changed for _, _, last_changed in validators if last_changed]
+    return max(changed) if changed else None
+
+
+def compute_etag(validators, full_path=None):
+    """Compute a strong ETag for a request path and table validators.
+
+    Validators come from the database alone, so every worker process
+    computes the same ETag for the same data. full_path defaults to the
+    current Flask request's path and query.
+    """
+    digest = hashlib.sha1((full_path if full_path is not None else request.full_path).encode('utf-8'))
+    for name, last_change_id, _ in validators:
+        digest.update(f'|{name}:{last_change_id}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def conditional_get(*models):
+    """Answer 304 Not Modified when the client's validator is still current.
+
+    The ETag is derived from the request path and query string plus the
+    id of each model table's newest change log entry, and Last-Modified
+    is the time of the newest of those entries. Validators and rendered
+    bodies are kept in the response cache until one of the tables is
+    written, so a repeat request for unchanged data runs no queries at
+    all; after a write an unchanged list costs one index seek per table. Compressed bodies are cached per ETag and
+    encoding, and each encoding is served under its own representation
+    ETag. Inside a write job the view runs uncached and without
+    validators.
+    """
+    tables = tuple(model.__tablename__ for model in models)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if in_write_job():
+                return view(*args, **kwargs)
+            external_changes.refresh()
+            key = request.full_path
+            versions = current_versions(tables)
+            entry = response_cache.get(key, versions)
+            if entry is None:
+                validators = table_validators(models)
+                entry = CachedResponse(tables, versions, compute_etag(validators), last_modified_time(validators))
+                response_cache.put(key, entry)
+            etag, last_modified = entry.etag, entry.last_modified
+
+            matched_etag = None
+            if request.if_none_match:
+                matched_etag = next(
+                    (tag for tag in representation_etags(etag) if request.if_none_match.contains(tag)), None
+                )
+                not_modified = matched_etag is not None
+            else:
+                not_modified = bool(
+                    last_modified and request.if_modified_since
+                    and last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+                )
+
+            if not_modified:
+                response = make_response('', 304)
+                response.set_etag(matched_etag or etag)
+            else:
+                response = cached_response(etag)
+                if response is None:
+                    if entry.body is not None:
+                        response = make_response(entry.body)
+                        response.mimetype = entry.mimetype
+                    else:
+                        response = make_response(view(*args, **kwargs))
+                        if response.status_code != 200:
+                            return response
+                        if not response.is_streamed:
+                            response_cache.put(key, entry.with_body(response.get_data(), response.mimetype))
+                    response = cache_compressed_response(response, etag)
+                response.set_etag(representation_etag(etag, response.headers.get('Content-Encoding')))
+
+            if last_modified:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
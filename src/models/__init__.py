@@ -6,3 +6,5 @@ from .platform_credentials import PlatformCredentials
 from .followup_sequence import FollowupSequence
 from .followup_sequence_step import FollowupSequenceStep
 from .contact_sequence_assignment import ContactSequenceAssignment
+from .sync_change import SyncChange
+from . import table_versions
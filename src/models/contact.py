@@ -1,7 +1,7 @@
 """Contact model for managing client information."""
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Index
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime, timezone
 from .database import Base
 
@@ -10,6 +10,10 @@ class Contact(Base):
     """Contact model for storing client information."""
 
     __tablename__ = 'contacts'
+    __table_args__ = (
+        # Keyset pagination order for the contacts list endpoint
+        Index('ix_contacts_name_id', 'name', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
@@ -17,7 +21,8 @@ class Contact(Base):
     codementor_username = Column(String(255), unique=True, index=True)
     platform_preference = Column(String(50), default='email')  # 'email', 'codementor', 'both'
     last_contact_date = Column(DateTime)
-    notes = Column(Text)
+    # Unbounded; loaded only on access or with undefer()
+    notes = deferred(Column(Text))
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
@@ -1,22 +1,347 @@
 """Database configuration and session management."""
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import StaticPool, QueuePool, AsyncAdaptedQueuePool
 import os
+import time
+from datetime import datetime, timezone
+from threading import Lock
 
 # Models will be imported when needed by the application
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./followupper.db")
 
+# In-memory SQLite needs every session on one shared connection; file
+# databases and server databases get a connection per concurrent request
+# from a QueuePool
+IN_MEMORY = DATABASE_URL in ("sqlite://", "sqlite:///:memory:")
+
+# Connections kept open per process, and extra ones opened under load.
+# The defaults cover a server worker's request threads plus the
+# scheduler's 10 executor threads.
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+
+# Seconds a checkout waits for a free connection before failing
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+
+# Seconds after which server database connections are replaced (-1: never)
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+
+# Test server database connections with a round trip before handing them
+# out, so connections dropped by a server restart or idle timeout are
+# replaced instead of failing the request
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '1') != '0'
+
+# Milliseconds a PostgreSQL statement may run before the server cancels it
+# (0: no limit). Streaming exports fetch from a server-side cursor, so each
+# fetch is timed on its own rather than the whole export.
+DB_STATEMENT_TIMEOUT = int(os.getenv('DB_STATEMENT_TIMEOUT', '30000'))
+
+# PRAGMAs applied to every new SQLite connection, by profile name.
+# 'default' keeps SQLite's own settings (rollback journal, synchronous=FULL,
+# 2 MB page cache); 'durable' switches to WAL so readers never block the
+# writer but still syncs every commit; 'performance' also only syncs at
+# checkpoints, which stays durable against application crashes but may
+# lose the last commits on power loss.
+SQLITE_PROFILES = {
+    'default': {},
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'performance': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,  # negative values are KiB
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,  # ms
+    },
+}
+
+# Profile used by the application engines
+SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'performance')
+
+# Seconds between PRAGMA optimize runs on each pooled connection
+SQLITE_OPTIMIZE_INTERVAL = float(os.getenv('SQLITE_OPTIMIZE_INTERVAL', '3600'))
+
+
+def configure_sqlite(target_engine, profile=None, read_only=False, begin='BEGIN'):
+    """Apply a SQLite PRAGMA profile to every connection an engine opens.
+
+    With any profile other than 'default', PRAGMA optimize also runs on
+    checkout once a connection has gone SQLITE_OPTIMIZE_INTERVAL seconds
+    without it, so the query planner's statistics stay current. For
+    async engines pass async_engine.sync_engine.
+
+    Transactions are started with an explicit begin statement instead of
+    the driver's implicit one, so SAVEPOINTs work; the writer passes
+    'BEGIN IMMEDIATE' to take the write lock up front. Engines sharing
+    one connection (in-memory StaticPool) keep the driver's implicit
+    transactions, since concurrent sessions would nest their BEGINs.
+    read_only connections refuse writes (PRAGMA query_only), including
+    the statistics PRAGMA optimize writes, so they skip it; the writer
+    engine keeps the statistics current for them.
+    """
+    profile = profile or SQLITE_PROFILE
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLITE_PROFILE '{profile}'; expected one of: {', '.join(SQLITE_PROFILES)}")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    if read_only:
+        pragmas['query_only'] = 'ON'
+    explicit_begin = not isinstance(target_engine.pool, StaticPool)
+
+    @event.listens_for(target_engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        if explicit_begin:
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+        connection_record.info['optimized_at'] = time.monotonic()
+
+    if explicit_begin:
+        @event.listens_for(target_engine, 'begin')
+        def _begin(connection):
+            connection.exec_driver_sql(begin)
+
+    if not SQLITE_PROFILES[profile] or read_only:
+        return
+
+    @event.listens_for(target_engine, 'checkout')
+    def _optimize(dbapi_connection, connection_record, connection_proxy):
+        if time.monotonic() - connection_record.info.get('optimized_at', 0) < SQLITE_OPTIMIZE_INTERVAL:
+            return
+        connection_record.info['optimized_at'] = time.monotonic()
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute('PRAGMA optimize')
+        finally:
+            cursor.close()
+
+
+def configure_postgresql(target_engine, statement_timeout=None):
+    """Apply session settings to every connection a PostgreSQL engine opens.
+
+    Sets statement_timeout (DB_STATEMENT_TIMEOUT by default) outside any
+    transaction, so a later rollback does not undo it. For async engines
+    pass async_engine.sync_engine.
+
+    The models store UTC times in TIMESTAMP WITHOUT TIME ZONE columns.
+    psycopg lets the server drop the offset; asyncpg refuses aware
+    datetimes for such columns, so they are converted to naive UTC first.
+    """
+    timeout = DB_STATEMENT_TIMEOUT if statement_timeout is None else statement_timeout
+
+    @event.listens_for(target_engine, 'connect')
+    def _apply_settings(dbapi_connection, connection_record):
+        autocommit = dbapi_connection.autocommit
+        dbapi_connection.autocommit = True
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f'SET statement_timeout = {int(timeout)}')
+        finally:
+            cursor.close()
+            dbapi_connection.autocommit = autocommit
+
+    if target_engine.dialect.driver != 'asyncpg':
+        return
+
+    @event.listens_for(target_engine, 'before_cursor_execute', retval=True)
+    def _naive_utc(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            return statement, [_naive_utc_parameters(row) for row in parameters]
+        return statement, _naive_utc_parameters(parameters)
+
+
+def naive_utc(value):
+    """Convert an aware datetime to naive UTC; return anything else unchanged."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _naive_utc_parameters(parameters):
+    if isinstance(parameters, dict):
+        return {key: naive_utc(value) for key, value in parameters.items()}
+    return type(parameters)(naive_utc(value) for value in parameters)
+
+
+class PoolMetrics:
+    """Thread-safe checkout wait and usage counters for one pool."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.checkouts = 0
+        self.waited = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, wait, timed_out=False):
+        with self._lock:
+            self.checkouts += 1
+            if timed_out:
+                self.timeouts += 1
+            # Under a millisecond is a free pooled connection, not a wait
+            if wait >= 0.001:
+                self.waited += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'pool_checkouts': self.checkouts,
+                'pool_checkouts_waited': self.waited,
+                'pool_checkout_timeouts': self.timeouts,
+                'pool_wait_total_ms': round(self.wait_total * 1000, 3),
+                'pool_wait_avg_ms': round(self.wait_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                'pool_wait_max_ms': round(self.wait_max * 1000, 3),
+            }
+
+
+class MeteredPoolMixin:
+    """Times every pool checkout, including waits for a free connection and connects."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+class MeteredQueuePool(MeteredPoolMixin, QueuePool):
+    """QueuePool with checkout metrics."""
+
+
+class MeteredAsyncQueuePool(MeteredPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout metrics."""
+
+
+def pool_options(url, asynchronous=False):
+    """Get the create_engine pool arguments for a database URL.
+
+    In-memory SQLite uses one shared StaticPool connection; everything
+    else uses a metered QueuePool sized by DB_POOL_SIZE and
+    DB_MAX_OVERFLOW. Server databases also recycle connections after
+    DB_POOL_RECYCLE seconds, pre-ping them, and hand out the most recently
+    returned connection first, so surplus connections stay idle until the
+    server's idle timeout or the recycle closes them.
+    """
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        return {'poolclass': StaticPool}
+    options = {
+        'poolclass': MeteredAsyncQueuePool if asynchronous else MeteredQueuePool,
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+    }
+    if not url.startswith('sqlite'):
+        options.update({
+            'pool_recycle': DB_POOL_RECYCLE,
+            'pool_pre_ping': DB_POOL_PRE_PING,
+            'pool_use_lifo': True,
+        })
+    return options
+
+
 # Create engine with SQLite-specific settings
 engine = create_engine(
     DATABASE_URL,
-    poolclass=StaticPool,
+    **pool_options(DATABASE_URL),
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
     echo=False  # Set to True for SQL debugging
 )
+if engine.dialect.name == 'sqlite':
+    configure_sqlite(engine)
+elif engine.dialect.name == 'postgresql':
+    configure_postgresql(engine)
+
+# File SQLite gets a read-only pool for API reads and a one-connection
+# engine owned by the write queue (src.writer); readers then work from
+# WAL snapshots while the writer holds the write lock. Other databases
+# use the main engine for both.
+SEPARATE_WRITER = engine.dialect.name == 'sqlite' and not IN_MEMORY
+if SEPARATE_WRITER:
+    read_engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL), connect_args={"check_same_thread": False})
+    configure_sqlite(read_engine, read_only=True)
+    write_engine = create_engine(
+        DATABASE_URL,
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=DB_POOL_TIMEOUT,
+        connect_args={"check_same_thread": False}
+    )
+    configure_sqlite(write_engine, begin='BEGIN IMMEDIATE')
+else:
+    read_engine = write_engine = engine
+
+# Pool checkout/checkin counts, used to detect leaked connections
+_pool_counts = {'checkouts': 0, 'checkins': 0}
+_pool_lock = Lock()
+
+
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    with _pool_lock:
+        _pool_counts['checkouts'] += 1
+
+
+def _count_checkin(dbapi_connection, connection_record):
+    with _pool_lock:
+        _pool_counts['checkins'] += 1
+
+
+for _engine in {engine, read_engine, write_engine}:
+    event.listen(_engine, 'checkout', _count_checkout)
+    event.listen(_engine, 'checkin', _count_checkin)
+
+
+def pool_usage(target_engine):
+    """Get an engine's pool class, size and checkout wait metrics."""
+    pool = target_engine.pool
+    usage = {'pool_class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        usage.update({
+            'pool_size': pool.size(),
+            'pool_checked_in': pool.checkedin(),
+            'pool_checked_out': pool.checkedout(),
+            'pool_overflow': pool.overflow(),
+        })
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is not None:
+        usage.update(metrics.as_dict())
+    return usage
+
+
+def pool_stats():
+    """Get checkout counters for every engine and usage of the pool serving API reads."""
+    with _pool_lock:
+        counts = {
+            'connection_checkouts': _pool_counts['checkouts'],
+            'connection_checkins': _pool_counts['checkins'],
+            'connections_checked_out': _pool_counts['checkouts'] - _pool_counts['checkins'],
+        }
+    return {**counts, **pool_usage(read_engine)}
+
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -25,6 +350,16 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def reset_engine():
+    """Drop pooled connections inherited from a parent process after fork.
+
+    The parent's connections are left open for the parent; this process
+    opens its own on next use.
+    """
+    for target_engine in {engine, read_engine, write_engine}:
+        target_engine.dispose(close=False)
+
+
 def get_db():
     """Dependency to get database session."""
     db = SessionLocal()
@@ -1,10 +1,16 @@
 """Message template model for follow-up messages."""
 
+import re
+
+import emoji
 from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime, timezone
 from .database import Base
 
+# {user.<field>} and {contact.<field>} template variables
+PLACEHOLDER = re.compile(r'\{(user|contact)\.(\w+)\}')
+
 
 class MessageTemplate(Base):
     """Message template model for storing follow-up message templates."""
@@ -14,7 +20,8 @@ class MessageTemplate(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
     subject = Column(String(500))
-    body = Column(Text, nullable=False)
+    # Unbounded; loaded only on access or with undefer()
+    body = deferred(Column(Text, nullable=False))
     is_default = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -28,36 +35,11 @@ class MessageTemplate(Base):
 
     def render_template(self, contact_data):
         """Render the template with contact data substitution."""
-        import re
-        import emoji
-
-        # Get the template data from contact
-        template_data = contact_data.get_template_data()
-
-        # Render subject
-        rendered_subject = self.subject or ""
-        if rendered_subject:
-            for key, value in template_data['user'].items():
-                rendered_subject = rendered_subject.replace(f"{{user.{key}}}", str(value))
-            for key, value in template_data['contact'].items():
-                rendered_subject = rendered_subject.replace(f"{{contact.{key}}}", str(value))
-            # Process emojis
-            rendered_subject = emoji.emojize(rendered_subject, use_aliases=True)
-
-        # Render body
-        rendered_body = self.body or ""
-        if rendered_body:
-            for key, value in template_data['user'].items():
-                rendered_body = rendered_body.replace(f"{{user.{key}}}", str(value))
-            for key, value in template_data['contact'].items():
-                rendered_body = rendered_body.replace(f"{{contact.{key}}}", str(value))
-            # Process emojis
-            rendered_body = emoji.emojize(rendered_body, use_aliases=True)
+        return self.compile().render(contact_data)
 
-        return {
-            'subject': rendered_subject,
-            'body': rendered_body
-        }
+    def compile(self):
+        """Parse the subject and body once for rendering many contacts."""
+        return CompiledTemplate(self.subject or "", self.body or "")
 
     def get_available_variables(self):
         """Get list of available template variables."""
@@ -91,3 +73,44 @@ class MessageTemplate(Base):
                 'updated_at': 'Updated date'
             }
         }
+
+
+class CompiledTemplate:
+    """A subject and body split once into literal text and variables."""
+
+    def __init__(self, subject, body):
+        self.subject = self._parse(subject)
+        self.body = self._parse(body)
+
+    @staticmethod
+    def _parse(text):
+        """Split text into alternating literals and (scope, field) variables."""
+        parts = PLACEHOLDER.split(text)
+        return [
+            part if index % 3 == 0 else (part, parts[index + 1])
+            for index, part in enumerate(parts) if index % 3 != 2
+        ]
+
+    @staticmethod
+    def _fill(parts, template_data):
+        """Substitute variables and process emoji codes."""
+        if parts == ['']:
+            return ''
+        pieces = []
+        for part in parts:
+            if isinstance(part, str):
+                pieces.append(part)
+            elif part[1] in template_data[part[0]]:
+                pieces.append(str(template_data[part[0]][part[1]]))
+            else:
+                # Unknown variables are left as written
+                pieces.append(f'{{{part[0]}.{part[1]}}}')
+        return emoji.emojize(''.join(pieces), language='alias')
+
+    def render(self, contact):
+        """Render {'subject', 'body'} for one contact."""
+        template_data = contact.get_template_data()
+        return {
+            'subject': self._fill(self.subject, template_data),
+            'body': self._fill(self.body, template_data)
+        }
@@ -1,6 +1,6 @@
 """Scheduled follow-up model for tracking automated messages."""
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from .database import Base
@@ -10,6 +10,15 @@ class ScheduledFollowup(Base):
     """Scheduled follow-up model for tracking automated messages."""
 
     __tablename__ = 'scheduled_followups'
+    __table_args__ = (
+        # Keyset pagination orders for the schedule feed and its common filters
+        Index('ix_scheduled_followups_scheduled_date_id', 'scheduled_date', 'id'),
+        Index('ix_scheduled_followups_status_scheduled_date_id', 'status', 'scheduled_date', 'id'),
+        Index('ix_scheduled_followups_contact_id_scheduled_date_id', 'contact_id', 'scheduled_date', 'id'),
+        # Per-contact status lookups (bulk cancel/reschedule) and the retry scan
+        Index('ix_scheduled_followups_contact_id_status_scheduled_date_id', 'contact_id', 'status', 'scheduled_date', 'id'),
+        Index('ix_scheduled_followups_status_retry_count', 'status', 'retry_count'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     contact_id = Column(Integer, ForeignKey('contacts.id'), nullable=False, index=True)
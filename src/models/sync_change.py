@@ -0,0 +1,126 @@
+"""Change log model for delta sync."""
+
+from sqlalchemy import Column, Integer, String, DateTime, Index, event, insert, delete, select, func, literal, text
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from .database import Base
+
+# Tables whose writes are recorded for delta sync
+SYNCED_TABLES = (
+    'contacts',
+    'message_templates',
+    'followup_sequences',
+    'followup_sequence_steps',
+    'scheduled_followups',
+)
+
+# Synced table names mapped to (sync response key, serializer name)
+SYNC_RESOURCES = {
+    'contacts': ('contacts', 'contact'),
+    'message_templates': ('templates', 'template'),
+    'followup_sequences': ('sequences', 'sequence'),
+    'followup_sequence_steps': ('steps', 'step'),
+    'scheduled_followups': ('schedule', 'followup'),
+}
+
+# PostgreSQL advisory lock key held by every transaction that appends to
+# the log, from its first log write until it commits
+SYNC_LOG_LOCK_KEY = 0x5F4C4F47
+
+
+class SyncChange(Base):
+    """A create, update or delete of a synced row, in commit order."""
+
+    __tablename__ = 'sync_changes'
+    __table_args__ = (
+        # Newest change per table: the conditional GET validators
+        Index('ix_sync_changes_table_name_id', 'table_name', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String(50), nullable=False)
+    record_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)  # 'upsert', 'delete'
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+
+    def __repr__(self):
+        return f"<SyncChange(id={self.id}, table='{self.table_name}', record_id={self.record_id}, operation='{self.operation}')>"
+
+
+def _lock_log(connection):
+    """Make the log's ids visible in commit order.
+
+    Readers (delta sync tokens, the event broker, the response cache)
+    page through the log by id, so an id must never commit after a
+    larger one. SQLite's database write lock already guarantees that.
+    On PostgreSQL, where several processes write concurrently, a
+    transaction-scoped advisory lock serializes log writers until they
+    commit or roll back.
+    """
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': SYNC_LOG_LOCK_KEY})
+
+
+def record_changes(connection, changes):
+    """Append (table_name, record_id, operation) changes to the log."""
+    if not changes:
+        return
+    _lock_log(connection)
+    now = datetime.now(timezone.utc)
+    connection.execute(insert(SyncChange.__table__), [
+        {'table_name': table_name, 'record_id': record_id, 'operation': operation, 'created_at': now}
+        for table_name, record_id, operation in changes
+    ])
+
+
+def record_changes_from_select(connection, table_name, id_select, operation):
+    """Append one log entry per id returned by a SELECT, set-based."""
+    _lock_log(connection)
+    now = datetime.now(timezone.utc)
+    ids = id_select.subquery()
+    connection.execute(
+        insert(SyncChange.__table__).from_select(
+            ['table_name', 'record_id', 'operation', 'created_at'],
+            select(literal(table_name), ids.c[0], literal(operation), literal(now, DateTime()))
+        )
+    )
+
+
+def prune_changes(connection, before):
+    """Delete log entries created before the given time.
+
+    The newest entry is always kept so that ids keep increasing and
+    issued change tokens stay comparable.
+    """
+    newest = select(func.max(SyncChange.id)).scalar_subquery()
+    return connection.execute(
+        delete(SyncChange.__table__).where(SyncChange.created_at < before, SyncChange.id < newest)
+    ).rowcount
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_flushed_changes(session, flush_context):
+    """Log every synced row written or deleted by a flush."""
+    changes = []
+    for instance in session.new:
+        changes.extend(_instance_changes(instance, 'upsert'))
+    for instance in session.dirty:
+        if session.is_modified(instance, include_collections=False):
+            changes.extend(_instance_changes(instance, 'upsert'))
+    for instance in session.deleted:
+        changes.extend(_instance_changes(instance, 'delete'))
+
+    record_changes(session.connection(), changes)
+
+
+def _instance_changes(instance, operation):
+    """Get the log entries for one written ORM instance."""
+    table = getattr(instance, '__table__', None)
+    if table is None or instance.id is None:
+        return []
+
+    changes = [(table.name, instance.id, operation)] if table.name in SYNCED_TABLES else []
+    # Step and assignment changes alter their sequence's step and assignment stats
+    if table.name in ('followup_sequence_steps', 'contact_sequence_assignments') and instance.sequence_id:
+        changes.append(('followup_sequences', instance.sequence_id, 'upsert'))
+    return changes
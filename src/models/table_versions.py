@@ -0,0 +1,82 @@
+"""In-process version counters for database tables.
+
+Every committed ORM write bumps the version of the tables it touched,
+whether it came from a unit-of-work flush or a bulk UPDATE/DELETE/INSERT
+executed through a session. Readers use the versions to validate cached
+responses without querying the table.
+"""
+
+import threading
+from collections import defaultdict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_versions = defaultdict(int)
+_lock = threading.Lock()
+_bump_callbacks = []
+
+
+def table_version(table_name):
+    """Get the current version of a table."""
+    return _versions[table_name]
+
+
+def bump_tables(*table_names):
+    """Increment the version of the given tables."""
+    with _lock:
+        for table_name in table_names:
+            _versions[table_name] += 1
+    for callback in _bump_callbacks:
+        callback(table_names)
+
+
+def on_bump(callback):
+    """Call callback(table_names) after every bump_tables()."""
+    _bump_callbacks.append(callback)
+    return callback
+
+
+def _pending_tables(session):
+    """Get the set of tables written in the session's current transaction."""
+    return session.info.setdefault('changed_tables', set())
+
+
+def mark_tables_written(session, *table_names):
+    """Record tables written outside the ORM, e.g. by COPY on the raw connection."""
+    _pending_tables(session).update(table_names)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_tables(session, flush_context):
+    """Record the tables of every object written by a flush."""
+    pending = _pending_tables(session)
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(instance, '__table__', None)
+        if table is not None:
+            pending.add(table.name)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_executed_tables(orm_execute_state):
+    """Record the target table of bulk statements executed on a session."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if table is not None and hasattr(table, 'name'):
+        _pending_tables(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_committed_tables(session):
+    """Publish the tables written by a committed transaction."""
+    pending = session.info.pop('changed_tables', None)
+    if pending:
+        bump_tables(*pending)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_rolled_back_tables(session, previous_transaction):
+    """Forget the tables written by a rolled back transaction."""
+    if previous_transaction.parent is None:
+        session.info.pop('changed_tables', None)
@@ -0,0 +1,119 @@
+"""Keyset pagination and query parameter helpers for the API."""
+
+import base64
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values):
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    serialized = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(serialized, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, count):
+    """Decode a cursor produced by encode_cursor into its sort key values."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+    if not isinstance(values, list) or len(values) != count:
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Parse the limit query parameter, clamped to the allowed page size."""
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    return min(limit, maximum)
+
+
+def parse_bool(value):
+    """Parse a boolean query parameter, returning None when absent."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        return value
+    lowered = str(value).lower()
+    if lowered in ('1', 'true', 'yes'):
+        return True
+    if lowered in ('0', 'false', 'no'):
+        return False
+    raise ValueError(f'Invalid boolean value: {value}')
+
+
+def parse_datetime(value):
+    """Parse an ISO 8601 query parameter into a naive UTC datetime."""
+    if value is None or value == '':
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f'Invalid datetime value: {value}')
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def keyset(query, order_columns, cursor, limit, descending=False):
+    """Restrict a query or select() to one keyset page plus one extra row.
+
+    The extra row tells page_rows whether another page follows.
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(order_columns))
+        values = [
+            parse_datetime(value) if isinstance(value, str) and _is_datetime_column(column) else value
+            for column, value in zip(order_columns, values)
+        ]
+        if descending:
+            query = query.filter(tuple_(*order_columns) < tuple_(*values))
+        else:
+            query = query.filter(tuple_(*order_columns) > tuple_(*values))
+
+    ordering = [column.desc() for column in order_columns] if descending else order_columns
+    return query.order_by(*ordering).limit(limit + 1)
+
+
+def page_rows(rows, order_columns, limit):
+    """Split rows fetched by keyset() into the page and the next cursor."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in order_columns])
+
+    return rows, next_cursor
+
+
+def paginate(query, order_columns, cursor, limit, descending=False):
+    """Apply keyset pagination to a query ordered by the given columns.
+
+    Returns the rows for the requested page and the cursor for the next
+    page, or None when there are no more rows.
+    """
+    rows = keyset(query, order_columns, cursor, limit, descending).all()
+    return page_rows(rows, order_columns, limit)
+
+
+def _is_datetime_column(column):
+    """Check whether a column stores datetimes."""
+    try:
+        return column.type.python_type is datetime
+    except NotImplementedError:
+        return False
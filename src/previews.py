@@ -0,0 +1,52 @@
+"""Batch template previews.
+
+Contacts are loaded in one query, the template is parsed once, and the
+rendered previews are streamed as NDJSON, one line per contact.
+"""
+
+from .models.contact import Contact
+from .filters import contact_criteria, parse_int
+from .serializers import dumps
+
+# Largest number of contacts previewed by one request
+MAX_PREVIEW_BATCH = 500
+
+
+def parse_preview_targets(data):
+    """Parse a batch preview body into (contact_ids, criteria).
+
+    The body holds either contact_ids (previews come back in that order)
+    or a filter with the GET /api/contacts filters (previews are ordered
+    by name); the other element of the result is None.
+    """
+    if isinstance(data, dict) and data.get('contact_ids') is not None:
+        if not isinstance(data['contact_ids'], list):
+            raise ValueError('contact_ids must be a list')
+        return [parse_int(value, 'contact_ids') for value in data['contact_ids']], None
+    if isinstance(data, dict) and isinstance(data.get('filter'), dict):
+        return None, contact_criteria(data['filter'])
+    raise ValueError('Expected contact_ids or a filter object')
+
+
+def preview_contact_criteria(contact_ids, criteria):
+    """Get the criteria selecting the contacts to preview."""
+    return [Contact.id.in_(contact_ids)] if contact_ids is not None else criteria
+
+
+def render_previews(compiled, contacts, contact_ids=None):
+    """Yield one NDJSON line per contact with its preview or an error."""
+    if contact_ids is None:
+        items = [(contact.id, contact) for contact in contacts]
+    else:
+        by_id = {contact.id: contact for contact in contacts}
+        items = [(contact_id, by_id.get(contact_id)) for contact_id in contact_ids]
+
+    for contact_id, contact in items:
+        if contact is None:
+            result = {'contact_id': contact_id, 'error': 'Contact not found'}
+        else:
+            try:
+                result = {'contact_id': contact_id, **compiled.render(contact)}
+            except Exception as e:
+                result = {'contact_id': contact_id, 'error': str(e)}
+        yield dumps(result) + b'\n'
@@ -0,0 +1,139 @@
+"""Request-scoped database sessions for the Flask API.
+
+Each request gets at most one session, opened on the first get_db() call
+and shared by every helper that runs during the request, including batch
+sub-requests (they share the outer request's application context and
+leave the commit to the batch request). After the view returns the
+session is committed for successful responses and rolled back otherwise;
+it is always closed in teardown, even when the view raised.
+
+Request sessions read from the read-only pool. Views that write are
+wrapped in write_route, which runs them on the write queue's thread;
+there get_db() returns the queue's session, and the view's changes are
+committed with the rest of its group before the response is sent.
+"""
+
+import contextvars
+from functools import wraps
+from threading import Lock
+
+from flask import g, has_app_context, jsonify, make_response
+from sqlalchemy.orm import Session
+
+from .models.database import read_engine, pool_stats
+from .writer import write_queue, WriteQueueTimeout
+
+
+class SessionCounters:
+    """Thread-safe counts of request sessions opened and closed."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.opened = 0
+        self.closed = 0
+
+    def open(self):
+        with self._lock:
+            self.opened += 1
+
+    def close(self):
+        with self._lock:
+            self.closed += 1
+
+
+session_counters = SessionCounters()
+
+
+def get_db():
+    """Get the current request's session, opening it on first use.
+
+    Inside a write_route view this is the write queue's session. Outside
+    an application context a new session is returned and the caller must
+    close it.
+    """
+    session = write_queue.current_session()
+    if session is not None:
+        return session
+    if not has_app_context():
+        return Session(read_engine)
+
+    session = g.get('db_session')
+    if session is None:
+        session = g.db_session = Session(read_engine)
+        session_counters.open()
+    return session
+
+
+def write_route(view):
+    """Run a view that writes on the write queue.
+
+    The view runs on the writer thread with this request's context and
+    flushes instead of committing; responses with status 400 or above
+    roll its changes back. The response is returned once the group it
+    ran in has committed, or is a 503 when that takes longer than the
+    write queue's timeout.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        context = contextvars.copy_context()
+
+        def job(session):
+            return context.run(lambda: make_response(view(*args, **kwargs)))
+
+        try:
+            return write_queue.run(job, keep=lambda response: response.status_code < 400)
+        except WriteQueueTimeout as e:
+            return jsonify({'error': str(e)}), 503
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    return wrapper
+
+
+def commit_request_session(response):
+    """Commit the request's session for successful responses, roll it back otherwise."""
+    session = g.get('db_session')
+    if session is None or g.get('in_batch'):
+        return response
+
+    if response.status_code >= 400:
+        session.rollback()
+        return response
+    try:
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        return make_response(jsonify({'error': str(e)}), 500)
+    return response
+
+
+def close_request_session(exception=None):
+    """Roll back anything left uncommitted and close the request's session."""
+    session = g.pop('db_session', None)
+    if session is None:
+        return
+    try:
+        if exception is not None:
+            session.rollback()
+    finally:
+        session.close()
+        session_counters.close()
+
+
+def init_app(app):
+    """Register the session hooks on a Flask app."""
+    app.after_request(commit_request_session)
+    app.teardown_appcontext(close_request_session)
+
+
+def session_stats():
+    """Get session and pool counters.
+
+    Between requests sessions_open and connections_checked_out are 0;
+    anything higher is a leak.
+    """
+    return {
+        'sessions_opened': session_counters.opened,
+        'sessions_closed': session_counters.closed,
+        'sessions_open': session_counters.opened - session_counters.closed,
+        **pool_stats(),
+    }
@@ -0,0 +1,236 @@
+"""In-process cache of GET responses, invalidated by table versions.
+
+Entries are keyed on the request path and query string and remember the
+versions (see src.models.table_versions) of the tables they were built
+from. A commit that writes one of those tables bumps its version, which
+drops the entry, so a repeat request for unchanged data costs a dict
+lookup: no validator queries, no serialization and, through the
+compressed body cache, no compression.
+
+Versions only move for commits made in this process. Writes made by
+other worker processes or by the scheduler are picked up from the delta
+sync change log, which is checked at most every CHANGE_RECHECK_INTERVAL
+seconds and bumps the versions of the tables that changed.
+
+Memory is bounded by RESPONSE_CACHE_SIZE entries and RESPONSE_CACHE_BYTES
+of cached bodies, evicting the least recently used entries first.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+
+from flask import request, make_response
+from sqlalchemy import select, func
+
+from .models.database import engine
+from .models.sync_change import SyncChange
+from .models.table_versions import table_version, bump_tables, on_bump
+from .writer import write_queue
+
+# Number of cached responses kept in memory
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '512'))
+
+# Total bytes of cached response bodies kept in memory
+RESPONSE_CACHE_BYTES = int(os.getenv('RESPONSE_CACHE_BYTES', str(32 * 1024 * 1024)))
+
+# Seconds between checks of the change log for other processes' writes
+CHANGE_RECHECK_INTERVAL = float(os.getenv('CHANGE_RECHECK_INTERVAL', '1.0'))
+
+
+class CachedResponse:
+    """A cached response and the table versions it was built from.
+
+    body is None until a full response has been rendered; until then the
+    entry still answers conditional requests from etag and last_modified.
+    """
+
+    __slots__ = ('tables', 'versions', 'etag', 'last_modified', 'body', 'mimetype', 'expires')
+
+    def __init__(self, tables, versions, etag=None, last_modified=None, body=None, mimetype=None, expires=None):
+        self.tables = tables
+        self.versions = versions
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.mimetype = mimetype
+        self.expires = expires
+
+    @property
+    def size(self):
+        return len(self.body) if self.body else 0
+
+    def with_body(self, body, mimetype):
+        """Get a copy of this entry holding a rendered body."""
+        return CachedResponse(
+            self.tables, self.versions, self.etag, self.last_modified, body, mimetype, self.expires
+        )
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of CachedResponse entries keyed on request path."""
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE, max_bytes=RESPONSE_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, versions):
+        """Get the entry for key if it was built from the given versions, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.versions != versions or (entry.expires and time.monotonic() >= entry.expires):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        """Store an entry, evicting the least recently used ones past the limits."""
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, table_names):
+        """Drop every entry built from any of the given tables."""
+        table_names = set(table_names)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if table_names.intersection(entry.tables)]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Get hit, miss, eviction and size counters."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+response_cache = ResponseCache()
+
+
+@on_bump
+def _invalidate_responses(table_names):
+    """Drop cached responses built from tables a commit just wrote."""
+    response_cache.invalidate(table_names)
+
+
+class ExternalChanges:
+    """Applies other processes' writes, read from the change log, to table versions."""
+
+    def __init__(self, interval=CHANGE_RECHECK_INTERVAL):
+        self.interval = interval
+        self._last_id = None
+        self._checked = 0.0
+        self._lock = Lock()
+
+    def due(self):
+        """Check whether the change log should be read again."""
+        return time.monotonic() - self._checked >= self.interval
+
+    def refresh(self):
+        """Bump the versions of tables with log entries newer than the last check."""
+        if not self.due() or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._checked = time.monotonic()
+            with engine.connect() as connection:
+                if self._last_id is None:
+                    # Nothing is cached before the first check, so only the position matters
+                    self._last_id = connection.scalar(select(func.max(SyncChange.id))) or 0
+                    return
+                rows = connection.execute(
+                    select(SyncChange.table_name, func.max(SyncChange.id))
+                    .where(SyncChange.id > self._last_id)
+                    .group_by(SyncChange.table_name)
+                ).all()
+            if rows:
+                self._last_id = max(last_id for _, last_id in rows)
+                bump_tables(*(table_name for table_name, _ in rows))
+        except Exception as e:
+            print(f"Error reading the change log: {e}")
+        finally:
+            self._lock.release()
+
+
+external_changes = ExternalChanges()
+
+
+def in_write_job():
+    """Check whether this thread runs a write job.
+
+    Its reads may see uncommitted rows, so they must neither be served
+    from the cache nor stored in it.
+    """
+    return write_queue.current_session() is not None
+
+
+def current_versions(table_names):
+    """Get the current versions of the given tables, as a tuple."""
+    return tuple(table_version(table_name) for table_name in table_names)
+
+
+def cached_view(*models, ttl=None):
+    """Serve a GET view's 200 responses from the response cache.
+
+    For views without validators, such as /api/stats. Entries are
+    dropped when any model's table is written and, with ttl, after ttl
+    seconds. Inside a write job the view always runs.
+    """
+    tables = tuple(model.__tablename__ for model in models)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if in_write_job():
+                return view(*args, **kwargs)
+            external_changes.refresh()
+            versions = current_versions(tables)
+            entry = response_cache.get(request.full_path, versions)
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                expires = time.monotonic() + ttl if ttl else None
+                entry = CachedResponse(tables, versions, body=response.get_data(), mimetype=response.mimetype, expires=expires)
+                response_cache.put(request.full_path, entry)
+                return response
+
+            response = make_response(entry.body)
+            response.mimetype = entry.mimetype
+            return response
+        return wrapper
+    return decorator
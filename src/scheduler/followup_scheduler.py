@@ -3,14 +3,20 @@
 from ..models.message_template import MessageTemplate
 from ..models.scheduled_followup import ScheduledFollowup
 from ..models.contact import Contact
-from ..models.database import get_db, engine
-from apscheduler.schedulers.qt import QtScheduler
+from ..models.database import SessionLocal, get_db, engine, naive_utc
+from ..bulk import cancel_followups, retry_followups, reschedule_followups, reassign_followups, insert_followups
+from ..filters import schedule_criteria
+from ..settings import settings_service, SETTINGS_RECHECK_INTERVAL
+from ..writer import write_queue
+from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 import logging
+import os
 from datetime import datetime, timedelta, timezone
 
 
@@ -18,18 +24,69 @@ from datetime import datetime, timedelta, timezone
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Job that retries failed follow-ups every automation.check_interval minutes
+AUTOMATION_JOB_ID = 'automation'
+
+# Job that checks for automation settings saved by other processes
+SETTINGS_WATCH_JOB_ID = 'settings_watch'
+
+# Job that sends due pending follow-ups that no send job picked up
+DUE_SWEEP_JOB_ID = 'due_sweep'
+
+# Seconds between sweeps for due pending follow-ups
+DUE_SWEEP_INTERVAL = int(os.getenv('FOLLOWUP_DUE_SWEEP_INTERVAL', '60'))
+
+# Most follow-ups sent by one sweep
+DUE_SWEEP_BATCH = 500
+
+# The running scheduler, whose send_followup the persisted send jobs call
+_active_scheduler = None
+
+
+def send_scheduled_followup(followup_id):
+    """Send a follow-up from a job in the SQLAlchemy job store.
+
+    Persisted jobs must reference a module-level function: a bound
+    method of FollowupScheduler cannot be pickled with its scheduler.
+    """
+    if _active_scheduler is not None:
+        _active_scheduler.send_followup(followup_id)
+
+
+def pending_job_rows(db, followup_ids, chunk_size=500):
+    """Get (id, contact_id, scheduled_date) of the pending follow-ups among followup_ids."""
+    rows = []
+    for start in range(0, len(followup_ids), chunk_size):
+        rows.extend(db.query(
+            ScheduledFollowup.id, ScheduledFollowup.contact_id, ScheduledFollowup.scheduled_date
+        ).filter(
+            ScheduledFollowup.id.in_(followup_ids[start:start + chunk_size]),
+            ScheduledFollowup.status == 'pending'
+        ).all())
+    return rows
+
 
 class FollowupScheduler:
-    """Manages automated follow-up scheduling."""
+    """Manages automated follow-up scheduling.
+
+    The desktop app runs jobs on the Qt event loop; the API server passes
+    background=True to run them on a plain background thread instead.
+    """
 
-    def __init__(self):
+    def __init__(self, background=False):
         self.scheduler = None
+        self.background = background
         self.setup_scheduler()
 
     def setup_scheduler(self):
         """Set up the APScheduler with SQLAlchemy job store."""
+        global _active_scheduler
+
         jobstores = {
-            'default': SQLAlchemyJobStore(url=str(engine.url))
+            # Shares the app's engine; str(engine.url) would mask the password
+            'default': SQLAlchemyJobStore(engine=engine),
+            # Automation jobs are recreated from the settings at every start
+            'memory': MemoryJobStore()
         }
 
         executors = {
@@ -41,7 +98,14 @@ class FollowupScheduler:
             'max_instances': 1
         }
 
-        self.scheduler = QtScheduler(
+        if self.background:
+            scheduler_class = BackgroundScheduler
+        else:
+            # Imported lazily; the API server runs without Qt installed
+            from apscheduler.schedulers.qt import QtScheduler
+            scheduler_class = QtScheduler
+
+        self.scheduler = scheduler_class(
             jobstores=jobstores,
             executors=executors,
             job_defaults=job_defaults
@@ -51,54 +115,142 @@ class FollowupScheduler:
         self.scheduler.add_listener(self.job_executed, EVENT_JOB_EXECUTED)
         self.scheduler.add_listener(self.job_error, EVENT_JOB_ERROR)
 
+        _active_scheduler = self
         self.scheduler.start()
         logger.info("Follow-up scheduler started")
 
+        self.scheduler.add_job(
+            func=self.send_due_followups,
+            trigger=IntervalTrigger(seconds=DUE_SWEEP_INTERVAL),
+            id=DUE_SWEEP_JOB_ID,
+            name="Send due follow-ups",
+            jobstore='memory',
+            replace_existing=True
+        )
+        self.schedule_automation()
+        settings_service.on_change(self.settings_changed)
+
+    def schedule_automation(self):
+        """(Re)create the automation job at the saved check interval.
+
+        The settings are read from the settings service, so the watch job
+        costs a query only every SETTINGS_RECHECK_INTERVAL seconds.
+        """
+        check_interval = max(1, int(settings_service.automation()['check_interval']))
+        self.scheduler.add_job(
+            func=self.run_automation,
+            trigger=IntervalTrigger(minutes=check_interval),
+            id=AUTOMATION_JOB_ID,
+            name="Retry failed follow-ups",
+            jobstore='memory',
+            replace_existing=True
+        )
+        self.scheduler.add_job(
+            func=settings_service.automation,
+            trigger=IntervalTrigger(seconds=SETTINGS_RECHECK_INTERVAL),
+            id=SETTINGS_WATCH_JOB_ID,
+            name="Watch automation settings",
+            jobstore='memory',
+            replace_existing=True
+        )
+        logger.info(f"Automation checks every {check_interval} minutes")
+
+    def run_automation(self):
+        """Retry failed follow-ups when automation is enabled."""
+        automation = settings_service.automation()
+        if automation['enabled']:
+            self.retry_failed_followups(max_retries=int(automation['max_retries']))
+
+    def settings_changed(self, platforms):
+        """Pick up a new check interval as soon as the settings change."""
+        if 'automation' in platforms and self.scheduler and self.scheduler.running:
+            self.schedule_automation()
+
     def schedule_followup(self, contact_id, template_id, scheduled_date, platform):
         """Schedule a follow-up message."""
         try:
-            db = next(get_db())
+            def create_followup(db):
+                followup = ScheduledFollowup(
+                    contact_id=contact_id,
+                    template_id=template_id,
+                    scheduled_date=scheduled_date,
+                    platform=platform,
+                    status='pending'
+                )
+                db.add(followup)
+                db.flush()
+                return followup.id
 
-            # Create scheduled follow-up record
-            followup = ScheduledFollowup(
-                contact_id=contact_id,
-                template_id=template_id,
-                scheduled_date=scheduled_date,
-                platform=platform,
-                status='pending'
-            )
-            db.add(followup)
-            db.commit()
+            followup_id = write_queue.run(create_followup)
 
             # Schedule the job
-            job_id = f"followup_{followup.id}"
-            self.scheduler.add_job(
-                func=self.send_followup,
-                trigger=DateTrigger(run_date=scheduled_date),
-                args=[followup.id],
-                id=job_id,
-                name=f"Follow-up for contact {contact_id}",
-                replace_existing=True
-            )
+            self.add_followup_job(followup_id, contact_id, scheduled_date)
 
-            logger.info(f"Scheduled follow-up {followup.id} for {scheduled_date}")
-            return followup.id
+            logger.info(f"Scheduled follow-up {followup_id} for {scheduled_date}")
+            return followup_id
 
         except Exception as e:
             logger.error(f"Failed to schedule follow-up: {e}")
             raise
 
-    def send_followup(self, followup_id):
-        """Send a scheduled follow-up message."""
+    def schedule_followups(self, followups):
+        """Schedule many follow-up messages in one write.
+
+        followups are dicts with contact_id, template_id, scheduled_date
+        and platform. Returns the new follow-up ids in the same order.
+        """
         try:
-            db = next(get_db())
+            rows = [dict(followup) for followup in followups]
+            followup_ids = write_queue.run(lambda db: insert_followups(db, rows))
+
+            self.add_followup_jobs([
+                (followup_id, row['contact_id'], row['scheduled_date'])
+                for followup_id, row in zip(followup_ids, rows)
+            ])
+
+            logger.info(f"Scheduled {len(followup_ids)} follow-ups")
+            return followup_ids
+
+        except Exception as e:
+            logger.error(f"Failed to schedule follow-ups: {e}")
+            raise
+
+    def add_followup_job(self, followup_id, contact_id, scheduled_date):
+        """Add (or replace) the job that sends a follow-up.
+
+        Naive dates, as read from the database, are UTC.
+        """
+        self.scheduler.add_job(
+            func=send_scheduled_followup,
+            trigger=DateTrigger(run_date=naive_utc(scheduled_date).replace(tzinfo=timezone.utc)),
+            args=[followup_id],
+            id=f"followup_{followup_id}",
+            name=f"Follow-up for contact {contact_id}",
+            replace_existing=True
+        )
+
+    def send_followup(self, followup_id):
+        """Send a scheduled follow-up message if it is pending and due.
+
+        A follow-up moved to a later date after its job was created (for
+        example through the schedule API) is not sent; its job is moved
+        to the new date instead.
+        """
+        def mark_sent(db):
             followup = db.query(ScheduledFollowup).filter(
                 ScheduledFollowup.id == followup_id
             ).first()
 
             if not followup:
                 logger.error(f"Follow-up {followup_id} not found")
-                return
+                return False
+
+            if followup.status != 'pending':
+                logger.info(f"Skipping follow-up {followup_id} with status {followup.status}")
+                return False
+
+            if naive_utc(followup.scheduled_date) > datetime.now(timezone.utc).replace(tzinfo=None):
+                return followup.contact_id, followup.scheduled_date
 
             contact = followup.contact
             template = followup.template
@@ -107,34 +259,69 @@ class FollowupScheduler:
                 logger.error(f"Missing contact or template for follow-up {followup_id}")
                 followup.status = 'failed'
                 followup.error_message = "Missing contact or template"
-                db.commit()
-                return
+                return False
 
             # Update follow-up status
             followup.status = 'sent'
             followup.sent_date = datetime.now(timezone.utc)
             contact.last_contact_date = datetime.now(timezone.utc)
+            return True
 
-            db.commit()
-
-            # TODO: Actually send the message via Gmail/Codementor API
-            logger.info(f"Follow-up {followup_id} sent successfully")
+        try:
+            outcome = write_queue.run(mark_sent)
+            if outcome is True:
+                # TODO: Actually send the message via Gmail/Codementor API
+                logger.info(f"Follow-up {followup_id} sent successfully")
+            elif outcome:
+                contact_id, scheduled_date = outcome
+                try:
+                    self.add_followup_job(followup_id, contact_id, scheduled_date)
+                    logger.info(f"Follow-up {followup_id} is not due until {scheduled_date}; moved its job")
+                except Exception as e:
+                    # Not a failed send: the due sweep still sends it on time
+                    logger.error(f"Failed to move the job of follow-up {followup_id}: {e}")
 
         except Exception as e:
             logger.error(f"Failed to send follow-up {followup_id}: {e}")
-            try:
-                db = next(get_db())
+
+            def mark_failed(db):
                 followup = db.query(ScheduledFollowup).filter(
                     ScheduledFollowup.id == followup_id
                 ).first()
                 if followup:
                     followup.status = 'failed'
                     followup.error_message = str(e)
-                    followup.retry_count += 1
-                    db.commit()
+
+            try:
+                write_queue.run(mark_failed)
             except BaseException:
                 pass
 
+    def send_due_followups(self):
+        """Send the pending follow-ups whose scheduled date has passed.
+
+        Catches follow-ups with no send job of their own: those retried
+        or rescheduled through the schedule API or by another process,
+        and those whose job was missed while the scheduler was down.
+        Sends at most DUE_SWEEP_BATCH per run, oldest first. Returns the
+        number of follow-ups attempted.
+        """
+        try:
+            with SessionLocal() as db:
+                due_ids = [followup_id for followup_id, in db.query(ScheduledFollowup.id).filter(
+                    ScheduledFollowup.status == 'pending',
+                    ScheduledFollowup.scheduled_date <= datetime.now(timezone.utc)
+                ).order_by(ScheduledFollowup.scheduled_date, ScheduledFollowup.id).limit(DUE_SWEEP_BATCH).all()]
+        except Exception as e:
+            logger.error(f"Failed to find due follow-ups: {e}")
+            return 0
+
+        for followup_id in due_ids:
+            self.send_followup(followup_id)
+        if due_ids:
+            logger.info(f"Swept {len(due_ids)} due follow-ups")
+        return len(due_ids)
+
     def schedule_automatic_followups(self):
         """Schedule automatic follow-ups for all active contacts."""
         try:
@@ -211,31 +398,97 @@ class FollowupScheduler:
             logger.error(f"Failed to get overdue follow-ups: {e}")
             return []
 
-    def retry_failed_followups(self):
-        """Retry failed follow-ups."""
+    def retry_failed_followups(self, max_retries=3, **filters):
+        """Retry failed follow-ups with exponential backoff.
+
+        Runs one UPDATE per retry count (1, 2, 4 minutes ...) and accepts
+        the same filters as the schedule API. retry_count counts earlier
+        retries (see bulk.retry_followups), so each follow-up is retried
+        at most max_retries times. Returns the number of retried
+        follow-ups.
+        """
         try:
-            db = next(get_db())
-            failed_followups = db.query(ScheduledFollowup).filter(
-                ScheduledFollowup.status == 'failed',
-                ScheduledFollowup.retry_count < 3
-            ).all()
+            criteria = schedule_criteria(filters)
+            now = datetime.now(timezone.utc)
+
+            def retry(db):
+                retry_ids = db.query(ScheduledFollowup.id).filter(
+                    *criteria,
+                    ScheduledFollowup.status == 'failed',
+                    ScheduledFollowup.retry_count < max_retries
+                ).all()
+
+                retried = 0
+                for retry_count in range(max_retries):
+                    retry_delay = 2 ** retry_count  # 1, 2, 4 minutes
+                    retried += retry_followups(
+                        db,
+                        [*criteria, ScheduledFollowup.retry_count == retry_count],
+                        scheduled_date=now + timedelta(minutes=retry_delay)
+                    )
+                return retried, pending_job_rows(db, [followup_id for followup_id, in retry_ids])
+
+            retried, job_rows = write_queue.run(retry)
+
+            self.add_followup_jobs(job_rows)
+            logger.info(f"Retrying {retried} failed follow-ups")
+            return retried
 
-            for followup in failed_followups:
-                # Reschedule with exponential backoff
-                retry_delay = 2 ** followup.retry_count  # 1, 2, 4 minutes
-                scheduled_date = datetime.now(timezone.utc) + timedelta(minutes=retry_delay)
+        except Exception as e:
+            logger.error(f"Failed to retry failed follow-ups: {e}")
+            return 0
 
-                self.schedule_followup(
-                    followup.contact_id,
-                    followup.template_id,
-                    scheduled_date,
-                    followup.platform
-                )
+    def cancel_followups(self, **filters):
+        """Cancel the pending follow-ups matching the filters.
+
+        Their jobs are left in place; send_followup skips follow-ups that
+        are no longer pending.
+        """
+        try:
+            criteria = schedule_criteria(filters)
+            cancelled = write_queue.run(lambda db: cancel_followups(db, criteria))
+            logger.info(f"Cancelled {cancelled} follow-ups")
+            return cancelled
+        except Exception as e:
+            logger.error(f"Failed to cancel follow-ups: {e}")
+            raise
+
+    def reschedule_followups(self, scheduled_date, **filters):
+        """Move the pending follow-ups matching the filters to a new date."""
+        try:
+            criteria = schedule_criteria(filters)
 
-                logger.info(f"Retrying follow-up {followup.id} in {retry_delay} minutes")
+            def reschedule(db):
+                followup_ids = [followup_id for followup_id, in db.query(ScheduledFollowup.id).filter(
+                    *criteria, ScheduledFollowup.status == 'pending'
+                ).all()]
+                rescheduled = reschedule_followups(db, criteria, scheduled_date)
+                return rescheduled, pending_job_rows(db, followup_ids)
 
+            rescheduled, job_rows = write_queue.run(reschedule)
+
+            self.add_followup_jobs(job_rows)
+            logger.info(f"Rescheduled {rescheduled} follow-ups to {scheduled_date}")
+            return rescheduled
         except Exception as e:
-            logger.error(f"Failed to retry failed follow-ups: {e}")
+            logger.error(f"Failed to reschedule follow-ups: {e}")
+            raise
+
+    def reassign_followups(self, template_id=None, platform=None, **filters):
+        """Switch the template and/or platform of matching pending follow-ups."""
+        try:
+            criteria = schedule_criteria(filters)
+            reassigned = write_queue.run(lambda db: reassign_followups(db, criteria, template_id, platform))
+            logger.info(f"Reassigned {reassigned} follow-ups")
+            return reassigned
+        except Exception as e:
+            logger.error(f"Failed to reassign follow-ups: {e}")
+            raise
+
+    def add_followup_jobs(self, job_rows):
+        """(Re)create the send jobs for (id, contact_id, scheduled_date) rows."""
+        for followup_id, contact_id, scheduled_date in job_rows:
+            self.add_followup_job(followup_id, contact_id, scheduled_date)
 
     def job_executed(self, event):
         """Handle successful job execution."""
@@ -247,6 +500,10 @@ class FollowupScheduler:
 
     def shutdown(self):
         """Shutdown the scheduler."""
+        global _active_scheduler
+
         if self.scheduler:
             self.scheduler.shutdown()
+            if _active_scheduler is self:
+                _active_scheduler = None
             logger.info("Follow-up scheduler shutdown")
@@ -0,0 +1,189 @@
+"""Schema-driven serialization of API rows straight to JSON bytes.
+
+Each registered serializer declares the columns it selects, so list
+endpoints can query plain row tuples instead of ORM objects and encode
+them with orjson when it is installed. Serializers can be narrowed to a
+sparse fieldset so unrequested columns are never read from the database.
+"""
+
+import json
+from datetime import datetime
+
+from flask import Response
+from sqlalchemy import select, func, case
+
+from .models.contact import Contact
+from .models.message_template import MessageTemplate
+from .models.scheduled_followup import ScheduledFollowup
+from .models.followup_sequence import FollowupSequence
+from .models.followup_sequence_step import FollowupSequenceStep
+from .models.contact_sequence_assignment import ContactSequenceAssignment
+from .filters import parse_list
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class RowSerializer:
+    """Serializes rows selected from a fixed list of labelled columns.
+
+    joins lists (target, onclause, field names) outer joins that fields
+    read from, such as grouped aggregate subqueries; with_joins() adds
+    the ones the selected fields need.
+    """
+
+    def __init__(self, model, fields, joins=()):
+        self.model = model
+        self.fields = list(fields)
+        self.joins = list(joins)
+        self.keys = tuple(name for name, _ in self.fields)
+        self.columns = [expression.label(name) for name, expression in self.fields]
+
+    def select_fields(self, names, required=('id',)):
+        """Get a serializer limited to the requested fields.
+
+        names is a comma-separated string or a list; when empty every
+        field is kept. Required fields (the id and any pagination keys)
+        are always selected. Unknown names raise ValueError.
+        """
+        requested = parse_list(names)
+        if not requested:
+            return self
+
+        unknown = [name for name in requested if name not in self.keys]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+
+        wanted = set(requested) | set(required)
+        return RowSerializer(
+            self.model,
+            [(name, expression) for name, expression in self.fields if name in wanted],
+            [join for join in self.joins if wanted.intersection(join[2])]
+        )
+
+    def with_joins(self, query):
+        """Add the serializer's joins to a query or select() of its columns."""
+        if not self.joins:
+            return query
+        query = query.select_from(self.model)
+        for target, onclause, _ in self.joins:
+            query = query.outerjoin(target, onclause)
+        return query
+
+    def to_dict(self, row):
+        """Convert one selected row to a dict."""
+        return dict(zip(self.keys, row))
+
+    def to_dicts(self, rows):
+        """Convert selected rows to a list of dicts."""
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in rows]
+
+
+# Per-sequence step and assignment statistics, each grouped in one pass
+_step_stats = (
+    select(
+        FollowupSequenceStep.sequence_id,
+        func.count(FollowupSequenceStep.id).label('step_count'),
+        func.max(FollowupSequenceStep.delay_days).label('max_delay_days'),
+    )
+    .group_by(FollowupSequenceStep.sequence_id)
+    .subquery('step_stats')
+)
+_assignment_stats = (
+    select(
+        ContactSequenceAssignment.sequence_id,
+        func.count(case((ContactSequenceAssignment.status == 'active', 1))).label('active'),
+        func.count(case((ContactSequenceAssignment.status == 'completed', 1))).label('completed'),
+    )
+    .group_by(ContactSequenceAssignment.sequence_id)
+    .subquery('assignment_stats')
+)
+
+
+SERIALIZERS = {
+    'contact': RowSerializer(Contact, [
+        ('id', Contact.id),
+        ('name', Contact.name),
+        ('email', Contact.email),
+        ('codementor_username', Contact.codementor_username),
+        ('platform_preference', Contact.platform_preference),
+        ('last_contact_date', Contact.last_contact_date),
+        ('notes', Contact.notes),
+        ('is_active', Contact.is_active),
+        ('created_at', Contact.created_at),
+        ('updated_at', Contact.updated_at),
+    ]),
+    'template': RowSerializer(MessageTemplate, [
+        ('id', MessageTemplate.id),
+        ('name', MessageTemplate.name),
+        ('subject', MessageTemplate.subject),
+        ('body', MessageTemplate.body),
+        ('is_default', MessageTemplate.is_default),
+        ('is_active', MessageTemplate.is_active),
+        ('created_at', MessageTemplate.created_at),
+        ('updated_at', MessageTemplate.updated_at),
+    ]),
+    'followup': RowSerializer(ScheduledFollowup, [
+        ('id', ScheduledFollowup.id),
+        ('contact_id', ScheduledFollowup.contact_id),
+        ('template_id', ScheduledFollowup.template_id),
+        ('scheduled_date', ScheduledFollowup.scheduled_date),
+        ('status', ScheduledFollowup.status),
+        ('platform', ScheduledFollowup.platform),
+        ('created_at', ScheduledFollowup.created_at),
+    ]),
+    'sequence': RowSerializer(FollowupSequence, [
+        ('id', FollowupSequence.id),
+        ('name', FollowupSequence.name),
+        ('description', FollowupSequence.description),
+        ('platform', FollowupSequence.platform),
+        ('is_active', FollowupSequence.is_active),
+        ('step_count', func.coalesce(_step_stats.c.step_count, 0)),
+        ('total_duration_days', func.coalesce(_step_stats.c.max_delay_days, 0)),
+        ('active_assignments', func.coalesce(_assignment_stats.c.active, 0)),
+        ('completed_assignments', func.coalesce(_assignment_stats.c.completed, 0)),
+        ('created_at', FollowupSequence.created_at),
+        ('updated_at', FollowupSequence.updated_at),
+    ], joins=[
+        (_step_stats, _step_stats.c.sequence_id == FollowupSequence.id, ('step_count', 'total_duration_days')),
+        (_assignment_stats, _assignment_stats.c.sequence_id == FollowupSequence.id,
+         ('active_assignments', 'completed_assignments')),
+    ]),
+    'step': RowSerializer(FollowupSequenceStep, [
+        ('id', FollowupSequenceStep.id),
+        ('sequence_id', FollowupSequenceStep.sequence_id),
+        ('step_number', FollowupSequenceStep.step_number),
+        ('delay_days', FollowupSequenceStep.delay_days),
+        ('template_id', FollowupSequenceStep.template_id),
+        ('is_active', FollowupSequenceStep.is_active),
+        ('created_at', FollowupSequenceStep.created_at),
+        ('updated_at', FollowupSequenceStep.updated_at),
+    ]),
+}
+
+
+def get_serializer(name):
+    """Get a registered serializer by name."""
+    return SERIALIZERS[name]
+
+
+def _json_default(value):
+    """Encode datetimes for the standard library JSON fallback."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(payload):
+    """Encode a payload as JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+
+def json_response(payload, status=200):
+    """Build a JSON response from a payload encoded with dumps."""
+    return Response(dumps(payload), status=status, mimetype='application/json')
@@ -0,0 +1,154 @@
+"""Production server for the Followupper API.
+
+Runs the Flask app under gunicorn with pre-forked workers, each serving
+requests on a thread pool with HTTP keep-alive. The app is imported once
+in the master so migrations run once; every worker then drops the
+database connections it inherited across fork. The follow-up scheduler
+runs in exactly one worker, elected through an exclusive file lock; if
+that worker dies, its replacement takes the lock over.
+
+Where gunicorn is not available (Windows) the app is served by waitress
+in a single process with the same thread count.
+
+Usage:
+    python main.py serve [--host HOST] [--port PORT] [--workers N] [--threads N] [--keepalive SECONDS]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import gunicorn
+except ImportError:
+    gunicorn = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = os.getenv('FOLLOWUPPER_HOST', '0.0.0.0')
+DEFAULT_PORT = int(os.getenv('FOLLOWUPPER_PORT', '5000'))
+DEFAULT_WORKERS = int(os.getenv('FOLLOWUPPER_WORKERS', str(min(4, os.cpu_count() or 1))))
+DEFAULT_THREADS = int(os.getenv('FOLLOWUPPER_THREADS', '8'))
+DEFAULT_KEEPALIVE = int(os.getenv('FOLLOWUPPER_KEEPALIVE', '5'))
+
+# Lock file that elects the worker running the follow-up scheduler
+SCHEDULER_LOCK_PATH = os.getenv(
+    'FOLLOWUPPER_SCHEDULER_LOCK', os.path.join(tempfile.gettempdir(), 'followupper-scheduler.lock')
+)
+
+_scheduler = None
+_scheduler_lock_file = None
+
+
+def start_scheduler():
+    """Start the follow-up scheduler unless another process already runs it.
+
+    Returns True when this process became the scheduler process.
+    """
+    global _scheduler, _scheduler_lock_file
+
+    if fcntl is not None:
+        lock_file = open(SCHEDULER_LOCK_PATH, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        # Held until the process exits
+        _scheduler_lock_file = lock_file
+
+    from .scheduler.followup_scheduler import FollowupScheduler
+    _scheduler = FollowupScheduler(background=True)
+    logger.info(f"Follow-up scheduler running in process {os.getpid()}")
+    return True
+
+
+def stop_scheduler():
+    """Stop the follow-up scheduler if this process runs it."""
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.shutdown()
+        _scheduler = None
+
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the gunicorn master."""
+    from .models.database import reset_engine
+    reset_engine()
+
+
+def post_worker_init(worker):
+    """Try to become the scheduler worker once the worker is ready."""
+    start_scheduler()
+
+
+def worker_exit(server, worker):
+    """Stop the scheduler so its lock is released for a replacement worker."""
+    stop_scheduler()
+
+
+def serve_gunicorn(host, port, workers, threads, keepalive):
+    """Serve the API with gunicorn."""
+    from gunicorn.app.base import BaseApplication
+
+    class FollowupperApplication(BaseApplication):
+        """gunicorn application configured from the serve options."""
+
+        def load_config(self):
+            options = {
+                'bind': f'{host}:{port}',
+                'workers': workers,
+                'threads': threads,
+                'worker_class': 'gthread',
+                'keepalive': keepalive,
+                'preload_app': True,
+                'post_fork': post_fork,
+                'post_worker_init': post_worker_init,
+                'worker_exit': worker_exit,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from .api import app
+            return app
+
+    FollowupperApplication().run()
+
+
+def serve_waitress(host, port, threads):
+    """Serve the API with waitress in a single process."""
+    from waitress import serve
+    from .api import app
+
+    start_scheduler()
+    try:
+        serve(app, host=host, port=port, threads=threads)
+    finally:
+        stop_scheduler()
+
+
+def main(argv=None):
+    """Parse serve options and run the production server."""
+    parser = argparse.ArgumentParser(prog='followupper serve', description='Run the Followupper API in production mode.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='worker processes (gunicorn only)')
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS, help='request threads per worker')
+    parser.add_argument('--keepalive', type=int, default=DEFAULT_KEEPALIVE, help='seconds to hold idle keep-alive connections (gunicorn only)')
+    args = parser.parse_args(argv)
+
+    if gunicorn is not None and fcntl is not None:
+        serve_gunicorn(args.host, args.port, args.workers, args.threads, args.keepalive)
+    else:
+        serve_waitress(args.host, args.port, args.threads)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Cached application settings and platform credentials.
+
+Every platform's record in platform_credentials is loaded and decoded
+once, then served from memory. Commits in this process that write the
+table mark the cache stale right away. Saves made by other processes are
+noticed by a (max updated_at, row count) check that runs at most every
+SETTINGS_RECHECK_INTERVAL seconds, so reading a setting never costs a
+query per access.
+
+Credentials saved by the desktop app are Fernet-encrypted with the key in
+ENCRYPTION_KEY_FILE; the key is read (or created) once per process.
+cryptography is optional for reading plain JSON records.
+"""
+
+import copy
+import json
+import os
+import time
+from threading import Lock
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from .models.database import engine
+from .models.platform_credentials import PlatformCredentials
+from .models.table_versions import on_bump
+
+try:
+    from cryptography.fernet import Fernet
+except ImportError:
+    Fernet = None
+
+# Seconds between checks for settings saved by other processes
+SETTINGS_RECHECK_INTERVAL = float(os.getenv('SETTINGS_RECHECK_INTERVAL', '5'))
+
+# File holding the Fernet key for encrypted credentials
+ENCRYPTION_KEY_FILE = os.getenv('ENCRYPTION_KEY_FILE', 'encryption.key')
+
+# Settings returned for platforms that have never been saved
+DEFAULT_SETTINGS = {
+    'gmail': {'email': '', 'app_password': ''},
+    'codementor': {'access_token': '', 'refresh_token': ''},
+    'automation': {'enabled': False, 'check_interval': 15, 'max_retries': 3, 'timezone': 'UTC'},
+}
+
+# Prefix of every Fernet token (version byte 0x80, base64 encoded)
+FERNET_TOKEN_PREFIX = 'gAAAAA'
+
+_cipher = None
+_cipher_lock = Lock()
+
+
+def get_cipher():
+    """Get the Fernet cipher, reading or creating the key file on first use."""
+    global _cipher
+    if Fernet is None:
+        raise RuntimeError('cryptography is required for encrypted credentials')
+    with _cipher_lock:
+        if _cipher is None:
+            if os.path.exists(ENCRYPTION_KEY_FILE):
+                with open(ENCRYPTION_KEY_FILE, 'rb') as f:
+                    key = f.read()
+            else:
+                key = Fernet.generate_key()
+                with open(ENCRYPTION_KEY_FILE, 'wb') as f:
+                    f.write(key)
+            _cipher = Fernet(key)
+        return _cipher
+
+
+def encrypt_credentials(values):
+    """Encrypt a settings dict into a Fernet token."""
+    return get_cipher().encrypt(json.dumps(values).encode()).decode()
+
+
+def decode_credentials(stored):
+    """Decode a stored record, decrypting it first when it is a Fernet token."""
+    try:
+        if stored.startswith(FERNET_TOKEN_PREFIX):
+            stored = get_cipher().decrypt(stored.encode()).decode()
+        return json.loads(stored)
+    except Exception as e:
+        print(f"Error decoding credentials: {e}")
+        return {}
+
+
+def settings_validator_statement():
+    """Select (max updated_at, row count) for the settings table."""
+    return select(func.max(PlatformCredentials.updated_at), func.count()).select_from(PlatformCredentials)
+
+
+class SettingsService:
+    """Thread-safe in-memory copy of every platform's decoded settings."""
+
+    def __init__(self, recheck_interval=SETTINGS_RECHECK_INTERVAL):
+        self.recheck_interval = recheck_interval
+        self._settings = None
+        self._validator = None
+        self._stale = True
+        self._checked = 0.0
+        self._lock = Lock()
+        self._listeners = []
+        self.loads = 0
+
+    def get(self, platform):
+        """Get one platform's settings, or its defaults when never saved."""
+        settings = self._current()
+        return copy.deepcopy(settings.get(platform, DEFAULT_SETTINGS.get(platform, {})))
+
+    def all(self):
+        """Get the settings of every platform in DEFAULT_SETTINGS."""
+        settings = self._current()
+        return {platform: copy.deepcopy(settings.get(platform, default)) for platform, default in DEFAULT_SETTINGS.items()}
+
+    def automation(self):
+        """Get the automation settings with defaults for missing keys."""
+        return {**DEFAULT_SETTINGS['automation'], **self.get('automation')}
+
+    def save(self, db, platform, values, encrypt=False):
+        """Create or replace a platform's record on a session.
+
+        The caller commits; the commit marks the cache stale.
+        """
+        stored = encrypt_credentials(values) if encrypt else PlatformCredentials.save_credentials(values)
+        record = db.query(PlatformCredentials).filter(PlatformCredentials.platform == platform).first()
+        if record:
+            record.credentials = stored
+        else:
+            db.add(PlatformCredentials(platform=platform, credentials=stored))
+
+    def invalidate(self):
+        """Reload the settings on next access."""
+        self._stale = True
+
+    def on_change(self, callback):
+        """Call callback(platforms) after a reload that changed those platforms' settings."""
+        self._listeners.append(callback)
+        return callback
+
+    def _current(self):
+        """Get the cached settings, reloading them when stale."""
+        changed = None
+        with self._lock:
+            if not self._stale and time.monotonic() - self._checked >= self.recheck_interval:
+                self._checked = time.monotonic()
+                with engine.connect() as connection:
+                    self._stale = tuple(connection.execute(settings_validator_statement()).one()) != self._validator
+            if self._stale:
+                # Cleared before loading so that a commit during the load is not lost
+                self._stale = False
+                self._checked = time.monotonic()
+                previous, self._settings = self._settings, self._load()
+                if previous is not None:
+                    changed = {
+                        platform for platform in set(previous) | set(self._settings)
+                        if previous.get(platform) != self._settings.get(platform)
+                    }
+            settings = self._settings
+        if changed:
+            for callback in self._listeners:
+                callback(changed)
+        return settings
+
+    def _load(self):
+        """Read and decode every record in one transaction."""
+        self.loads += 1
+        with Session(engine) as db:
+            self._validator = tuple(db.execute(settings_validator_statement()).one())
+            records = db.execute(select(PlatformCredentials.platform, PlatformCredentials.credentials)).all()
+        return {platform: decode_credentials(stored) for platform, stored in records}
+
+
+settings_service = SettingsService()
+
+
+@on_bump
+def _invalidate_settings(table_names):
+    """Mark the settings stale after a commit that wrote them."""
+    if PlatformCredentials.__tablename__ in table_names:
+        settings_service.invalidate()
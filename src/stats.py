@@ -0,0 +1,115 @@
+"""Dashboard statistics shared by /api/stats and the desktop status bar.
+
+Every figure comes from one statement joining two single-row aggregates,
+one over contacts and one over scheduled follow-ups. The result is cached
+for STATS_TTL seconds, and commits that write either table clear it
+early.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, func, case, true
+
+from .models.database import engine
+from .models.contact import Contact
+from .models.scheduled_followup import ScheduledFollowup
+from .models.table_versions import on_bump
+
+# Seconds a computed result is served before it is recomputed
+STATS_TTL = float(os.getenv('STATS_TTL', '5'))
+
+FOLLOWUP_STATUSES = ('pending', 'sent', 'failed', 'cancelled')
+
+# Tables whose writes invalidate the cached statistics
+STATS_TABLES = {Contact.__tablename__, ScheduledFollowup.__tablename__}
+
+
+def _count_where(condition):
+    """Count the rows matching a condition inside an aggregate."""
+    return func.count(case((condition, 1)))
+
+
+def stats_statement(now):
+    """Build the single SELECT returning every dashboard figure at now (naive UTC)."""
+    contacts = select(
+        func.count().label('total_contacts'),
+        _count_where(Contact.is_active == True).label('active_contacts'),
+    ).subquery('contact_stats')
+
+    pending = ScheduledFollowup.status == 'pending'
+    followups = select(
+        func.count().label('total_followups'),
+        *[_count_where(ScheduledFollowup.status == status).label(status) for status in FOLLOWUP_STATUSES],
+        _count_where(pending & (ScheduledFollowup.scheduled_date < now)).label('overdue'),
+        _count_where(
+            (ScheduledFollowup.status == 'sent') & (ScheduledFollowup.sent_date >= now - timedelta(hours=24))
+        ).label('sent_last_24h'),
+        func.min(case((pending & (ScheduledFollowup.scheduled_date >= now), ScheduledFollowup.scheduled_date))).label('next_due'),
+    ).subquery('followup_stats')
+
+    # Both sides are single rows; the join just puts them side by side
+    return select(contacts, followups).select_from(contacts.join(followups, true()))
+
+
+def load_stats(connection, now=None):
+    """Run stats_statement and shape the row for the API."""
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    row = connection.execute(stats_statement(now)).one()._mapping
+    return {
+        'contacts': {'total': row['total_contacts'], 'active': row['active_contacts']},
+        'followups': {
+            'total': row['total_followups'],
+            'by_status': {status: row[status] for status in FOLLOWUP_STATUSES},
+            'overdue': row['overdue'],
+            'sent_last_24h': row['sent_last_24h'],
+            'next_due': row['next_due'],
+        },
+        'generated_at': now,
+    }
+
+
+class StatsCache:
+    """Thread-safe TTL cache of the latest statistics."""
+
+    def __init__(self, ttl=STATS_TTL):
+        self.ttl = ttl
+        self._value = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self):
+        """Get the statistics, recomputing them when stale."""
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires:
+                self.hits += 1
+                return self._value
+            self.misses += 1
+            with engine.connect() as connection:
+                self._value = load_stats(connection)
+            self._expires = time.monotonic() + self.ttl
+            return self._value
+
+    def invalidate(self):
+        """Drop the cached statistics."""
+        with self._lock:
+            self._value = None
+
+
+stats_cache = StatsCache()
+
+
+@on_bump
+def _invalidate_stats(table_names):
+    """Clear the cache after a commit that wrote contacts or follow-ups."""
+    if STATS_TABLES.intersection(table_names):
+        stats_cache.invalidate()
+
+
+def get_stats():
+    """Get the current dashboard statistics."""
+    return stats_cache.get()
@@ -0,0 +1,274 @@
+"""Single-writer queue with group commit for SQLite.
+
+SQLite allows one writer at a time. Instead of letting every request
+thread and scheduler job race for the write lock (and wait out
+busy_timeout or fail with "database is locked"), writes are submitted as
+functions to one writer thread that owns the write connection:
+
+- the writer takes queued jobs in arrival order, up to
+  WRITE_QUEUE_BATCH at a time, and runs them in one BEGIN IMMEDIATE
+  transaction;
+- each job runs inside its own SAVEPOINT, so a job that fails (or whose
+  keep() check rejects its result) is rolled back alone;
+- the transaction is committed once for the whole group, and only then
+  are the jobs' futures resolved, so callers never see uncommitted data
+  acknowledged.
+
+Callers wait at most WRITE_QUEUE_TIMEOUT seconds for their job to
+commit, so one stuck job cannot hang every writing request without a
+trace: the waiting callers get WriteQueueTimeout, and jobs still queued
+are cancelled. Jobs that run longer than the timeout are logged.
+
+The queue is used for file SQLite databases. With in-memory SQLite,
+server databases or WRITE_QUEUE=0, run() executes the job on the
+calling thread in its own transaction instead (one at a time for
+in-memory SQLite, whose sessions all share one connection).
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait
+from contextlib import nullcontext
+
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from .models.database import engine, write_engine, SEPARATE_WRITER
+
+# Whether writes go through the writer thread (file SQLite only)
+WRITE_QUEUE_ENABLED = SEPARATE_WRITER and os.getenv('WRITE_QUEUE', '1') != '0'
+
+# Most jobs committed in one transaction
+WRITE_QUEUE_BATCH = int(os.getenv('WRITE_QUEUE_BATCH', '64'))
+
+# Seconds a caller waits for its job to commit (0 waits forever)
+WRITE_QUEUE_TIMEOUT = float(os.getenv('WRITE_QUEUE_TIMEOUT', '60'))
+
+logger = logging.getLogger(__name__)
+
+
+class WriteQueueTimeout(Exception):
+    """A write job did not commit within the queue's timeout."""
+
+
+class WriteJob:
+    """A queued write: fn(session) plus the future for its result."""
+
+    __slots__ = ('fn', 'keep', 'future', 'queued_at')
+
+    def __init__(self, fn, keep):
+        self.fn = fn
+        self.keep = keep
+        self.future = Future()
+        self.queued_at = time.perf_counter()
+
+
+class WriteQueue:
+    """Runs write jobs on one thread and group-commits them."""
+
+    def __init__(self, enabled=WRITE_QUEUE_ENABLED, max_batch=WRITE_QUEUE_BATCH, bind=write_engine,
+                 timeout=WRITE_QUEUE_TIMEOUT):
+        self.enabled = enabled
+        self.max_batch = max_batch
+        self.bind = bind
+        self.timeout = timeout
+        self._queue = queue.SimpleQueue()
+        self._local = threading.local()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._alone_lock = threading.Lock() if isinstance(engine.pool, StaticPool) else nullcontext()
+        self._stats_lock = threading.Lock()
+        self.jobs = 0
+        self.failed_jobs = 0
+        self.commits = 0
+        self.failed_commits = 0
+        self.timeouts = 0
+        self.slow_jobs = 0
+        self.largest_batch = 0
+        self.queue_wait_total = 0.0
+        self.batch_time_total = 0.0
+
+    def current_session(self):
+        """Get the session of the job running on this thread, or None."""
+        return getattr(self._local, 'session', None)
+
+    def submit(self, fn, keep=None):
+        """Queue fn(session) and return a Future for its result.
+
+        keep(result) decides whether the job's changes are kept; by
+        default they are unless fn raises. Called from a job that is
+        already running on the writer, fn runs immediately in the same
+        transaction.
+        """
+        job = WriteJob(fn, keep)
+        session = self.current_session()
+        if session is not None:
+            self._run_job(session, job)
+            return job.future
+        if not self.enabled:
+            self._run_alone(job)
+            return job.future
+
+        self._ensure_started()
+        self._queue.put(job)
+        return job.future
+
+    def run(self, fn, keep=None, timeout=None):
+        """Submit fn(session) and wait for its committed result.
+
+        Waits at most timeout seconds, by default the queue's timeout,
+        then raises WriteQueueTimeout. A job that has not started by then
+        is cancelled; one that is already running may still commit.
+        """
+        future = self.submit(fn, keep)
+        timeout = self.timeout if timeout is None else timeout
+        if not wait([future], timeout or None).done:
+            started = not future.cancel()
+            with self._stats_lock:
+                self.timeouts += 1
+            logger.warning(
+                f"Write job {'still running' if started else 'still queued'} after {timeout:g} s"
+                f" ({self._queue.qsize()} queued)"
+            )
+            if started:
+                raise WriteQueueTimeout(f'Write did not commit within {timeout:g} s and may still be applied')
+            raise WriteQueueTimeout(f'Write did not start within {timeout:g} s and was cancelled')
+        return future.result()
+
+    def stats(self):
+        """Get job, commit, batch size and latency counters."""
+        with self._stats_lock:
+            return {
+                'enabled': self.enabled,
+                'queued': self._queue.qsize(),
+                'jobs': self.jobs,
+                'failed_jobs': self.failed_jobs,
+                'commits': self.commits,
+                'failed_commits': self.failed_commits,
+                'timeouts': self.timeouts,
+                'slow_jobs': self.slow_jobs,
+                'avg_batch': round(self.jobs / self.commits, 2) if self.commits else 0.0,
+                'largest_batch': self.largest_batch,
+                'avg_queue_wait_ms': round(self.queue_wait_total * 1000 / self.jobs, 3) if self.jobs else 0.0,
+                'avg_batch_ms': round(self.batch_time_total * 1000 / self.commits, 3) if self.commits else 0.0,
+            }
+
+    def _ensure_started(self):
+        # Started lazily so that server workers each start their own after fork
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """Take batches of jobs off the queue until the process exits."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._commit_batch(batch)
+            except Exception as e:
+                # The writer must survive anything a batch throws
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+
+    def _commit_batch(self, batch):
+        """Run a batch of jobs in one transaction, then resolve their futures."""
+        started = time.perf_counter()
+        with self._stats_lock:
+            self.queue_wait_total += sum(started - job.queued_at for job in batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+        results = []
+        with Session(self.bind, expire_on_commit=False) as session:
+            self._local.session = session
+            try:
+                for job in batch:
+                    results.append(self._run_job(session, job, resolve=False))
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                with self._stats_lock:
+                    self.failed_commits += 1
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                return
+            finally:
+                self._local.session = None
+
+        with self._stats_lock:
+            self.commits += 1
+            self.batch_time_total += time.perf_counter() - started
+        for job, result in zip(batch, results):
+            if not job.future.done():
+                job.future.set_result(result)
+
+    def _run_job(self, session, job, resolve=True):
+        """Run one job in a SAVEPOINT; failed jobs get their exception set.
+
+        Jobs cancelled by a caller that stopped waiting are skipped.
+        """
+        if not job.future.set_running_or_notify_cancel():
+            return None
+        started = time.perf_counter()
+        savepoint = session.begin_nested()
+        try:
+            result = job.fn(session)
+            # A job that caught its own flush error leaves the savepoint inactive
+            if savepoint.is_active and (job.keep is None or job.keep(result)):
+                savepoint.commit()
+            else:
+                savepoint.rollback()
+        except Exception as e:
+            savepoint.rollback()
+            self._record_job(started, failed=True)
+            job.future.set_exception(e)
+            return None
+
+        self._record_job(started)
+        if resolve:
+            job.future.set_result(result)
+        return result
+
+    def _record_job(self, started, failed=False):
+        """Count a finished job and log it when it ran past the timeout."""
+        elapsed = time.perf_counter() - started
+        slow = bool(self.timeout) and elapsed > self.timeout
+        with self._stats_lock:
+            self.jobs += 1
+            self.failed_jobs += failed
+            self.slow_jobs += slow
+        if slow:
+            logger.warning(f"Write job ran for {elapsed:.1f} s, longer than the {self.timeout:g} s timeout")
+
+    def _run_alone(self, job):
+        """Run a job on the calling thread in its own transaction."""
+        with self._alone_lock, Session(engine, expire_on_commit=False) as session:
+            self._local.session = session
+            try:
+                result = self._run_job(session, job, resolve=False)
+                if job.future.done():
+                    return
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                if not job.future.done():
+                    job.future.set_exception(e)
+                return
+            finally:
+                self._local.session = None
+        job.future.set_result(result)
+
+
+write_queue = WriteQueue()
@@ -0,0 +1,23 @@
+"""Shared fixtures: the API on a temporary SQLite file database."""
+
+import os
+import tempfile
+
+import pytest
+
+# The engines are created at import time, so point them at a scratch
+# database before anything from src is imported
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'followupper.db')}"
+
+
+@pytest.fixture(scope='session')
+def app():
+    """Get the Flask API app with its schema migrated."""
+    from src.api import app
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """Get a test client for the API."""
+    return app.test_client()
@@ -0,0 +1,164 @@
+"""Conditional GET, delta sync and query-count tests for the API's list endpoints."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.models.contact_sequence_assignment import ContactSequenceAssignment
+from src.models.database import SessionLocal
+from src.models.scheduled_followup import ScheduledFollowup
+from src.models.table_versions import bump_tables
+from src.response_cache import external_changes
+
+
+@pytest.fixture
+def statements():
+    """Collect the SQL statements executed on any engine."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(Engine, 'before_cursor_execute', record)
+
+
+def add_sequences(client, count, contact_id, template_id):
+    """Create sequences with three steps and a few assignments each."""
+    sequence_ids = []
+    for i in range(count):
+        sequence_id = client.post('/api/sequences', json={'name': f'Query Count {i}', 'platform': 'email'}).json['id']
+        for step in range(1, 4):
+            client.post(f'/api/sequences/{sequence_id}/steps', json={
+                'step_number': step, 'delay_days': 2 * step, 'template_id': template_id
+            })
+        sequence_ids.append(sequence_id)
+
+    with SessionLocal() as db:
+        db.add_all([
+            ContactSequenceAssignment(contact_id=contact_id, sequence_id=sequence_id, status=status)
+            for sequence_id in sequence_ids
+            for status in ('active', 'active', 'completed', 'paused')
+        ])
+        db.commit()
+
+
+def count_statements(client, statements):
+    """Get the number of statements one GET /api/sequences executes."""
+    statements.clear()
+    response = client.get('/api/sequences')
+    assert response.status_code == 200
+    return len(statements), len(response.json)
+
+
+def test_sequences_query_count_is_constant(monkeypatch, client, statements):
+    """Listing sequences does not issue a query per sequence."""
+    # Keep the timed change-log poll out of the counts
+    monkeypatch.setattr(external_changes, 'interval', float('inf'))
+    contact_id = client.post('/api/contacts', json={'name': 'Query Count Contact'}).json['id']
+    template_id = client.post('/api/templates', json={'name': 'Query Count Template', 'body': 'Hi {name}'}).json['id']
+
+    add_sequences(client, 2, contact_id, template_id)
+    few, listed_few = count_statements(client, statements)
+    add_sequences(client, 18, contact_id, template_id)
+    many, listed_many = count_statements(client, statements)
+
+    assert listed_many == listed_few + 18
+    assert many == few
+
+
+def test_unchanged_list_answers_304(client):
+    """A client revalidating unchanged data gets 304, by ETag or by date."""
+    client.post('/api/contacts', json={'name': 'Conditional Contact'})
+    response = client.get('/api/contacts')
+    etag, last_modified = response.headers['ETag'], response.headers['Last-Modified']
+
+    response = client.get('/api/contacts', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.data == b''
+    assert client.get('/api/contacts', headers={'If-Modified-Since': last_modified}).status_code == 304
+    # The ETag is per query string
+    assert client.get('/api/contacts?limit=1', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_etag_changes_with_each_write(client):
+    """Creates, updates and deletes each give the list a new ETag."""
+    etags = [client.get('/api/contacts').headers['ETag']]
+    contact_id = client.post('/api/contacts', json={'name': 'Changing Contact'}).json['id']
+    etags.append(client.get('/api/contacts').headers['ETag'])
+    client.put(f'/api/contacts/{contact_id}', json={'name': 'Changed Contact'})
+    etags.append(client.get('/api/contacts').headers['ETag'])
+    client.delete(f'/api/contacts/{contact_id}')
+    etags.append(client.get('/api/contacts').headers['ETag'])
+
+    assert len(set(etags)) == 4
+    assert client.get('/api/contacts', headers={'If-None-Match': etags[0]}).status_code == 200
+
+
+def test_etag_does_not_depend_on_process_state(client):
+    """Dropping the cached validators, as a fresh worker would, keeps the ETag."""
+    client.post('/api/templates', json={'name': 'Worker Template', 'body': 'Hi {name}'})
+    etag = client.get('/api/templates').headers['ETag']
+
+    bump_tables('message_templates')
+    response = client.get('/api/templates', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+
+
+def sync_token(client):
+    """Get the current delta sync token."""
+    response = client.get('/api/sync')
+    assert response.json['reset'] is True
+    return response.json['token']
+
+
+def test_sync_reports_upserts_since_token(client):
+    """Rows written after a token are returned once, with their current values."""
+    token = sync_token(client)
+    contact_id = client.post('/api/contacts', json={'name': 'Sync Contact'}).json['id']
+    client.put(f'/api/contacts/{contact_id}', json={'name': 'Synced Contact'})
+
+    response = client.get(f'/api/sync?since={token}').json
+    assert response['reset'] is False
+    assert [row['name'] for row in response['contacts']['upserted']] == ['Synced Contact']
+    assert response['contacts']['deleted'] == []
+
+    again = client.get(f"/api/sync?since={response['token']}").json
+    assert again['contacts'] == {'upserted': [], 'deleted': []}
+    assert again['token'] == response['token']
+
+
+def test_sync_tombstones_cascaded_deletes(client):
+    """Deleting a sequence or contact tombstones the rows deleted with it."""
+    template_id = client.post('/api/templates', json={'name': 'Sync Template', 'body': 'Hi {name}'}).json['id']
+    sequence_id = client.post('/api/sequences', json={'name': 'Sync Sequence', 'platform': 'email'}).json['id']
+    step_ids = [
+        client.post(f'/api/sequences/{sequence_id}/steps', json={
+            'step_number': step, 'delay_days': step, 'template_id': template_id
+        }).json['id']
+        for step in (1, 2)
+    ]
+    contact_id = client.post('/api/contacts', json={'name': 'Sync Deleted Contact'}).json['id']
+    with SessionLocal() as db:
+        followup = ScheduledFollowup(
+            contact_id=contact_id, template_id=template_id, platform='email',
+            scheduled_date=datetime.now(timezone.utc)
+        )
+        db.add(followup)
+        db.commit()
+        followup_id = followup.id
+
+    token = sync_token(client)
+    assert client.delete(f'/api/sequences/{sequence_id}').status_code == 200
+    assert client.delete(f'/api/contacts/{contact_id}').status_code == 200
+
+    response = client.get(f'/api/sync?since={token}').json
+    assert response['sequences'] == {'upserted': [], 'deleted': [sequence_id]}
+    assert response['steps'] == {'upserted': [], 'deleted': step_ids}
+    assert response['contacts'] == {'upserted': [], 'deleted': [contact_id]}
+    assert response['schedule'] == {'upserted': [], 'deleted': [followup_id]}
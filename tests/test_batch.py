@@ -0,0 +1,81 @@
+"""Tests for POST /api/batch."""
+
+from src import api
+from src.request_session import session_counters
+
+
+def contact_names(client):
+    """Get the names of every contact from the API."""
+    return [contact['name'] for contact in client.get('/api/contacts?limit=1000&fields=name').json['data']]
+
+
+def test_read_batch_shares_one_session(client):
+    opened = session_counters.opened
+    response = client.post('/api/batch', json=[
+        {'path': '/api/contacts'}, {'path': '/api/templates'}, {'path': '/api/sequences'}
+    ])
+    assert response.status_code == 200
+    assert [result['status'] for result in response.json] == [200, 200, 200]
+    assert session_counters.opened == opened + 1
+
+
+def test_batch_reads_its_own_writes(client):
+    contact_names(client)
+    response = client.post('/api/batch', json=[
+        {'method': 'POST', 'path': '/api/contacts', 'body': {'name': 'Batch Written'}},
+        {'path': '/api/contacts?limit=1000&fields=name'},
+    ])
+    assert [result['status'] for result in response.json] == [201, 200]
+    assert 'Batch Written' in [contact['name'] for contact in response.json[1]['body']['data']]
+    assert 'Batch Written' in contact_names(client)
+
+
+def test_failed_sub_request_rolls_back_alone(client):
+    response = client.post('/api/batch', json=[
+        {'method': 'POST', 'path': '/api/contacts', 'body': {'name': 'Batch Kept'}},
+        {'method': 'PUT', 'path': '/api/contacts/999999', 'body': {'name': 'Missing'}},
+    ])
+    assert response.status_code == 200
+    assert [result['status'] for result in response.json] == [201, 404]
+    assert 'Batch Kept' in contact_names(client)
+
+
+def test_atomic_batch_rolls_back_entirely(client):
+    response = client.post('/api/batch', json={'atomic': True, 'requests': [
+        {'path': '/api/contacts?limit=1'},
+        {'method': 'POST', 'path': '/api/contacts', 'body': {'name': 'Batch Rolled Back'}},
+        {'method': 'PUT', 'path': '/api/contacts/999999', 'body': {'name': 'Missing'}},
+    ]})
+    assert response.status_code == 409
+    assert [result['status'] for result in response.json] == [200, 201, 404]
+    assert 'Batch Rolled Back' not in contact_names(client)
+
+
+def test_atomic_batch_needs_its_writes_together(client):
+    response = client.post('/api/batch', json={'atomic': True, 'requests': [
+        {'method': 'POST', 'path': '/api/contacts', 'body': {'name': 'Batch Split'}},
+        {'path': '/api/contacts?limit=1'},
+        {'method': 'POST', 'path': '/api/contacts', 'body': {'name': 'Batch Split Again'}},
+    ]})
+    assert response.status_code == 400
+    assert 'Batch Split' not in contact_names(client)
+
+
+def test_streaming_endpoints_are_rejected(client):
+    """Event streams and exports are refused instead of buffered forever."""
+    response = client.post('/api/batch', json=[
+        {'path': '/api/events'},
+        {'method': 'POST', 'path': '/api/contacts', 'body': {'name': 'Batch Beside Stream'}},
+        {'path': '/api/export/contacts'},
+    ])
+    assert response.status_code == 200
+    assert [result['status'] for result in response.json] == [400, 201, 400]
+    # The writer is free for other requests
+    assert client.post('/api/contacts', json={'name': 'After Stream Batch'}).status_code == 201
+
+
+def test_streamed_responses_are_rejected(monkeypatch, client):
+    """Streamed responses from endpoints not known to stream are refused too."""
+    monkeypatch.setattr(api, 'STREAMING_ENDPOINTS', set())
+    response = client.post('/api/batch', json=[{'path': '/api/export/contacts'}])
+    assert response.json == [{'status': 400, 'body': {'error': 'Streamed responses cannot be batched'}}]
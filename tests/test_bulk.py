@@ -0,0 +1,72 @@
+"""Tests for the bulk contact upsert and the set-based follow-up operations."""
+
+from datetime import datetime, timezone
+
+from src.bulk import retry_followups
+from src.models.contact import Contact
+from src.models.database import SessionLocal
+from src.models.message_template import MessageTemplate
+from src.models.scheduled_followup import ScheduledFollowup
+
+
+def test_retry_followups_counts_each_retry_once(app):
+    """A follow-up that keeps failing is retried exactly max_retries times."""
+    with SessionLocal() as db:
+        contact = Contact(name='Retry Contact')
+        template = MessageTemplate(name='Retry Template', body='Hi {name}')
+        db.add_all([contact, template])
+        db.flush()
+        followup = ScheduledFollowup(
+            contact_id=contact.id, template_id=template.id, platform='email',
+            scheduled_date=datetime.now(timezone.utc), status='failed'
+        )
+        db.add(followup)
+        db.commit()
+
+        retried = 0
+        for _ in range(5):
+            retried += retry_followups(db, [ScheduledFollowup.id == followup.id], max_retries=3)
+            # The send fails again
+            db.query(ScheduledFollowup).filter(ScheduledFollowup.id == followup.id).update({'status': 'failed'})
+            db.commit()
+
+        assert retried == 3
+        db.refresh(followup)
+        assert followup.retry_count == 3
+
+
+def test_bulk_upsert_reports_each_row(client):
+    """Every row gets its own result, in input order; bad rows do not stop the rest."""
+    existing_id = client.post('/api/contacts', json={'name': 'Bulk Existing', 'email': 'bulk-existing@example.com'}).json['id']
+
+    response = client.post('/api/contacts/bulk', json=[
+        {'name': 'Bulk New', 'email': 'bulk-new@example.com'},
+        {'email': 'bulk-existing@example.com', 'notes': 'Updated in bulk'},
+        'not a row',
+        {'email': 'bulk-nameless@example.com'},
+        {'name': 'Bulk Duplicate', 'email': 'bulk-new@example.com'},
+    ])
+    assert response.status_code == 200
+    body = response.json
+    assert (body['created'], body['updated'], body['failed']) == (1, 1, 3)
+
+    results = body['results']
+    assert [result['index'] for result in results] == [0, 1, 2, 3, 4]
+    assert [result['status'] for result in results] == ['created', 'updated', 'error', 'error', 'error']
+    assert results[1]['id'] == existing_id
+    assert results[2]['error'] == 'Row must be an object'
+    assert results[3]['error'] == 'Name is required'
+    assert results[4]['error'] == 'Duplicate email or codementor_username in request'
+
+    with SessionLocal() as db:
+        assert db.get(Contact, results[0]['id']).name == 'Bulk New'
+        updated = db.get(Contact, existing_id)
+        assert (updated.name, updated.notes) == ('Bulk Existing', 'Updated in bulk')
+
+
+def test_bulk_upsert_reports_bad_ndjson_lines(client):
+    """NDJSON lines that are not JSON fail alone."""
+    body = '{"name": "Bulk Line", "codementor_username": "bulk-line"}\n{broken\n'
+    response = client.post('/api/contacts/bulk', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200
+    assert [result['status'] for result in response.json['results']] == ['created', 'error']
@@ -0,0 +1,31 @@
+"""Tests for the compressed body cache."""
+
+from src.compression import CompressedBodyCache
+
+
+def test_cache_evicts_least_recently_used_past_byte_limit():
+    cache = CompressedBodyCache(max_entries=100, max_bytes=1000)
+    cache.put('a', 'gzip', b'x' * 400, 'application/json')
+    cache.put('b', 'gzip', b'x' * 400, 'application/json')
+    assert cache.get('a', 'gzip') is not None
+
+    cache.put('c', 'gzip', b'x' * 400, 'application/json')
+
+    assert cache.get('b', 'gzip') is None
+    assert cache.get('a', 'gzip') is not None
+    assert cache.get('c', 'gzip') is not None
+    assert cache._bytes == 800
+
+
+def test_cache_skips_bodies_larger_than_limit():
+    cache = CompressedBodyCache(max_entries=100, max_bytes=1000)
+    cache.put('a', 'gzip', b'x' * 1001, 'application/json')
+    assert cache.get('a', 'gzip') is None
+    assert cache._bytes == 0
+
+
+def test_replacing_a_body_updates_the_total():
+    cache = CompressedBodyCache(max_entries=100, max_bytes=1000)
+    cache.put('a', 'gzip', b'x' * 600, 'application/json')
+    cache.put('a', 'gzip', b'x' * 300, 'application/json')
+    assert cache._bytes == 300
@@ -0,0 +1,28 @@
+"""Tests for the engine and connection configuration."""
+
+from sqlalchemy import text
+
+import src.models.database as database
+
+
+def test_read_engine_skips_optimize(monkeypatch, client):
+    """Read-only connections must not run PRAGMA optimize on checkout.
+
+    Stale statistics on a table the connection has queried make PRAGMA
+    optimize want to ANALYZE it, which query_only connections refuse.
+    """
+    with database.write_engine.begin() as connection:
+        connection.execute(text("INSERT INTO contacts (name, email, is_active) VALUES ('Stats 0', 'stats0@example.com', 1)"))
+        connection.execute(text('ANALYZE'))
+        for i in range(1, 500):
+            connection.execute(
+                text('INSERT INTO contacts (name, email, is_active) VALUES (:name, :email, 1)'),
+                {'name': f'Stats {i}', 'email': f'stats{i}@example.com'}
+            )
+
+    monkeypatch.setattr(database, 'SQLITE_OPTIMIZE_INTERVAL', 0)
+    for _ in range(3):
+        with database.read_engine.connect() as connection:
+            connection.execute(text("SELECT id FROM contacts WHERE name = 'Stats 1'")).all()
+
+    assert client.get('/api/contacts').status_code == 200
@@ -0,0 +1,15 @@
+"""Tests for the streaming exports."""
+
+import json
+
+from src.export import export_contacts, export_schedule
+
+
+def test_export_functions_default_to_the_endpoint_format(client):
+    client.post('/api/contacts', json={'name': 'Export Default'})
+
+    contacts = ''.join(export_contacts())
+    assert contacts == client.get('/api/export/contacts').get_data(as_text=True)
+    assert 'Export Default' in [json.loads(line)['name'] for line in contacts.splitlines()]
+
+    assert ''.join(export_schedule()) == client.get('/api/export/schedule').get_data(as_text=True)
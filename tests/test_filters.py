@@ -0,0 +1,27 @@
+"""Tests for the shared filter helpers."""
+
+from sqlalchemy import or_
+
+from src.filters import LIKE_ESCAPE, contains_pattern
+from src.models.contact import Contact
+from src.models.database import SessionLocal
+
+
+def test_contains_pattern_matches_wildcards_literally(app):
+    """Searching for % and _ finds only contacts that contain them."""
+    names = ['Discount 50%', 'Discount 500', 'Like a_b', 'Like axb', 'Back\\slash', 'Backslash']
+    with SessionLocal() as db:
+        db.add_all([Contact(name=name) for name in names])
+        db.commit()
+
+        def search(text):
+            pattern = contains_pattern(text)
+            return sorted(name for name, in db.query(Contact.name).filter(
+                Contact.name.in_(names),
+                or_(Contact.name.ilike(pattern, escape=LIKE_ESCAPE), Contact.notes.ilike(pattern, escape=LIKE_ESCAPE))
+            ))
+
+        assert search('50%') == ['Discount 50%']
+        assert search('a_b') == ['Like a_b']
+        assert search('k\\s') == ['Back\\slash']
+        assert search('discount') == ['Discount 50%', 'Discount 500']
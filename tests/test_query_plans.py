@@ -0,0 +1,124 @@
+"""EXPLAIN QUERY PLAN checks for the hot schedule queries.
+
+benchmarks/query_plans.py times the same queries on a larger database.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, insert, select, text
+
+from src.filters import schedule_criteria
+from src.http_cache import validator_statement
+from src.models.database import Base
+from src.models.contact import Contact
+from src.models.message_template import MessageTemplate
+from src.models.scheduled_followup import ScheduledFollowup
+from src.models.sync_change import SyncChange, SYNCED_TABLES
+
+STATUSES = ['sent'] * 6 + ['pending'] * 2 + ['failed', 'cancelled']
+
+
+@pytest.fixture(scope='module')
+def connection(tmp_path_factory):
+    """Get a connection to an analyzed database of 20 contacts, 5,000 follow-ups and their change log."""
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    Base.metadata.create_all(engine)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as connection:
+        connection.execute(insert(Contact), [{'name': f'Plan Contact {i}'} for i in range(20)])
+        connection.execute(insert(MessageTemplate), [{'name': 'Plan Template', 'body': 'Hi {name}'}])
+        connection.execute(insert(ScheduledFollowup), [
+            {
+                'contact_id': i % 20 + 1,
+                'template_id': 1,
+                'platform': 'email',
+                'status': STATUSES[i % len(STATUSES)],
+                'retry_count': i // 10 % 5,
+                'scheduled_date': now + timedelta(minutes=i - 2500),
+            }
+            for i in range(5000)
+        ])
+        connection.execute(insert(SyncChange), [
+            {'table_name': SYNCED_TABLES[i % len(SYNCED_TABLES)], 'record_id': i, 'operation': 'upsert'}
+            for i in range(5000)
+        ])
+        connection.execute(text('ANALYZE'))
+
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+def explain(connection, statement):
+    """Get the EXPLAIN QUERY PLAN details of a statement as one string."""
+    compiled = statement.compile(connection, compile_kwargs={'render_postcompile': True})
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', tuple(compiled.params[name] for name in compiled.positiontup))
+    return '\n'.join(row[3] for row in rows)
+
+
+def test_retry_scan_uses_status_retry_count_index(connection):
+    """The retry scan reads failed follow-ups below the limit from (status, retry_count)."""
+    plan = explain(connection, select(ScheduledFollowup.id).where(
+        ScheduledFollowup.status == 'failed', ScheduledFollowup.retry_count < 3
+    ))
+    assert 'INDEX ix_scheduled_followups_status_retry_count (status=? AND retry_count<?)' in plan
+
+
+def test_retry_step_uses_status_retry_count_index(connection):
+    """Each backoff bucket's UPDATE finds its rows through (status, retry_count)."""
+    plan = explain(connection, select(ScheduledFollowup.id).where(
+        ScheduledFollowup.status == 'failed', ScheduledFollowup.retry_count == 0
+    ))
+    assert 'INDEX ix_scheduled_followups_status_retry_count (status=? AND retry_count=?)' in plan
+
+
+def test_contact_status_uses_contact_status_index(connection):
+    """Bulk updates of one contact's pending follow-ups use (contact_id, status, ...)."""
+    plan = explain(connection, select(ScheduledFollowup.id).where(
+        *schedule_criteria({'contact_id': 1}), ScheduledFollowup.status == 'pending'
+    ))
+    assert 'INDEX ix_scheduled_followups_contact_id_status_scheduled_date_id (contact_id=? AND status=?)' in plan
+
+
+def test_contact_status_feed_pages_without_sorting(connection):
+    """The schedule feed filtered by contact and status reads in index order."""
+    statement = (
+        select(ScheduledFollowup.id)
+        .where(*schedule_criteria({'contact_id': 1, 'status': 'pending'}))
+        .order_by(ScheduledFollowup.scheduled_date, ScheduledFollowup.id)
+        .limit(51)
+    )
+    plan = explain(connection, statement)
+    assert 'INDEX ix_scheduled_followups_contact_id_status_scheduled_date_id' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_validator_seeks_newest_change(connection):
+    """Conditional GET validators read one entry of the change log, not the table."""
+    plan = explain(connection, validator_statement('scheduled_followups'))
+    assert 'INDEX ix_sync_changes_table_name_id (table_name=?)' in plan
+    assert 'scheduled_followups' not in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_overdue_scan_uses_status_scheduled_date_index(connection):
+    """Overdue pending follow-ups are found through (status, scheduled_date, id)."""
+    plan = explain(connection, select(ScheduledFollowup.id).where(
+        ScheduledFollowup.status == 'pending', ScheduledFollowup.scheduled_date < datetime.now(timezone.utc)
+    ))
+    assert 'INDEX ix_scheduled_followups_status_scheduled_date_id (status=? AND scheduled_date<?)' in plan
+    assert 'SCAN scheduled_followups' not in plan
+
+
+def test_due_sweep_reads_in_index_order(connection):
+    """The scheduler's due sweep pages through the same index without sorting."""
+    statement = (
+        select(ScheduledFollowup.id)
+        .where(ScheduledFollowup.status == 'pending', ScheduledFollowup.scheduled_date <= datetime.now(timezone.utc))
+        .order_by(ScheduledFollowup.scheduled_date, ScheduledFollowup.id)
+        .limit(500)
+    )
+    plan = explain(connection, statement)
+    assert 'INDEX ix_scheduled_followups_status_scheduled_date_id (status=? AND scheduled_date<?)' in plan
+    assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,42 @@
+"""Request sessions and pooled connections are released after every request."""
+
+import src.http_cache as http_cache
+
+
+def assert_released(client):
+    """Assert /api/metrics reports no open sessions or checked out connections."""
+    database = client.get('/api/metrics').json['database']
+    assert database['sessions_open'] == 0
+    assert database['connections_checked_out'] == 0
+
+
+def test_read_releases_session(client):
+    assert client.get('/api/contacts').status_code == 200
+    assert_released(client)
+
+
+def test_write_releases_session(client):
+    response = client.post('/api/contacts', json={'name': 'Leak Check', 'email': 'leak-check@example.com'})
+    assert response.status_code == 201
+    assert_released(client)
+
+
+def test_failed_write_releases_session(client):
+    client.post('/api/contacts', json={'name': 'Leak Duplicate', 'email': 'leak-duplicate@example.com'})
+    response = client.post('/api/contacts', json={'name': 'Leak Duplicate', 'email': 'leak-duplicate@example.com'})
+    assert response.status_code == 500
+    assert_released(client)
+
+
+def test_read_raising_outside_view_releases_session(monkeypatch, client):
+    """An exception escaping the view still rolls back and closes the session in teardown."""
+    table_validators = http_cache.table_validators
+
+    def failing_validators(models):
+        table_validators(models)
+        raise RuntimeError('validators failed')
+
+    monkeypatch.setattr(http_cache, 'table_validators', failing_validators)
+    assert client.get('/api/contacts').status_code == 500
+    monkeypatch.undo()
+    assert_released(client)
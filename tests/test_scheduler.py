@@ -0,0 +1,76 @@
+"""Tests for the follow-up scheduler's send jobs and due sweep."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.models.database import SessionLocal, engine
+from src.models.scheduled_followup import ScheduledFollowup
+from src.scheduler.followup_scheduler import FollowupScheduler, send_scheduled_followup
+
+
+@pytest.fixture
+def scheduler(app):
+    """Get a running background scheduler on the test database."""
+    scheduler = FollowupScheduler(background=True)
+    yield scheduler
+    scheduler.shutdown()
+
+
+@pytest.fixture
+def contact_and_template(client):
+    """Get the ids of a new contact and template."""
+    contact_id = client.post('/api/contacts', json={'name': 'Scheduler Contact'}).json['id']
+    template_id = client.post('/api/templates', json={'name': 'Scheduler Template', 'body': 'Hi {name}'}).json['id']
+    return contact_id, template_id
+
+
+def followup_status(followup_id):
+    """Get a follow-up's current status."""
+    with SessionLocal() as db:
+        return db.get(ScheduledFollowup, followup_id).status
+
+
+def test_rescheduled_followup_is_not_sent_early(client, scheduler, contact_and_template):
+    """The old send job of a follow-up moved later through the API does not send it."""
+    now = datetime.now(timezone.utc)
+    followup_id = scheduler.schedule_followup(*contact_and_template, now + timedelta(hours=1), 'email')
+
+    later = now + timedelta(hours=2)
+    response = client.post('/api/schedule/reschedule', json={
+        'filter': {'ids': [followup_id]}, 'scheduled_date': later.isoformat()
+    })
+    assert response.json == {'affected': 1}
+
+    # The job still set for the old time fires
+    send_scheduled_followup(followup_id)
+    scheduler.send_due_followups()
+
+    assert followup_status(followup_id) == 'pending'
+    job = scheduler.scheduler.get_job(f'followup_{followup_id}')
+    assert abs(job.next_run_time - later) < timedelta(seconds=1)
+
+
+def test_followup_retried_through_api_is_sent(client, scheduler, contact_and_template):
+    """The due sweep sends a follow-up the schedule API put back to pending without a job."""
+    contact_id, template_id = contact_and_template
+    with SessionLocal() as db:
+        followup = ScheduledFollowup(
+            contact_id=contact_id, template_id=template_id, platform='email',
+            scheduled_date=datetime.now(timezone.utc) - timedelta(minutes=5), status='failed'
+        )
+        db.add(followup)
+        db.commit()
+        followup_id = followup.id
+
+    response = client.post('/api/schedule/retry', json={'filter': {'ids': [followup_id]}})
+    assert response.json == {'affected': 1}
+    assert scheduler.scheduler.get_job(f'followup_{followup_id}') is None
+
+    scheduler.send_due_followups()
+    assert followup_status(followup_id) == 'sent'
+
+
+def test_job_store_shares_the_app_engine(scheduler):
+    """Send jobs are stored through the app's engine, with its unmasked credentials."""
+    assert scheduler.scheduler._lookup_jobstore('default').engine is engine
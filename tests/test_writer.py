@@ -0,0 +1,45 @@
+"""Tests for the group-committing write queue."""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+
+from src import request_session
+from src.writer import WriteQueue, WriteQueueTimeout
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Get a write queue with a short timeout on its own database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'writer.db'}")
+    yield WriteQueue(enabled=True, bind=engine, timeout=0.2)
+    engine.dispose()
+
+
+def test_stuck_job_times_out_its_callers(queue):
+    """A job that never finishes fails its caller and cancels the jobs queued behind it."""
+    release = threading.Event()
+    ran = []
+
+    with pytest.raises(WriteQueueTimeout, match='may still be applied'):
+        queue.run(lambda session: ran.append('stuck') or release.wait(10))
+    with pytest.raises(WriteQueueTimeout, match='was cancelled'):
+        queue.run(lambda session: ran.append('queued'))
+
+    release.set()
+    assert queue.run(lambda session: 'done', timeout=5) == 'done'
+    assert ran == ['stuck']
+    stats = queue.stats()
+    assert (stats['timeouts'], stats['slow_jobs']) == (2, 1)
+
+
+def test_write_route_answers_503_on_timeout(monkeypatch, client):
+    """A write that does not commit in time answers 503 instead of hanging."""
+    def run(job, keep=None, timeout=None):
+        raise WriteQueueTimeout('Write did not start within 0.2 s and was cancelled')
+
+    monkeypatch.setattr(request_session.write_queue, 'run', run)
+    response = client.post('/api/contacts', json={'name': 'Timed Out'})
+    assert response.status_code == 503
+    assert response.json == {'error': 'Write did not start within 0.2 s and was cancelled'}